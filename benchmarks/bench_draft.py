@@ -0,0 +1,79 @@
+"""
+Constrained auto-fill benchmark: the round-based draft vs. per-player rejection sampling.
+
+    python benchmarks/bench_draft.py [--players 100 1000 10000] [--chars 5] [--max-uses 80]
+
+Rules: no repeats per player, at most one S tier each, and optionally a use
+cap. Reports time and the spread (max - min) and std of the players' tier
+totals, with and without balancing.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+from typing import List, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from character_stats import roster_table  # noqa: E402
+from draft import DraftRules, draft_characters, tier_scores  # noqa: E402
+from roster import SMASH_CHARACTERS  # noqa: E402
+
+
+# ---------------------------- Rejection reference ----------------------------
+def rejection_fill(counts: List[int], s_quota: int, max_uses: Optional[int], rng: random.Random,
+                   max_tries: int = 10_000) -> Optional[List[List[str]]]:
+    """Redraws each player's whole set until it has no repeats, few enough S tiers, and fits the use cap."""
+    tier = dict(zip(roster_table().index, roster_table()["Tier"].astype(str)))
+    used: Counter = Counter()
+    out = []
+    for c in counts:
+        for _ in range(max_tries):
+            picks = [rng.choice(SMASH_CHARACTERS) for _ in range(c)]
+            if len(set(picks)) < c or sum(tier[p] == "S" for p in picks) > s_quota:
+                continue
+            if max_uses is not None and any(used[p] >= max_uses for p in picks):
+                continue
+            break
+        else:
+            return None  # The cap left nothing that fits
+        used.update(picks)
+        out.append(picks)
+    return out
+
+
+def spread(picks: List[List[str]]) -> str:
+    score = dict(zip(roster_table().index, tier_scores()))
+    totals = np.array([sum(score[c] for c in p) for p in picks])
+    return f"{totals.max() - totals.min():>6.1f} {totals.std():>6.2f}"
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--players", type=int, nargs="+", default=[100, 1000, 10000])
+    ap.add_argument("--chars", type=int, default=5)
+    ap.add_argument("--max-uses", type=int, default=None, help="copies of one character across the table")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    print(f"{'players':>8} {'method':<20} {'time (s)':>9} {'spread':>6} {'std':>6}")
+    for n in args.players:
+        counts = [args.chars] * n
+        for balance in (False, True):
+            rules = DraftRules(unique_per_player=True, max_uses=args.max_uses, tier_quota={"S": 1}, balance_tiers=balance)
+            t0 = time.perf_counter()
+            picks = draft_characters(counts, rules, np.random.default_rng(args.seed))
+            dt = time.perf_counter() - t0
+            print(f"{n:>8} {'draft, balanced' if balance else 'draft':<20} {dt:>9.3f} {spread(picks)}")
+        t0 = time.perf_counter()
+        picks = rejection_fill(counts, 1, args.max_uses, random.Random(args.seed))
+        dt = time.perf_counter() - t0
+        print(f"{n:>8} {'rejection':<20} {dt:>9.3f} {spread(picks) if picks else '  gave up':>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Round 1 pairing on skewed team splits: matching solver vs. the greedy generators it replaced.
+
+    python benchmarks/bench_matching.py [--entries 64 1024 16384] [--shares 0.25 0.5 0.6 0.75] [--runs 20]
+
+--shares is the fraction of players on the biggest team; the other players
+are spread over --teams - 1 teams. "bound" is pairing_report's exact minimum
+of forced BYEs; each generator's column is its mean over --runs seeds.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_pairing import check_pairs, legacy_generate_bracket_balanced  # noqa: E402
+from models import BYE, Entry, byes_needed  # noqa: E402
+from pairing import generate_bracket_balanced, make_rng, pairing_report, score_bracket  # noqa: E402
+
+# Rejection-sampling attempts before an opponent pick falls back to a bucket scan.
+_MAX_REJECTS = 16
+
+
+class _IdList:
+    """Unordered set of entry ids with O(1) add, remove and indexed access."""
+    __slots__ = ("items", "pos")
+
+    def __init__(self):
+        self.items: List[int] = []
+        self.pos: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add(self, i: int):
+        self.pos[i] = len(self.items)
+        self.items.append(i)
+
+    def remove(self, i: int):
+        idx = self.pos.pop(i)
+        last = self.items.pop()
+        if last != i:
+            self.items[idx] = last
+            self.pos[last] = idx
+
+
+class _TallyBucket:
+    """All remaining entries whose player currently has the same tally, split by team group."""
+    __slots__ = ("groups", "size")
+
+    def __init__(self):
+        self.groups: Dict[Optional[str], _IdList] = {}
+        self.size = 0
+
+    def add(self, i: int, group: Optional[str]):
+        lst = self.groups.get(group)
+        if lst is None:
+            lst = self.groups[group] = _IdList()
+        lst.add(i)
+        self.size += 1
+
+    def remove(self, i: int, group: Optional[str]):
+        self.groups[group].remove(i)
+        self.size -= 1
+
+    def group_size(self, group: Optional[str]) -> int:
+        lst = self.groups.get(group)
+        return len(lst) if lst is not None else 0
+
+    def nth(self, r: int, skip_group: Optional[str] = None) -> int:
+        """Returns the r-th id across all groups except `skip_group` (None skips nothing)."""
+        for g, lst in self.groups.items():
+            if skip_group is not None and g == skip_group:
+                continue
+            if r < len(lst):
+                return lst.items[r]
+            r -= len(lst)
+        raise IndexError(r)
+
+
+# ---------------------------- Greedy reference ----------------------------
+class _PairingState:
+    """
+    Per-tally buckets plus per-player indexes over the entries still to be placed.
+    All remaining entries of a player share that player's tally, so they always
+    live in one bucket and move together when the tally goes up.
+    """
+
+    def __init__(self, entries: List[Entry], group_of: Dict[str, Optional[str]], rng: random.Random):
+        self.entries = entries
+        self.rng = rng
+        self.group_of = group_of
+        self.tally: Dict[str, int] = {}
+        self.remaining: Dict[str, List[int]] = {}
+        self.buckets: List[_TallyBucket] = [_TallyBucket()]
+        self.lo = 0
+        self.count = 0
+        for i, e in enumerate(entries):
+            self.remaining.setdefault(e.player, []).append(i)
+            self.tally.setdefault(e.player, 0)
+            self.buckets[0].add(i, group_of.get(e.player))
+            self.count += 1
+
+    def _bucket(self, t: int) -> _TallyBucket:
+        while len(self.buckets) <= t:
+            self.buckets.append(_TallyBucket())
+        return self.buckets[t]
+
+    def take(self, i: int):
+        p = self.entries[i].player
+        self.buckets[self.tally[p]].remove(i, self.group_of.get(p))
+        self.remaining[p].remove(i)
+        self.count -= 1
+
+    def bump(self, player: str):
+        """Increments a player's tally and moves their remaining entries up one bucket."""
+        t = self.tally[player]
+        g = self.group_of.get(player)
+        src, dst = self.buckets[t], self._bucket(t + 1)
+        for i in self.remaining[player]:
+            src.remove(i, g)
+            dst.add(i, g)
+        self.tally[player] = t + 1
+
+    def pick_lowest(self) -> Optional[int]:
+        while self.lo < len(self.buckets) and self.buckets[self.lo].size == 0:
+            self.lo += 1
+        if self.lo >= len(self.buckets):
+            return None
+        b = self.buckets[self.lo]
+        return b.nth(self.rng.randrange(b.size))
+
+    def pick_opponent(self, a: int) -> Optional[int]:
+        player = self.entries[a].player
+        ga = self.group_of.get(player)
+        for t in range(self.lo, len(self.buckets)):
+            b = self.buckets[t]
+            if ga is not None:
+                allowed = b.size - b.group_size(ga)
+                if allowed > 0:
+                    return b.nth(self.rng.randrange(allowed), skip_group=ga)
+                continue
+            own = len(self.remaining[player]) if self.tally[player] == t else 0
+            if b.size - own <= 0:
+                continue
+            for _ in range(_MAX_REJECTS):
+                j = b.nth(self.rng.randrange(b.size))
+                if self.entries[j].player != player:
+                    return j
+            pool = [j for lst in b.groups.values() for j in lst.items if self.entries[j].player != player]
+            return self.rng.choice(pool)
+        return None
+
+
+def generate_bracket_greedy(
+    entries: List[Entry],
+    *,
+    forbid_same_team: bool = False,
+    team_of: Optional[Dict[str, str]] = None,
+    rng: Optional[random.Random] = None
+) -> List[Tuple[Entry, Entry]]:
+    """The bucketed greedy generator the matching solver replaced, kept verbatim for comparison."""
+    team_of = team_of or {}
+    rng = rng or random.Random()
+    base = [e for e in entries if e.player != "SYSTEM"]
+    group_of: Dict[str, Optional[str]] = {}
+    if forbid_same_team:
+        group_of = {e.player: team_of[e.player] for e in base if team_of.get(e.player, "")}
+
+    state = _PairingState(base, group_of, rng)
+    pairs: List[Tuple[Entry, Entry]] = []
+
+    # Use some BYEs first if needed
+    for _ in range(byes_needed(len(base))):
+        a = state.pick_lowest()
+        if a is None: break
+        state.take(a)
+        pairs.append((base[a], BYE))
+        state.bump(base[a].player)
+
+    while state.count >= 2:
+        a = state.pick_lowest()
+        state.take(a)
+        b = state.pick_opponent(a)
+
+        if b is None:
+            # Every remaining entry shares a's player or team, so none of them
+            # can be paired with each other either: hand out a BYE and move on.
+            pairs.append((base[a], BYE))
+            state.bump(base[a].player)
+            continue
+
+        state.take(b)
+        pairs.append((base[a], base[b]))
+        state.bump(base[a].player)
+        state.bump(base[b].player)
+
+    if state.count: # odd leftover
+        a = state.pick_lowest()
+        pairs.append((base[a], BYE))
+
+    return pairs
+
+
+# ---------------------------- Workload ----------------------------
+def skewed_entries(n: int, share: float, teams: int, chars: int, rng: random.Random) -> Tuple[List[Entry], Dict[str, str]]:
+    """n entries, `chars` per player; `share` of the players on team T0, the rest spread over the others."""
+    players = [f"P{i}" for i in range((n + chars - 1) // chars)]
+    team_of = {}
+    for p in players:
+        team_of[p] = "T0" if rng.random() < share or teams < 2 else f"T{rng.randrange(1, teams)}"
+    entries = [Entry(p, f"C{j}") for p in players for j in range(chars)][:n]
+    return entries, team_of
+
+def run(gen, entries, team_of, runs: int, seed: int) -> Tuple[float, float, int]:
+    """(mean seconds, mean forced BYEs, total rule violations) over `runs` seeds."""
+    secs = forced = 0.0
+    bad = 0
+    for s in range(runs):
+        t0 = time.perf_counter()
+        pairs = gen(entries, team_of, seed + s)
+        secs += time.perf_counter() - t0
+        forced += score_bracket(pairs, team_of).forced_byes
+        bad += check_pairs(pairs, team_of, True)
+    return secs / runs, forced / runs, bad
+
+def _matched(entries, team_of, seed):
+    return generate_bracket_balanced(entries, forbid_same_team=True, team_of=team_of, rng=make_rng(seed))
+
+def _greedy(entries, team_of, seed):
+    return generate_bracket_greedy(entries, forbid_same_team=True, team_of=team_of, rng=make_rng(seed))
+
+def _legacy(entries, team_of, seed):
+    random.seed(seed)
+    return legacy_generate_bracket_balanced(entries, True, team_of)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--entries", type=int, nargs="+", default=[64, 1024, 16384])
+    ap.add_argument("--shares", type=float, nargs="+", default=[0.25, 0.5, 0.6, 0.75])
+    ap.add_argument("--teams", type=int, default=4)
+    ap.add_argument("--chars", type=int, default=2, help="entries per player")
+    ap.add_argument("--runs", type=int, default=20)
+    ap.add_argument("--legacy-max", type=int, default=2048)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    gens = [("matching", _matched), ("greedy", _greedy), ("legacy", _legacy)]
+    print(f"{'entries':>8} {'share':>6} {'bound':>6}" + "".join(f" {g + ' byes':>14} {g + ' ms':>12}" for g, _ in gens))
+    for n in args.entries:
+        for share in args.shares:
+            entries, team_of = skewed_entries(n, share, args.teams, args.chars, random.Random(args.seed))
+            bound = pairing_report(entries, forbid_same_team=True, team_of=team_of).forced_byes
+            row = f"{n:>8} {share:>6.2f} {bound:>6}"
+            for label, gen in gens:
+                if label == "legacy" and n > args.legacy_max:
+                    row += f" {'-':>14} {'-':>12}"
+                    continue
+                secs, forced, bad = run(gen, entries, team_of, args.runs, args.seed)
+                row += f" {forced:>14.1f} {secs * 1000:>12.2f}"
+                if bad:
+                    row += f" ({label}: {bad} violations)"
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
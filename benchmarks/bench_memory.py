@@ -0,0 +1,75 @@
+"""
+Per-session bracket memory: list-of-tuples of plain dataclass entries vs. PackedBracket.
+
+    python benchmarks/bench_memory.py [--sizes 64 512 4096 32768] [--sessions 100]
+
+Measures what one session keeps in st.session_state["last_bracket"] with
+tracemalloc, starting from entries whose strings were built at runtime (as
+they are when they come out of the data editor).
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Entry, PackedBracket, next_power_of_two  # noqa: E402
+
+
+@dataclass(frozen=True)
+class LegacyEntry:
+    player: str
+    character: str
+
+
+def runtime_str(s: str) -> str:
+    """A fresh, non-interned copy of `s`, like a string read out of a DataFrame."""
+    return "".join(list(s))
+
+def legacy_bracket(n: int, chars: int) -> List[Tuple[LegacyEntry, LegacyEntry]]:
+    ents = [LegacyEntry(runtime_str(f"Player {i // chars}"), runtime_str(f"Character {i % 80}")) for i in range(n)]
+    pairs = []
+    for _ in range(next_power_of_two(n) - n):
+        pairs.append((ents.pop(), LegacyEntry("SYSTEM", "BYE")))
+    pairs.extend(zip(ents[0::2], ents[1::2]))
+    return pairs
+
+def packed_bracket(n: int, chars: int) -> PackedBracket:
+    ents = [Entry(runtime_str(f"Player {i // chars}"), runtime_str(f"Character {i % 80}")) for i in range(n)]
+    pairs = []
+    for _ in range(next_power_of_two(n) - n):
+        pairs.append((ents.pop(), Entry("SYSTEM", "BYE")))
+    pairs.extend(zip(ents[0::2], ents[1::2]))
+    return PackedBracket.from_pairs(pairs)
+
+def retained_bytes(build, *args) -> int:
+    """Bytes still allocated once `build` returns and its temporaries are gone."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build(*args)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return after - before
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[64, 512, 4096, 32768])
+    ap.add_argument("--chars", type=int, default=2, help="entries per player")
+    ap.add_argument("--sessions", type=int, default=100, help="concurrent sessions to extrapolate to")
+    args = ap.parse_args()
+
+    print(f"{'entries':>8} {'legacy (KiB)':>13} {'packed (KiB)':>13} {'ratio':>6} {f'x{args.sessions} sessions saved (MiB)':>28}")
+    for n in args.sizes:
+        old = retained_bytes(legacy_bracket, n, args.chars)
+        new = retained_bytes(packed_bracket, n, args.chars)
+        saved = (old - new) * args.sessions / 2**20
+        print(f"{n:>8} {old / 1024:>13.1f} {new / 1024:>13.1f} {old / new:>5.1f}x {saved:>28.1f}")
+
+
+if __name__ == "__main__":
+    main()
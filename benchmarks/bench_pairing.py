@@ -0,0 +1,160 @@
+"""
+Round 1 pairing benchmark: current engine vs. the original list-scanning generator.
+
+    python benchmarks/bench_pairing.py [--sizes 100 1000 10000 100000] [--teams 4]
+    python benchmarks/bench_pairing.py --candidates 1000 --sizes 64 [--workers 8]
+    python benchmarks/bench_pairing.py --repeats 200
+
+The legacy generator is quadratic, so it is only timed up to --legacy-max entries.
+--repeats checks that the engine's repeat matchups (the same two players
+meeting again in Round 1) stay near the legacy random pairing's rate; the
+exit status is 1 if any shape exceeds it by more than --repeat-slack.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Entry, byes_needed  # noqa: E402
+from pairing import generate_bracket_balanced, generate_best_bracket, make_rng, score_bracket  # noqa: E402
+
+
+# ---------------------------- Legacy reference ----------------------------
+def _legacy_pick_from_lowest_tally(cands: List[Entry], tally: Dict[str, int]) -> Optional[Entry]:
+    if not cands:
+        return None
+    m = min(tally.get(e.player, 0) for e in cands)
+    return random.choice([e for e in cands if tally.get(e.player, 0) == m])
+
+def legacy_generate_bracket_balanced(entries: List[Entry], forbid_same_team: bool = False,
+                                     team_of: Optional[Dict[str, str]] = None) -> List[Tuple[Entry, Entry]]:
+    """The pre-bucket implementation, kept verbatim (minus its infinite-retry branch) for comparison."""
+    team_of = team_of or {}
+    bag = [e for e in entries if e.player != "SYSTEM"]
+    need = byes_needed(len(bag))
+    random.shuffle(bag)
+    tally: Dict[str, int] = {}
+    pairs: List[Tuple[Entry, Entry]] = []
+    for _ in range(need):
+        a = _legacy_pick_from_lowest_tally(bag, tally)
+        if not a: break
+        bag.remove(a)
+        pairs.append((a, Entry("SYSTEM", "BYE")))
+        tally[a.player] = tally.get(a.player, 0) + 1
+    while len(bag) >= 2:
+        a = _legacy_pick_from_lowest_tally(bag, tally)
+        bag.remove(a)
+        pool = [x for x in bag if x.player != a.player]
+        ta = team_of.get(a.player, "")
+        if forbid_same_team and ta:
+            pool = [x for x in pool if team_of.get(x.player, "") != ta]
+        b = _legacy_pick_from_lowest_tally(pool, tally)
+        if b is None:
+            pairs.append((a, Entry("SYSTEM", "BYE")))
+            tally[a.player] = tally.get(a.player, 0) + 1
+            continue
+        bag.remove(b)
+        pairs.append((a, b))
+        tally[a.player] = tally.get(a.player, 0) + 1
+        tally[b.player] = tally.get(b.player, 0) + 1
+    if bag:
+        pairs.append((bag[0], Entry("SYSTEM", "BYE")))
+    return pairs
+
+
+# ---------------------------- Workload ----------------------------
+def make_entries(n: int, chars_per_player: int, teams: int) -> Tuple[List[Entry], Dict[str, str]]:
+    players = [f"P{i}" for i in range((n + chars_per_player - 1) // chars_per_player)]
+    entries = [Entry(p, f"C{j}") for p in players for j in range(chars_per_player)][:n]
+    team_of = {p: f"T{i % teams}" for i, p in enumerate(players)} if teams else {}
+    return entries, team_of
+
+def time_once(fn, *args, **kwargs) -> float:
+    t0 = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - t0
+
+def check_pairs(pairs: List[Tuple[Entry, Entry]], team_of: Dict[str, str], forbid_same_team: bool) -> int:
+    """Returns the number of rule violations (self-matches, or same-team matches when forbidden)."""
+    bad = 0
+    for a, b in pairs:
+        if b.player == "SYSTEM":
+            continue
+        if a.player == b.player:
+            bad += 1
+        elif forbid_same_team and team_of.get(a.player) and team_of.get(a.player) == team_of.get(b.player):
+            bad += 1
+    return bad
+
+
+def repeat_rates(players: int, chars: int, teams: int, seeds: int) -> Tuple[float, float]:
+    """Mean repeat matchups per bracket over `seeds` draws: (engine, legacy random pairing)."""
+    entries, team_of = make_entries(players * chars, chars, teams)
+    engine = legacy = 0
+    for s in range(seeds):
+        pairs = generate_bracket_balanced(entries, forbid_same_team=teams > 0, team_of=team_of, rng=make_rng(s))
+        engine += score_bracket(pairs, team_of).repeat_matchups
+        random.seed(s)
+        legacy += score_bracket(legacy_generate_bracket_balanced(entries, teams > 0, team_of), team_of).repeat_matchups
+    return engine / seeds, legacy / seeds
+
+# (players, entries per player, teams)
+REPEAT_SHAPES = [(8, 2, 0), (32, 2, 0), (16, 4, 0), (10, 5, 0), (32, 2, 4)]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    ap.add_argument("--chars", type=int, default=2, help="entries per player")
+    ap.add_argument("--teams", type=int, default=0, help="number of teams (0 = regular mode)")
+    ap.add_argument("--legacy-max", type=int, default=10000)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--candidates", type=int, default=0, help="time best-of-K batch mode instead")
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--repeats", type=int, default=0, help="check repeat matchups over this many seeds instead")
+    ap.add_argument("--repeat-slack", type=float, default=1.25, help="allowed engine / legacy repeat ratio")
+    args = ap.parse_args()
+
+    if args.repeats:
+        print(f"{'shape':>10} {'engine':>7} {'legacy':>7}")
+        failed = False
+        for players, chars, teams in REPEAT_SHAPES:
+            engine, legacy = repeat_rates(players, chars, teams, args.repeats)
+            ok = engine <= args.repeat_slack * legacy + 0.5
+            failed |= not ok
+            shape = f"{players}x{chars}" + (f"/{teams}t" if teams else "")
+            print(f"{shape:>10} {engine:>7.2f} {legacy:>7.2f}{'' if ok else '  TOO MANY'}")
+        sys.exit(1 if failed else 0)
+
+    forbid = args.teams > 0
+    if args.candidates:
+        print(f"{'entries':>8} {'K':>6} {'batch (s)':>10}  best score")
+        for n in args.sizes:
+            entries, team_of = make_entries(n, args.chars, args.teams)
+            t0 = time.perf_counter()
+            _, score, _ = generate_best_bracket(entries, args.candidates, forbid_same_team=forbid, team_of=team_of,
+                                                seed=args.seed, workers=args.workers)
+            print(f"{n:>8} {args.candidates:>6} {time.perf_counter() - t0:>10.3f}  {score}")
+        return
+
+    print(f"{'entries':>8} {'engine (s)':>11} {'legacy (s)':>11} {'speedup':>8} {'violations':>10}")
+    for n in args.sizes:
+        entries, team_of = make_entries(n, args.chars, args.teams)
+        t0 = time.perf_counter()
+        pairs = generate_bracket_balanced(entries, forbid_same_team=forbid, team_of=team_of, rng=make_rng(args.seed))
+        t_new = time.perf_counter() - t0
+        bad = check_pairs(pairs, team_of, forbid)
+        if n <= args.legacy_max:
+            random.seed(args.seed)
+            t_old = time_once(legacy_generate_bracket_balanced, entries, forbid, team_of)
+            print(f"{n:>8} {t_new:>11.4f} {t_old:>11.4f} {t_old / t_new:>7.1f}x {bad:>10}")
+        else:
+            print(f"{n:>8} {t_new:>11.4f} {'-':>11} {'-':>8} {bad:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Instrumentation overhead: a bare call vs. the same call under @timed, with profiling off and on.
+
+    python benchmarks/bench_profiling.py [--calls 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Entry  # noqa: E402
+from pairing import generate_bracket_balanced, make_rng  # noqa: E402
+from profiling import finish_rerun, start_rerun, timed  # noqa: E402
+
+
+def noop(x):
+    return x
+
+timed_noop = timed("noop")(noop)
+
+
+def per_call(fn, calls: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - t0) / calls
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--calls", type=int, default=1_000_000)
+    args = ap.parse_args()
+
+    bare = per_call(noop, args.calls)
+    off = per_call(timed_noop, args.calls)
+    start_rerun()
+    on = per_call(timed_noop, args.calls)
+    finish_rerun()
+    print(f"{'':>14} {'ns / call':>10} {'overhead':>9}")
+    print(f"{'bare':>14} {bare * 1e9:>10.0f} {'':>9}")
+    print(f"{'@timed, off':>14} {off * 1e9:>10.0f} {(off - bare) * 1e9:>8.0f}ns")
+    print(f"{'@timed, on':>14} {on * 1e9:>10.0f} {(on - bare) * 1e9:>8.0f}ns")
+
+    # A real instrumented hot path, for scale
+    entries = [Entry(f"P{i % 64}", f"C{i}") for i in range(256)]
+    rng = make_rng(1)
+    calls = 2_000
+    t_off = per_call(lambda _: generate_bracket_balanced(entries, rng=rng), calls)
+    start_rerun()
+    t_on = per_call(lambda _: generate_bracket_balanced(entries, rng=rng), calls)
+    rec = finish_rerun()
+    print(f"\ngenerate_bracket_balanced (256 entries): off {t_off * 1e6:.1f} us, on {t_on * 1e6:.1f} us, "
+          f"{rec.spans['pairing.generate_bracket_balanced'][0]:,} calls recorded")
+
+
+if __name__ == "__main__":
+    main()
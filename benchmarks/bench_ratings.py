@@ -0,0 +1,78 @@
+"""
+Elo benchmark: batch replay vs. one update() per result, and a full history reload.
+
+    python benchmarks/bench_ratings.py [--matches 1000000] [--players 16 1000 20000]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ratings import Ratings, ResultHistory, elo_batch  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--matches", type=int, default=1_000_000)
+    ap.add_argument("--players", type=int, nargs="+", default=[16, 1000, 20000])
+    ap.add_argument("--history", type=int, default=200_000, help="results replayed through ResultHistory")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'players':>8} {'matches':>9} {'batch (s)':>10} {'update() (s)':>13} {'max diff':>9}")
+    for n in args.players:
+        w = rng.integers(0, n, args.matches)
+        l = (w + rng.integers(1, n, args.matches)) % n
+        t0 = time.perf_counter()
+        fast, _ = elo_batch(w, l, n)
+        t_batch = time.perf_counter() - t0
+        names = [f"P{i}" for i in range(n)]
+        one = Ratings()
+        for i in range(n):
+            one._player(names[i])
+        t0 = time.perf_counter()
+        for a, b in zip(w.tolist(), l.tolist()):
+            one.update((names[a], "", names[b], ""))
+        t_one = time.perf_counter() - t0
+        diff = np.abs(fast - np.asarray(one.player_rating)).max()
+        print(f"{n:>8} {args.matches:>9} {t_batch:>10.3f} {t_one:>13.3f} {diff:>9.1e}")
+
+    # Whole pipeline: history file -> string ids -> player and pair ratings
+    prng = random.Random(args.seed)
+    players = [f"P{i}" for i in range(2000)]
+    chars = [f"C{i}" for i in range(8)]
+    root = tempfile.mkdtemp()
+    try:
+        hist = ResultHistory(root, batch_size=4096)
+        for j in range(args.history):
+            a, b = prng.sample(players, 2)
+            hist.record(("bench", "rr", 0, j), (a, prng.choice(chars), b, prng.choice(chars)))
+        hist.log.flush()
+        del hist
+        t0 = time.perf_counter()
+        reopened = ResultHistory(root)
+        t_read = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        ratings = reopened.ratings
+        t_rate = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for j in range(10_000):
+            a, b = prng.sample(players, 2)
+            ratings.update((a, "C0", b, "C1"))
+        t_upd = (time.perf_counter() - t0) / 10_000
+        print(f"\nhistory of {args.history:,}: read {t_read:.2f}s, rebuild ratings {t_rate:.2f}s, "
+              f"single update {t_upd * 1e6:.1f} us ({len(ratings.pair_ids):,} pairs)")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Round-robin scheduler micro-benchmark: streaming rounds vs. the materialize-everything original.
+
+    python benchmarks/bench_round_robin.py [--players 100 500 2000] [--round 7]
+"""
+import argparse
+import os
+import sys
+import time
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from round_robin import iter_rounds, round_pairings  # noqa: E402
+
+
+# ---------------------------- Original (materialized) ----------------------------
+def legacy_schedule(players: List[str]) -> Tuple[List[Tuple[str, str]], List[int]]:
+    p = players + ["BYE"] if len(players) % 2 else players.copy()
+    n = len(p)
+    matchups, rounds = [], []
+    for r in range(n - 1):
+        for i in range(n // 2):
+            p1, p2 = p[i], p[n - 1 - i]
+            if p1 != "BYE" and p2 != "BYE":
+                matchups.append((p1, p2))
+                rounds.append(r)
+        p.insert(1, p.pop())
+    return matchups, rounds
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def consume(players: List[str]) -> int:
+    return sum(len(r.matches) for r in iter_rounds(players))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--players", type=int, nargs="+", default=[100, 500, 2000])
+    ap.add_argument("--round", type=int, default=7, help="0-based round for the single-round timing")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    print(f"{'players':>8} {'matches':>10} {'stream all (s)':>15} {'original (s)':>13} {'round k (ms)':>13} {'original k (s)':>15}")
+    for n in args.players:
+        players = [f"P{i}" for i in range(n)]
+        matches, rounds = legacy_schedule(players)
+        assert [m for r in iter_rounds(players) for m in r.matches] == matches
+        k = min(args.round, max(0, len(set(rounds)) - 1))
+        assert round_pairings(players, k).matches == tuple(m for m, r in zip(matches, rounds) if r == k)
+
+        t_stream = best_of(lambda: consume(players), args.repeat)
+        t_old = best_of(lambda: legacy_schedule(players), args.repeat)
+        t_k = best_of(lambda: round_pairings(players, k), args.repeat)
+        # The original has to build every round to answer for one
+        t_old_k = best_of(lambda: [m for m, r in zip(*legacy_schedule(players)) if r == k], 1)
+        print(f"{n:>8} {len(matches):>10} {t_stream:>15.4f} {t_old:>13.4f} {t_k * 1000:>13.3f} {t_old_k:>15.4f}")
+
+
+if __name__ == "__main__":
+    main()
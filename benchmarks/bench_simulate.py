@@ -0,0 +1,87 @@
+"""
+Monte Carlo benchmark: vectorized runs x matches simulation vs. a plain per-run loop.
+
+    python benchmarks/bench_simulate.py [--entries 16 64 256 1024] [--runs 100000] [--workers 4]
+
+The loop is timed on --loop-runs runs and scaled up to --runs.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import BYE_ID, Entry, PackedBracket  # noqa: E402
+from pairing import generate_bracket_balanced, make_rng  # noqa: E402
+from progression import BracketState  # noqa: E402
+from roster import SMASH_CHARACTERS  # noqa: E402
+from round_robin import circle_schedule  # noqa: E402
+from simulate import entry_strengths, simulate_bracket, simulate_round_robin, win_matrix  # noqa: E402
+
+
+def loop_bracket(state: BracketState, prob: np.ndarray, runs: int, seed: int) -> np.ndarray:
+    """One tournament at a time, one match at a time."""
+    rng = random.Random(seed)
+    packed = state.packed
+    slots = [packed.pair_ids(i)[k] if i < len(packed) else BYE_ID
+             for i in range(state.round_size(0)) for k in (0, 1)]
+    champs = np.zeros(len(packed.entry_player), dtype=np.int64)
+    for _ in range(runs):
+        alive = slots
+        while len(alive) > 1:
+            nxt = []
+            for a, b in zip(alive[0::2], alive[1::2]):
+                if a == BYE_ID or b == BYE_ID:
+                    nxt.append(b if a == BYE_ID else a)
+                else:
+                    nxt.append(a if rng.random() < prob[a, b] else b)
+            alive = nxt
+        if alive[0] >= 0:
+            champs[alive[0]] += 1
+    return champs
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--entries", type=int, nargs="+", default=[16, 64, 256, 1024])
+    ap.add_argument("--runs", type=int, default=100_000)
+    ap.add_argument("--loop-runs", type=int, default=2_000)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'bracket':>8} {'runs':>8} {'vector (s)':>11} {f'{args.workers} procs (s)':>13} {'loop est. (s)':>14} {'speedup':>8}")
+    for n in args.entries:
+        entries = [Entry(f"P{i}", rng.choice(SMASH_CHARACTERS)) for i in range(n)]
+        state = BracketState(PackedBracket.from_pairs(generate_bracket_balanced(entries, rng=make_rng(args.seed))))
+        pk = state.packed
+        strength = entry_strengths([pk.players[p] for p in pk.entry_player],
+                                   [pk.characters[c] for c in pk.entry_character])
+        t0 = time.perf_counter()
+        simulate_bracket(state, strength, args.runs, seed=args.seed, workers=1)
+        t_vec = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        simulate_bracket(state, strength, args.runs, seed=args.seed, workers=args.workers)
+        t_pool = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        loop_bracket(state, win_matrix(strength), args.loop_runs, args.seed)
+        t_loop = (time.perf_counter() - t0) * args.runs / args.loop_runs
+        print(f"{n:>8} {args.runs:>8} {t_vec:>11.3f} {t_pool:>13.3f} {t_loop:>14.2f} {t_loop / t_vec:>7.0f}x")
+
+    print(f"\n{'players':>8} {'matches':>8} {'runs':>8} {'vector (s)':>11}")
+    for n in (8, 16, 32):
+        players = tuple(f"P{i}" for i in range(n))
+        matches, _ = circle_schedule(players)
+        strength = np.random.default_rng(args.seed).normal(size=n)
+        t0 = time.perf_counter()
+        simulate_round_robin(players, matches, strength, runs=args.runs, seed=args.seed, workers=1)
+        print(f"{n:>8} {len(matches):>8} {args.runs:>8} {time.perf_counter() - t0:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Startup benchmark: headless CLI vs. importing / running the Streamlit app, each in a fresh interpreter.
+
+    python benchmarks/bench_startup.py [--players 64] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed(cmd, repeat: int) -> float:
+    """Median wall time of `cmd` over `repeat` fresh processes."""
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        runs.append(time.perf_counter() - t0)
+    return statistics.median(runs)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--players", type=int, default=64)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    players = os.path.join(tmp, "players.txt")
+    entries = os.path.join(tmp, "entries.csv")
+    with open(players, "w") as f:
+        f.write("\n".join(f"P{i}" for i in range(args.players)))
+    with open(entries, "w") as f:
+        f.write("Player,Character\n" + "".join(f"P{i // 2},C{i}\n" for i in range(2 * args.players)))
+    out = os.path.join(tmp, "out.csv")
+    env_data = os.path.join(tmp, "data")
+
+    cases = [
+        ("python (baseline)", [sys.executable, "-c", "pass"]),
+        ("cli.py schedule", [sys.executable, "cli.py", "schedule", players, "-o", out]),
+        ("cli.py bracket", [sys.executable, "cli.py", "bracket", entries, "--seed", "1", "-o", out]),
+        ("import streamlit", [sys.executable, "-c", "import streamlit"]),
+        ("run streamlit_app once", [sys.executable, "-c",
+                                    "from streamlit.testing.v1 import AppTest; "
+                                    "AppTest.from_file('streamlit_app.py', default_timeout=120).run()"]),
+    ]
+    os.environ["SMASH_DATA_DIR"] = env_data
+    print(f"{'command':<26} {'median (s)':>11}")
+    for label, cmd in cases:
+        print(f"{label:<26} {timed(cmd, args.repeat):>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
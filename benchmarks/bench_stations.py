@@ -0,0 +1,101 @@
+"""
+Station scheduler benchmark: heap-based list scheduling vs. rescanning every pending match at each step.
+
+    python benchmarks/bench_stations.py [--players 20 50 100] [--entries 256 1024 4096] [--stations 8 50]
+
+Also times a replan after a batch of late results, and reports each plan's
+length against the lower bound (longest chain / total work / busiest player).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Entry, PackedBracket  # noqa: E402
+from pairing import generate_bracket_balanced, make_rng  # noqa: E402
+from progression import BracketState  # noqa: E402
+from round_robin import circle_schedule  # noqa: E402
+from stations import StationMatch, StationScheduler, bracket_matches, round_robin_matches  # noqa: E402
+
+DURATION = 8.0
+
+
+# ---------------------------- Rescanning reference ----------------------------
+def rescan_makespan(matches: List[StationMatch], stations: int, duration: float) -> float:
+    """Same priorities, but every step walks the whole pending list: O(n^2)."""
+    order = sorted(range(len(matches)), key=StationScheduler(matches, duration).priority.__getitem__)
+    finish = [None] * len(matches)
+    station_free = [0.0] * stations
+    player_free = {}
+    pending = list(order)
+    t = 0.0
+    while pending:
+        left = []
+        for i in pending:
+            s = min(range(stations), key=station_free.__getitem__)
+            m = matches[i]
+            ok = (station_free[s] <= t and all(finish[d] is not None and finish[d] <= t for d in m.deps)
+                  and all(player_free.get(p, 0.0) <= t for p in m.players))
+            if ok:
+                finish[i] = station_free[s] = t + duration
+                for p in m.players:
+                    player_free[p] = t + duration
+            else:
+                left.append(i)
+        pending = left
+        if pending:
+            t = min(x for x in station_free + [f for f in finish if f is not None] if x > t)
+    return max(f for f in finish if f is not None)
+
+
+def run(name: str, matches: List[StationMatch], stations: int, rescan_max: int):
+    t0 = time.perf_counter()
+    scheduler = StationScheduler(matches, DURATION)
+    plan = scheduler.plan(stations)
+    t_plan = time.perf_counter() - t0
+    # The first tenth of the matches report late: 1.5x their planned length, all at once
+    late = plan.slots[: max(1, len(plan.slots) // 10)]
+    now = max(s.start for s in late) + 1.5 * DURATION
+    t0 = time.perf_counter()
+    scheduler.replan(plan, now, {s.key: s.start + 1.5 * DURATION for s in late})
+    t_replan = time.perf_counter() - t0
+    if len(matches) <= rescan_max:
+        t0 = time.perf_counter()
+        rescan_makespan(matches, stations, DURATION)
+        t_rescan = f"{time.perf_counter() - t0:>11.3f}"
+    else:
+        t_rescan = f"{'-':>11}"
+    print(f"{name:>16} {len(matches):>7} {stations:>8} {t_plan:>9.3f} {t_replan:>10.3f} {t_rescan} "
+          f"{plan.makespan:>9.0f} {plan.lower_bound:>7.0f}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--players", type=int, nargs="+", default=[20, 50, 100])
+    ap.add_argument("--entries", type=int, nargs="+", default=[256, 1024, 4096])
+    ap.add_argument("--stations", type=int, nargs="+", default=[8, 50])
+    ap.add_argument("--rescan-max", type=int, default=1500, help="largest match count timed with the rescanning reference")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    print(f"{'input':>16} {'matches':>7} {'stations':>8} {'plan (s)':>9} {'replan (s)':>10} {'rescan (s)':>11} "
+          f"{'makespan':>9} {'bound':>7}")
+    for n in args.players:
+        schedule, _ = circle_schedule(tuple(f"P{i}" for i in range(n)))
+        for s in args.stations:
+            run(f"RR {n} players", round_robin_matches(schedule), s, args.rescan_max)
+    rng = random.Random(args.seed)
+    for n in args.entries:
+        # Two characters per player, so a player can meet their own other entry's schedule
+        entries = [Entry(f"P{i // 2}", f"C{rng.randrange(80)}") for i in range(n)]
+        state = BracketState(PackedBracket.from_pairs(generate_bracket_balanced(entries, rng=make_rng(args.seed))))
+        for s in args.stations:
+            run(f"bracket {n}", bracket_matches(state), s, args.rescan_max)
+
+
+if __name__ == "__main__":
+    main()
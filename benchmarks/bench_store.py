@@ -0,0 +1,66 @@
+"""
+Tournament store benchmark: batched vs. per-event fsync, and resume time with and without a snapshot.
+
+    python benchmarks/bench_store.py [--entries 512] [--results 5000]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Entry  # noqa: E402
+from pairing import generate_bracket_balanced, make_rng  # noqa: E402
+from progression import TBD_ID  # noqa: E402
+from store import TournamentStore  # noqa: E402
+
+
+def fill(store: TournamentStore, entries, results: int, seed: int):
+    pairs = generate_bracket_balanced(entries, rng=make_rng(seed))
+    store.apply({"type": "entries", "rows": [[e.player, e.character] for e in entries]})
+    store.apply({"type": "bracket", "pairs": [[[a.player, a.character], [b.player, b.character]] for a, b in pairs]})
+    state = store.tournament.bracket
+    rng = random.Random(seed)
+    done = 0
+    while done < results:
+        r = rng.randrange(state.num_rounds)
+        i = rng.randrange(state.round_size(r))
+        a, b = state.sides(r, i)
+        if store.apply({"type": "bracket_result", "round": r, "match": i, "winner": rng.choice([a, b, TBD_ID])}):
+            done += 1
+    store.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--entries", type=int, default=512)
+    ap.add_argument("--results", type=int, default=5000)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    entries = [Entry(f"P{i // 2}", f"C{i}") for i in range(args.entries)]
+    root = tempfile.mkdtemp()
+    try:
+        print(f"{'mode':<28} {'write (s)':>10} {'resume (ms)':>12} {'replayed':>9}")
+        modes = [
+            ("fsync every event", dict(batch_size=1, snapshot_every=10 ** 9)),
+            ("batched (64)", dict(batch_size=64, snapshot_every=10 ** 9)),
+            ("batched + snapshots (1000)", dict(batch_size=64, snapshot_every=1000)),
+        ]
+        for label, opts in modes:
+            d = os.path.join(root, label.replace(" ", "_"))
+            t0 = time.perf_counter()
+            fill(TournamentStore("bench", d, **opts), entries, args.results, args.seed)
+            t_write = time.perf_counter() - t0
+            reopened = TournamentStore("bench", d)
+            print(f"{label:<28} {t_write:>10.3f} {reopened.load_seconds * 1000:>12.2f} {reopened.replayed:>9}")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Entry-table micro-benchmark: vectorized df_to_entries / auto_fill_characters vs. the row-wise originals.
+
+    python benchmarks/bench_tables.py [--rows 1000 10000 100000] [--chars 4]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import List
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Entry  # noqa: E402
+from pairing import make_rng  # noqa: E402
+from roster import SMASH_CHARACTERS  # noqa: E402
+from tables import auto_fill_characters, build_entries_df, df_to_entries  # noqa: E402
+
+
+# ---------------------------- Row-wise reference ----------------------------
+def legacy_auto_fill_characters(df: pd.DataFrame, players: List[str], k: int, shuffle_each: bool) -> pd.DataFrame:
+    out = df.copy()
+    for p in players:
+        idxs = list(out.index[out["Player"] == p])
+        labels = [random.choice(SMASH_CHARACTERS) for _ in range(len(idxs))]
+        if shuffle_each:
+            random.shuffle(labels)
+        for row_i, label in zip(idxs, labels):
+            out.at[row_i, "Character"] = label
+    return out
+
+def legacy_df_to_entries(df: pd.DataFrame, clean_rows_flag: bool) -> List[Entry]:
+    entries: List[Entry] = []
+    for _, row in df.iterrows():
+        pl = str(row.get("Player", "")).strip()
+        ch = str(row.get("Character", "")).strip()
+        if clean_rows_flag and (not pl or not ch):
+            continue
+        if pl and ch and ch in SMASH_CHARACTERS:
+            entries.append(Entry(player=pl, character=ch))
+        elif pl and ch:
+            entries.append(Entry(player=pl, character=ch))
+    return entries
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    ap.add_argument("--chars", type=int, default=4, help="rows per player")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--legacy-fill-max", type=int, default=10000,
+                    help="the per-player re-mask is quadratic; skip it above this many rows")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    print(f"{'rows':>8} {'function':<22} {'vectorized (s)':>15} {'row-wise (s)':>13} {'speedup':>8}")
+    for n in args.rows:
+        players = [f"P{i}" for i in range(max(1, n // args.chars))]
+        empty = build_entries_df(players, args.chars)
+        filled = auto_fill_characters(empty, players, args.chars, True, rng=make_rng(args.seed))
+
+        assert df_to_entries(filled) == legacy_df_to_entries(filled, True)
+        t_new = best_of(lambda: df_to_entries(filled), args.repeat)
+        t_old = best_of(lambda: legacy_df_to_entries(filled, True), 1)
+        print(f"{n:>8} {'df_to_entries':<22} {t_new:>15.4f} {t_old:>13.4f} {t_old / t_new:>7.1f}x")
+
+        t_new = best_of(lambda: auto_fill_characters(empty, players, args.chars, True, rng=make_rng(args.seed)), args.repeat)
+        if n <= args.legacy_fill_max:
+            t_old = best_of(lambda: legacy_auto_fill_characters(empty, players, args.chars, True), 1)
+            print(f"{n:>8} {'auto_fill_characters':<22} {t_new:>15.4f} {t_old:>13.4f} {t_old / t_new:>7.1f}x")
+        else:
+            print(f"{n:>8} {'auto_fill_characters':<22} {t_new:>15.4f} {'-':>13} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""
+Benchmark suite: pairing, scheduling, standings, entry tables and entry-line HTML, 8 to 100k entries.
+
+    python benchmarks/suite.py                        # run all, write last_run.json, compare with baseline.json
+    python benchmarks/suite.py --cases pairing --sizes 8 1000
+    python benchmarks/suite.py --update-baseline      # accept this run as the new baseline
+
+Every input comes from a fixed seed, so two runs time the same work. A point
+regresses when its best time is more than --tolerance slower than the
+speed-scaled baseline (and by more than --floor-ms) even after
+--recheck new measurements; the exit status is then 1. Baselines are
+machine-specific: record one per machine with --update-baseline.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from icons import entry_line_html, icon_html, sprite_atlas  # noqa: E402
+from models import Entry, next_power_of_two  # noqa: E402
+from pairing import generate_bracket_balanced, make_rng  # noqa: E402
+from roster import SMASH_CHARACTERS  # noqa: E402
+from round_robin import circle_schedule, round_pairings  # noqa: E402
+from standings import Standings  # noqa: E402
+from tables import auto_fill_characters, build_entries_df, df_to_entries  # noqa: E402
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE = os.path.join(HERE, "baseline.json")
+LAST_RUN = os.path.join(HERE, "last_run.json")
+SIZES = [8, 64, 1_000, 10_000, 100_000]
+MAX_RUNS = 1_000
+
+# A case turns (size, seed) into the zero-argument call that gets timed; building inputs is not timed
+Setup = Callable[[int, int], Callable[[], object]]
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Setup
+    max_size: Optional[int] = None  # Larger sizes are skipped (e.g. quadratic outputs)
+    check: Optional[Callable[[int, object], bool]] = None  # Sanity check on the first result
+
+
+# ---------------------------- Inputs ----------------------------
+def make_entries(n: int, seed: int, chars: int = 2) -> List[Entry]:
+    """n entries from about n / chars players, characters drawn from the roster."""
+    rng = random.Random(seed)
+    players = max(2, n // chars)
+    return [Entry(f"P{i % players}", rng.choice(SMASH_CHARACTERS)) for i in range(n)]
+
+def even_teams(entries: List[Entry], teams: int = 4) -> Dict[str, str]:
+    return {e.player: f"T{int(e.player[1:]) % teams}" for e in entries}
+
+def skewed_teams(entries: List[Entry], share: float = 0.5, teams: int = 4) -> Dict[str, str]:
+    """One team holds `share` of the players, the rest split evenly over the others."""
+    players = sorted({e.player for e in entries}, key=lambda p: int(p[1:]))
+    big = int(len(players) * share)
+    return {p: "T0" if i < big else f"T{1 + i % (teams - 1)}" for i, p in enumerate(players)}
+
+def player_names(n: int) -> Tuple[str, ...]:
+    return tuple(f"P{i}" for i in range(n))
+
+
+# ---------------------------- Cases ----------------------------
+def _pairing(team_fn: Optional[Callable[[List[Entry]], Dict[str, str]]]) -> Setup:
+    def setup(n: int, seed: int):
+        entries = make_entries(n, seed)
+        team_of = team_fn(entries) if team_fn else None
+        return lambda: generate_bracket_balanced(entries, forbid_same_team=team_of is not None,
+                                                 team_of=team_of, rng=make_rng(seed))
+    return setup
+
+def _bracket_ok(n: int, pairs) -> bool:
+    return 2 * len(pairs) == next_power_of_two(n)
+
+def _schedule(n: int, seed: int):
+    players = player_names(n)
+    return lambda: circle_schedule.__wrapped__(players)  # Bypasses the memo so every run builds it
+
+def _one_round(n: int, seed: int):
+    players = player_names(n)
+    k = random.Random(seed).randrange(max(1, n - 1))
+    return lambda: round_pairings(players, k)
+
+def _standings(n: int, seed: int):
+    """n results over the first rounds of an n-player schedule, then every other one corrected."""
+    players = player_names(max(n, 2))
+    matches: List[Tuple[str, str]] = []
+    k = 0
+    while len(matches) < n:
+        matches.extend(round_pairings(players, k).matches)
+        k += 1
+    matches = matches[:n]
+    rng = random.Random(seed)
+    first = [m[rng.random() < 0.5] for m in matches]
+
+    def run():
+        s = Standings(players)
+        for m, w in zip(matches, first):
+            s.set_result(m, w)
+        for m, w in zip(matches[::2], first[::2]):
+            s.set_result(m, m[1] if w == m[0] else m[0])
+        return s.leaderboard()
+    return run
+
+def _df_to_entries(n: int, seed: int):
+    rng = random.Random(seed)
+    df = pd.DataFrame({
+        # About 5% of rows are blank on one side, as in a half-filled table
+        "Player": [f"P{i // 2}" if rng.random() > 0.05 else "" for i in range(n)],
+        "Character": [rng.choice(SMASH_CHARACTERS) if rng.random() > 0.05 else " " for _ in range(n)],
+    })
+    return lambda: df_to_entries(df)
+
+def _auto_fill(n: int, seed: int):
+    players = list(player_names(max(1, n // 2)))
+    df = build_entries_df(players, 2)
+    return lambda: auto_fill_characters(df, players, 2, True, rng=make_rng(seed))
+
+def _entry_lines(n: int, seed: int):
+    """Cold line and icon memos on every run; the sprite atlas is built once per process, so it stays warm."""
+    entries = make_entries(n, seed)
+    sprite_atlas()
+    colors = ["#E91E63", "#3F51B5", "#009688", "#FF9800"]
+
+    def run():
+        entry_line_html.cache_clear()
+        icon_html.cache_clear()
+        return [entry_line_html(e.character, e.player, colors[int(e.player[1:]) % 4]) for e in entries]
+    return run
+
+CASES = [
+    Case("pairing.regular", _pairing(None), check=_bracket_ok),
+    Case("pairing.teams", _pairing(even_teams), check=_bracket_ok),
+    Case("pairing.teams_skewed", _pairing(skewed_teams), check=_bracket_ok),
+    Case("round_robin.schedule", _schedule, max_size=2_000,
+         check=lambda n, s: len(s[0]) == n * (n - 1) // 2),
+    Case("round_robin.round", _one_round),
+    Case("standings.record", _standings, check=lambda n, board: len(board) == max(n, 2)),
+    Case("tables.df_to_entries", _df_to_entries),
+    Case("tables.auto_fill", _auto_fill, check=lambda n, df: bool((df["Character"] != "").all())),
+    Case("render.entry_line", _entry_lines, check=lambda n, lines: len(lines) == n),
+]
+
+
+# ---------------------------- Runner ----------------------------
+def _reference_work():
+    """Fixed pure-Python + NumPy work, timed next to every case to gauge the machine's current speed."""
+    rng = random.Random(0)
+    xs = [rng.random() for _ in range(20_000)]
+    xs.sort()
+    d = {i: x for i, x in enumerate(xs)}
+    np.sort(np.asarray(xs))
+    return sum(d[i] for i in range(0, len(xs), 3))
+
+def time_point(fn: Callable[[], object], repeat: int, min_time: float, budget: float) -> Tuple[List[float], object]:
+    """
+    Timed calls until there are `repeat` of them and `min_time` seconds are
+    spent (capped at MAX_RUNS), or as soon as `budget` seconds are spent.
+    Fast points thus get many runs, whose best is stable on a noisy machine.
+    One untimed warm-up call comes first; GC is off while timing.
+    """
+    times: List[float] = []
+    result = None
+    spent = 0.0
+    fn()
+    gc.collect()
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while True:
+            t0 = time.perf_counter()
+            result = fn()
+            times.append(time.perf_counter() - t0)
+            spent += times[-1]
+            if spent >= budget or len(times) >= MAX_RUNS or (len(times) >= repeat and spent >= min_time):
+                break
+    finally:
+        if enabled:
+            gc.enable()
+    return times, result
+
+def measure(case: Case, n: int, *, seed: int, repeat: int, min_time: float, budget: float) -> Dict[str, object]:
+    """One point, with the reference work timed just before it."""
+    calibration = min(time_point(_reference_work, 5, 0.05, 1.0)[0]) * 1000
+    times, out = time_point(case.setup(n, seed), repeat, min_time, budget)
+    if case.check is not None and not case.check(n, out):
+        raise AssertionError(f"{case.name} gave a wrong result at size {n}")
+    return {"case": case.name, "size": n, "best_ms": min(times) * 1000,
+            "median_ms": statistics.median(times) * 1000, "runs": len(times), "calibration_ms": calibration}
+
+def run_suite(cases: Sequence[Case], sizes: Sequence[int], **timing) -> Dict[str, Dict]:
+    results: Dict[str, Dict] = {}
+    print(f"{'case':<24} {'size':>8} {'best ms':>10} {'median ms':>10} {'runs':>5}")
+    for case in cases:
+        for n in sizes:
+            if case.max_size is not None and n > case.max_size:
+                continue
+            row = results[f"{case.name}/{n}"] = measure(case, n, **timing)
+            print(f"{case.name:<24} {n:>8} {row['best_ms']:>10.3f} {row['median_ms']:>10.3f} {row['runs']:>5}")
+    return results
+
+def environment(seed: int) -> Dict[str, object]:
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": f"{platform.system()} {platform.machine()}",
+        "cpus": os.cpu_count(),
+        "seed": seed,
+    }
+
+def expected_ms(row: Dict, base: Dict) -> float:
+    """
+    The baseline time scaled by how much slower or faster the reference work
+    ran for `row` than when the baseline was recorded, so a busy machine is
+    not a regression.
+    """
+    speed = row["calibration_ms"] / base["calibration_ms"] if base.get("calibration_ms") else 1.0
+    return base["best_ms"] * speed
+
+def regressions(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float, floor_ms: float) -> List[str]:
+    slow = []
+    for key, row in results.items():
+        if key in baseline:
+            expected = expected_ms(row, baseline[key])
+            if row["best_ms"] > expected * (1 + tolerance) and row["best_ms"] - expected > floor_ms:
+                slow.append(key)
+    return slow
+
+def report(results: Dict[str, Dict], baseline: Dict[str, Dict], regressed: Sequence[str]):
+    print(f"\n{'case':<24} {'size':>8} {'base ms':>10} {'scaled':>10} {'now ms':>10} {'ratio':>7}")
+    for key, row in results.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f"{row['case']:<24} {row['size']:>8} {'-':>10} {'-':>10} {row['best_ms']:>10.3f} {'new':>7}")
+            continue
+        expected = expected_ms(row, base)
+        print(f"{row['case']:<24} {row['size']:>8} {base['best_ms']:>10.3f} {expected:>10.3f} {row['best_ms']:>10.3f} "
+              f"{row['best_ms'] / max(expected, 1e-9):>6.2f}x{'  REGRESSION' if key in regressed else ''}")
+
+def write_json(path: str, seed: int, results: Dict[str, Dict]):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(seed), "results": results}, f, indent=1)
+        f.write("\n")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--cases", nargs="+", default=[], help="run only cases whose name starts with one of these")
+    ap.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--repeat", type=int, default=5, help="minimum timed calls per point")
+    ap.add_argument("--min-time", type=float, default=0.3, help="keep repeating a point until this many seconds")
+    ap.add_argument("--budget", type=float, default=2.0, help="stop repeating a point after this many seconds")
+    ap.add_argument("--out", default=LAST_RUN, help="where this run's JSON goes")
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--update-baseline", action="store_true", help="write this run to --baseline instead of comparing")
+    ap.add_argument("--tolerance", type=float, default=0.5,
+                    help="allowed slowdown over the speed-scaled baseline (0.5 = 1.5x); tighten on a quiet machine")
+    ap.add_argument("--floor-ms", type=float, default=0.05, help="slowdowns smaller than this are noise")
+    ap.add_argument("--recheck", type=int, default=2, help="times a slow point is measured again before it counts")
+    args = ap.parse_args()
+
+    cases = [c for c in CASES if not args.cases or c.name.startswith(tuple(args.cases))]
+    if not cases:
+        ap.error(f"no case matches {args.cases}; cases: {', '.join(c.name for c in CASES)}")
+    timing = dict(seed=args.seed, repeat=args.repeat, min_time=args.min_time, budget=args.budget)
+    results = run_suite(cases, args.sizes, **timing)
+
+    if args.update_baseline:
+        write_json(args.out, args.seed, results)
+        write_json(args.baseline, args.seed, results)
+        print(f"\nWrote {args.out}\nBaseline updated: {args.baseline}")
+        return
+    baseline: Dict[str, Dict] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            recorded = json.load(f)
+        if recorded.get("environment", {}).get("seed") != args.seed:
+            print("Warning: the baseline was recorded with a different seed.")
+        baseline = recorded["results"]
+    # A slow point is measured again before it counts: noise rarely repeats, a real regression does
+    regressed = regressions(results, baseline, args.tolerance, args.floor_ms)
+    by_name = {c.name: c for c in cases}
+    for _ in range(args.recheck):
+        if not regressed:
+            break
+        print(f"\nRe-measuring {len(regressed)} slow point(s)")
+        for key in regressed:
+            row = results[key]
+            again = measure(by_name[row["case"]], row["size"], **timing)
+            if again["best_ms"] / again["calibration_ms"] < row["best_ms"] / row["calibration_ms"]:
+                results[key] = again
+        regressed = regressions(results, baseline, args.tolerance, args.floor_ms)
+    write_json(args.out, args.seed, results)
+    print(f"\nWrote {args.out}")
+
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return
+    report(results, baseline, regressed)
+    if regressed:
+        print(f"\n{len(regressed)} regression(s): {', '.join(regressed)}")
+        sys.exit(1)
+    print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import io
+import json
+from dataclasses import dataclass
+from typing import IO, Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+
+from records import CHUNK_ROWS, canonical_column, detect_format
+from tables import clean_column
+
+
+# ---------------------------- Import ----------------------------
+@dataclass
+class ImportResult:
+    entries: pd.DataFrame      # Player / Character rows with a character, in file order
+    players: List[str]         # every distinct player, in first-seen order
+    team_of: Dict[str, str]    # player -> team, from each player's first non-empty team cell
+    rows_read: int
+
+def _normalize(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Renames known headers and returns stripped Player / Character / Team string columns."""
+    chunk = chunk.rename(columns={c: canonical_column(c) for c in chunk.columns})
+    chunk = chunk.loc[:, ~chunk.columns.duplicated()]
+    return pd.DataFrame({col: clean_column(chunk, col) for col in ("Player", "Character", "Team")})
+
+def _read_chunks(source: Union[str, IO], fmt: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    if fmt == "csv":
+        yield from pd.read_csv(source, dtype=str, keep_default_na=False, chunksize=chunk_rows)
+    elif fmt == "json":
+        if hasattr(source, "read"):
+            raw = source.read()
+        else:
+            with open(source, "rb") as f:
+                raw = f.read()
+        text = raw.decode("utf-8-sig") if isinstance(raw, bytes) else raw
+        stripped = text.lstrip()
+        if stripped.startswith("["):
+            # A JSON array has to be parsed whole; JSON lines stream in chunks
+            yield pd.DataFrame(json.loads(stripped))
+        else:  # JSON lines
+            yield from pd.read_json(io.StringIO(text), lines=True, dtype=str, chunksize=chunk_rows)
+    elif fmt == "parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet import needs pyarrow (pip install pyarrow)") from e
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"unknown format {fmt!r}")
+
+def import_table(source: Union[str, IO], fmt: Optional[str] = None, *, chunk_rows: int = CHUNK_ROWS) -> ImportResult:
+    """
+    Players, teams and entries from a CSV, JSON (array or lines) or Parquet file.
+
+    The file is read in `chunk_rows` pieces, each normalized with column
+    operations only. Rows with a player but no character just register the
+    player (and team); rows without a player are dropped.
+    """
+    if fmt is None:
+        fmt = detect_format(source if isinstance(source, str) else getattr(source, "name", ""))
+    parts = [_normalize(chunk) for chunk in _read_chunks(source, fmt, chunk_rows)]
+    df = pd.concat(parts, ignore_index=True) if parts else _normalize(pd.DataFrame())
+    rows_read = len(df)
+    df = df[df["Player"] != ""]
+
+    players = pd.unique(df["Player"]).tolist()
+    teams = df[df["Team"] != ""].drop_duplicates("Player")
+    team_of = dict(zip(teams["Player"].tolist(), teams["Team"].tolist()))
+    entries = df.loc[df["Character"] != "", ["Player", "Character"]].reset_index(drop=True)
+    return ImportResult(entries, players, team_of, rows_read)
@@ -0,0 +1,39 @@
+import functools
+from typing import Callable, Dict, List, Optional
+
+# Every memoized function in the app, by "module.name", for cache_stats()
+_REGISTRY: Dict[str, Callable] = {}
+
+
+# ---------------------------- Process-wide memoization ----------------------------
+def memoize(maxsize: Optional[int] = 128):
+    """
+    functools.lru_cache (bounded LRU, or unbounded with maxsize=None) that also
+    registers the function so its hits and misses show up in cache_stats().
+    Arguments must be hashable; callers should treat cached results as read-only.
+    """
+    def decorator(fn: Callable) -> Callable:
+        cached = functools.lru_cache(maxsize=maxsize)(fn)
+        _REGISTRY[f"{fn.__module__}.{fn.__qualname__}"] = cached
+        return cached
+    return decorator
+
+def cache_stats() -> List[Dict[str, object]]:
+    """Hits / misses / size per memoized function since the process started (or the last clear)."""
+    rows = []
+    for name, fn in sorted(_REGISTRY.items()):
+        info = fn.cache_info()
+        calls = info.hits + info.misses
+        rows.append({
+            "Cache": name,
+            "Hits": info.hits,
+            "Misses": info.misses,
+            "Size": info.currsize,
+            "Max": info.maxsize,  # None = unbounded
+            "Hit Rate": info.hits / calls if calls else 0.0,
+        })
+    return rows
+
+def clear_caches():
+    for fn in _REGISTRY.values():
+        fn.cache_clear()
@@ -0,0 +1,126 @@
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from caching import memoize
+from roster import SMASH_CHARACTERS, SMASH_DATA
+
+NUMERIC_STATS = ["Weight", "Run Speed", "Air Speed", "Fall Speed"]
+TIER_ORDER = ["S", "A", "B", "C", "D", "E", "F", "W"]
+# Higher is stronger; "W" (unranked) has no score.
+TIER_SCORES = {"S": 6.0, "A": 5.0, "B": 4.0, "C": 3.0, "D": 2.0, "E": 1.0, "F": 0.0}
+PERCENTILES = [0.0, 0.25, 0.5, 0.75, 1.0]
+
+
+# ---------------------------- Typed roster table ----------------------------
+@memoize(maxsize=None)
+def roster_table() -> pd.DataFrame:
+    """
+    SMASH_DATA as one typed, column-oriented table indexed by character name
+    (in SMASH_CHARACTERS order). Stats are float64 with NaN where the source
+    has text such as "Close Combat" or "N/A"; that text moves to `Notes`.
+    Built once per process; treat the result as read-only.
+    """
+    rows = []
+    for name in SMASH_CHARACTERS:
+        raw = SMASH_DATA.get(name, {})
+        row = {"Character": name, "Tier": raw.get("Tier Rank (S-F)")}
+        notes = []
+        for stat in NUMERIC_STATS:
+            v = raw.get(stat)
+            if isinstance(v, (int, float)):
+                row[stat] = float(v)
+            else:
+                row[stat] = np.nan
+                if v is not None:
+                    notes.append(f"{stat}: {v}")
+        row["Notes"] = "; ".join(notes)
+        rows.append(row)
+
+    df = pd.DataFrame(rows).set_index("Character")
+    df["Tier"] = pd.Categorical(df["Tier"], categories=TIER_ORDER, ordered=True)
+    df["Tier Score"] = df["Tier"].map(TIER_SCORES).astype("float64")
+    df[NUMERIC_STATS] = df[NUMERIC_STATS].astype("float64")
+    return df
+
+@memoize(maxsize=None)
+def stat_summary() -> pd.DataFrame:
+    """Min / quartiles / max of every numeric stat (rows 0.0 ... 1.0), ignoring NaN."""
+    return roster_table()[NUMERIC_STATS].quantile(PERCENTILES)
+
+def stat_range(stat: str) -> Tuple[float, float]:
+    s = stat_summary()[stat]
+    return float(s.loc[0.0]), float(s.loc[1.0])
+
+@memoize(maxsize=None)
+def _percentile_ranks() -> pd.DataFrame:
+    return roster_table()[NUMERIC_STATS].rank(pct=True)
+
+def stat_percentile(char_name: str, stat: str) -> float:
+    """Share of the roster at or below this character's value (NaN if it has none)."""
+    ranks = _percentile_ranks()
+    return float(ranks.at[char_name, stat]) if char_name in ranks.index else float("nan")
+
+
+# ---------------------------- Display lookups ----------------------------
+_UNKNOWN = {k: "Unknown" for k in ["Tier Rank"] + NUMERIC_STATS}
+
+@memoize(maxsize=None)
+def _display_rows() -> Dict[str, Dict[str, object]]:
+    out = {}
+    for name, data in SMASH_DATA.items():
+        row = {"Tier Rank": data.get("Tier Rank (S-F)", "N/A")}
+        row.update({stat: data.get(stat, "N/A") for stat in NUMERIC_STATS})
+        out[name] = row
+    return out
+
+def get_char_data(char_name: str) -> Dict[str, str | float]:
+    """Display stats for one character: numbers where known, the source text otherwise. O(1), shared dicts."""
+    return _display_rows().get(char_name, _UNKNOWN)
+
+
+# ---------------------------- Similarity & ranking ----------------------------
+SIMILARITY_FEATURES = ["Tier Score"] + NUMERIC_STATS
+
+@memoize(maxsize=None)
+def stats_matrix() -> Tuple[Tuple[str, ...], np.ndarray]:
+    """(names, X): min-max normalized SIMILARITY_FEATURES, one row per character, NaN where unknown."""
+    df = roster_table()[SIMILARITY_FEATURES]
+    lo, hi = df.min(), df.max()
+    X = ((df - lo) / (hi - lo).replace(0, 1)).to_numpy(dtype=np.float64)
+    X.setflags(write=False)
+    return tuple(df.index), X
+
+def similarity_distances(char_name: str) -> pd.Series:
+    """
+    Normalized Euclidean distance from `char_name` to every character, in one
+    array operation. Features either side lacks are skipped and the sum is
+    rescaled to the full feature count, so missing data neither helps nor hurts;
+    pairs sharing fewer than two known features get NaN.
+    """
+    names, X = stats_matrix()
+    q = X[names.index(char_name)]
+    diff = X - q
+    known = ~np.isnan(diff)
+    used = known.sum(axis=1)
+    sq = np.where(known, diff, 0.0) ** 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dist = np.sqrt(sq.sum(axis=1) * X.shape[1] / used)
+    dist[used < 2] = np.nan
+    return pd.Series(dist, index=names, name="Distance")
+
+def most_similar(char_name: str, k: int = 5) -> pd.DataFrame:
+    """The k nearest characters to `char_name` (itself excluded) with their stats."""
+    d = similarity_distances(char_name).drop(char_name).dropna().nsmallest(k)
+    return roster_table().loc[d.index, ["Tier"] + NUMERIC_STATS].assign(Distance=d.round(3))
+
+def rank_by(stat: str, ascending: bool = False, top: int = 10) -> pd.DataFrame:
+    """Roster sorted by any stat column (Tier sorts S first); unknown values go last."""
+    df = roster_table()
+    if stat == "Tier":
+        order = df["Tier"].cat.codes.replace(-1, len(TIER_ORDER)).sort_values(ascending=not ascending, kind="stable")
+        out = df.loc[order.index]
+    else:
+        out = df.sort_values(stat, ascending=ascending, na_position="last", kind="stable")
+    return out[["Tier"] + NUMERIC_STATS].head(top)
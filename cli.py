@@ -0,0 +1,153 @@
+"""
+Headless bracket / round-robin generation: the same engine as the app, without Streamlit.
+
+    python cli.py bracket entries.csv [--format single|double|swiss] [--teams] [--seed N] [--candidates K [--workers W]] [-o out.csv]
+    python cli.py schedule players.txt [--round K] [-o out.jsonl]
+
+Entries files are CSV, JSON / JSON lines or Parquet with Player, Character
+and optional Team columns (same headers the app imports). A players file is
+one name per line, or any entries file. Output goes to -o (format from the
+extension) or to stdout as CSV.
+"""
+import argparse
+import os
+import sys
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from models import Entry
+from records import detect_format, read_records, write_rows
+
+
+# ---------------------------- Inputs ----------------------------
+def load_entries(path: str) -> Tuple[List[Entry], Dict[str, str]]:
+    """(entries, team_of) from an entries file; Parquet goes through pandas, the rest is stdlib only."""
+    fmt = detect_format(path)
+    if fmt == "parquet":
+        from bulk_io import import_table
+        result = import_table(path, fmt)
+        rows = zip(result.entries["Player"].tolist(), result.entries["Character"].tolist())
+        return [Entry(p, c) for p, c in rows], result.team_of
+    entries: List[Entry] = []
+    team_of: Dict[str, str] = {}
+    for rec in read_records(path, fmt):
+        if not rec["Player"]:
+            continue
+        if rec["Team"]:
+            team_of.setdefault(rec["Player"], rec["Team"])
+        if rec["Character"]:
+            entries.append(Entry(rec["Player"], rec["Character"]))
+    return entries, team_of
+
+def load_players(path: str) -> List[str]:
+    """Distinct players in file order: one per line in a .txt file, else the Player column."""
+    if os.path.splitext(path)[1].lower() in ("", ".txt"):
+        with open(path, encoding="utf-8-sig") as f:
+            names = [line.strip() for line in f]
+    elif detect_format(path) == "parquet":
+        from bulk_io import import_table
+        names = import_table(path, "parquet").players
+    else:
+        names = [rec["Player"] for rec in read_records(path)]
+    return list(dict.fromkeys(n for n in names if n))
+
+
+# ---------------------------- Commands ----------------------------
+def bracket_command(args) -> Iterator[Dict[str, object]]:
+    from pairing import generate_bracket_seeded, make_rng, pairing_report
+
+    entries, team_of = load_entries(args.entries)
+    if len(entries) < 2:
+        raise SystemExit("need at least 2 entries")
+    forbid = args.teams
+    report = pairing_report(entries, forbid_same_team=forbid, team_of=team_of)
+    if report.forced_byes and args.format != "swiss":
+        note = f"forced BYEs: {report.forced_byes} ({report.largest_group} holds over half the entries)"
+        if report.same_team_to_avoid:
+            note += f"; {report.same_team_to_avoid} same-team match(es) would avoid them"
+        print(note, file=sys.stderr)
+    if args.format == "double":
+        from formats import generate_double_elimination
+        for m in generate_double_elimination(entries, forbid_same_team=forbid, team_of=team_of, rng=make_rng(args.seed)):
+            yield {"Match": m.mid, "Bracket": m.bracket, "Round": m.round, "Side A": m.a.describe(), "Side B": m.b.describe()}
+    elif args.format == "swiss":
+        from formats import swiss_pairings
+        rnd = swiss_pairings(entries, [0.0] * len(entries), set(), forbid_same_team=forbid, team_of=team_of,
+                             rng=make_rng(args.seed))
+        for i, (a, b) in enumerate(rnd.pairs, 1):
+            yield {"Round": 1, "Match": i, "Side A": _label(entries[a]), "Side B": _label(entries[b])}
+        for idx in ([rnd.bye] if rnd.bye is not None else []) + rnd.unpaired:
+            yield {"Round": 1, "Match": None, "Side A": _label(entries[idx]), "Side B": "BYE"}
+    else:
+        from models import PackedBracket
+        from progression import BracketState
+        from records import bracket_rows
+        pairs, score, seed = generate_bracket_seeded(entries, candidates=args.candidates, forbid_same_team=forbid,
+                                                     team_of=team_of, seed=args.seed, workers=args.workers)
+        if seed is not None:
+            print(f"seed: {seed}" + (f"  score: {score}" if score is not None else ""), file=sys.stderr)
+        yield from bracket_rows(BracketState(PackedBracket.from_pairs(pairs)))
+
+def schedule_command(args) -> Iterator[Dict[str, object]]:
+    from records import schedule_rows
+    from round_robin import num_rounds, round_pairings
+
+    players = load_players(args.players)
+    if len(players) < 2:
+        raise SystemExit("need at least 2 players")
+    if args.round is None:
+        yield from schedule_rows(players)
+        return
+    if not 1 <= args.round <= num_rounds(len(players)):
+        raise SystemExit(f"--round must be 1..{num_rounds(len(players))} for {len(players)} players")
+    rnd = round_pairings(players, args.round - 1)
+    for i, (p1, p2) in enumerate(rnd.matches, 1):
+        yield {"Round": args.round, "Match": i, "Player 1": p1, "Player 2": p2}
+    if rnd.bye is not None:
+        yield {"Round": args.round, "Match": None, "Player 1": rnd.bye, "Player 2": "BYE"}
+
+def _label(e: Entry) -> str:
+    return f"{e.player} — {e.character}"
+
+
+# ---------------------------- Output ----------------------------
+def write_output(rows: Iterable[Dict[str, object]], out: str) -> int:
+    if out == "-":
+        return write_rows(rows, "csv", sys.stdout.buffer)
+    fmt = detect_format(out)
+    with open(out, "wb") as f:
+        return write_rows(rows, fmt, f)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    b = sub.add_parser("bracket", help="Round 1 (and the full match layout) from an entries file")
+    b.add_argument("entries")
+    b.add_argument("--format", choices=["single", "double", "swiss"], default="single")
+    b.add_argument("--teams", action="store_true", help="forbid same-team Round 1 matches (Team column)")
+    b.add_argument("--seed", type=int, default=None)
+    b.add_argument("--candidates", type=int, default=1, help="single elimination: keep the fairest of K brackets")
+    b.add_argument("--workers", type=int, default=1, help="processes for --candidates (default: in-process)")
+    b.add_argument("-o", "--out", default="-")
+
+    s = sub.add_parser("schedule", help="round-robin schedule (circle method)")
+    s.add_argument("players")
+    s.add_argument("--round", type=int, default=None, help="only this round (1-based), built directly")
+    s.add_argument("-o", "--out", default="-")
+
+    args = ap.parse_args(argv)
+    rows = bracket_command(args) if args.command == "bracket" else schedule_command(args)
+    try:
+        n = write_output(rows, args.out)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    except BrokenPipeError:
+        # Output piped into e.g. `head`: stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    if args.out != "-":
+        print(f"wrote {n} rows to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
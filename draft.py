@@ -0,0 +1,229 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from character_stats import TIER_ORDER, roster_table
+from profiling import timed
+
+
+# ---------------------------- Rules ----------------------------
+@dataclass(frozen=True)
+class DraftRules:
+    """
+    Constraints for auto-filling characters. The defaults mean "no rules",
+    which keeps the plain independent draw.
+    """
+    unique_per_player: bool = False   # No character twice for one player
+    max_uses: Optional[int] = None    # Copies of one character across the whole table
+    tier_quota: Dict[str, int] = field(default_factory=dict)  # Tier -> most characters of it per player
+    balance_tiers: bool = False       # Even out the players' total tier scores
+
+    @property
+    def active(self) -> bool:
+        return self.unique_per_player or self.max_uses is not None or bool(self.tier_quota) or self.balance_tiers
+
+def tier_scores() -> np.ndarray:
+    """Tier score per roster character; unranked ones count as the roster average."""
+    score = roster_table()["Tier Score"]
+    return score.fillna(score.mean()).to_numpy()
+
+
+# ---------------------------- Draft ----------------------------
+class _Draft:
+    """Per-player picks, used sets, tier counts and totals, plus the copies left of each character."""
+
+    def __init__(self, counts: Sequence[int], rules: DraftRules):
+        table = roster_table()
+        self.names = table.index.tolist()
+        unranked = TIER_ORDER.index("W")
+        self.tier = [t if t >= 0 else unranked for t in table["Tier"].cat.codes.tolist()]  # Index into TIER_ORDER
+        self.score = tier_scores().tolist()
+        self.rules = rules
+        n = sum(counts)
+        self.unique = rules.unique_per_player
+        unknown = set(rules.tier_quota) - set(TIER_ORDER)
+        if unknown:
+            raise ValueError(f"unknown tier(s) in the quota: {', '.join(sorted(unknown))}")
+        self.quota = [rules.tier_quota.get(t, n) for t in TIER_ORDER]
+        self.left = [n if rules.max_uses is None else rules.max_uses] * len(self.names)
+        self.picks: List[List[int]] = [[] for _ in counts]
+        self.used = [set() for _ in counts]
+        self.tier_count = [[0] * len(TIER_ORDER) for _ in counts]
+        self.total = [0.0] * len(counts)
+
+    def check_feasible(self, counts: Sequence[int]):
+        """
+        Up-front capacity checks, so impossible rules fail with a reason
+        instead of midway: per player, and per tier across the table (each
+        tier supplies at most its size x `max_uses`, and absorbs at most
+        every player's quota for it).
+        """
+        per_tier = np.bincount(self.tier, minlength=len(TIER_ORDER)).tolist()
+        per_player = [min(q, k) if self.unique else q for q, k in zip(self.quota, per_tier) if k]
+        if counts and max(counts) > sum(per_player):
+            raise ValueError(f"a player needs {max(counts)} characters, but the rules allow at most {sum(per_player)} each")
+        if self.rules.max_uses is None and not self.rules.tier_quota:
+            return
+        room = 0
+        for q, k in zip(self.quota, per_tier):
+            if k:
+                supply = k * self.left[0]
+                room += min(supply, sum(min(c, min(q, k) if self.unique else q) for c in counts))
+        if sum(counts) > room:
+            raise ValueError(f"{sum(counts)} characters needed, but the use cap and tier quotas only allow {room}")
+
+    def allowed(self, p: int, c: int) -> bool:
+        return (self.left[c] > 0 and not (self.unique and c in self.used[p])
+                and self.tier_count[p][self.tier[c]] < self.quota[self.tier[c]])
+
+    def add(self, p: int, c: int):
+        self.picks[p].append(c)
+        self.used[p].add(c)
+        self.tier_count[p][self.tier[c]] += 1
+        self.total[p] += self.score[c]
+        self.left[c] -= 1
+
+    def take(self, p: int, tiers: Sequence[int], buckets: List[List[int]]) -> bool:
+        """Gives `p` a fitting character from the first of `tiers` that has one in `buckets`."""
+        for t in tiers:
+            if self.tier_count[p][t] >= self.quota[t]:
+                continue
+            bucket = buckets[t]
+            for j in range(len(bucket) - 1, -1, -1):
+                if self.allowed(p, bucket[j]):
+                    self.add(p, bucket.pop(j))
+                    return True
+        return False
+
+    def fallback(self, p: int, gen: np.random.Generator) -> bool:
+        """
+        No drawn character fits `p`: take any character left that does (the
+        strongest when balancing), else swap one with another player.
+        """
+        fits = [c for c in gen.permutation(len(self.names)).tolist() if self.allowed(p, c)]
+        if fits:
+            self.add(p, max(fits, key=self.score.__getitem__) if self.rules.balance_tiers else fits[0])
+            return True
+        return self._swap(p, gen)
+
+    def _swap(self, p: int, gen: np.random.Generator) -> bool:
+        """
+        One-step augmenting path: some player q hands `p` a character c that
+        fits `p`, and takes a spare character r in its place.
+        """
+        spare = [r for r in range(len(self.names)) if self.left[r] > 0]
+        for q in gen.permutation(len(self.picks)).tolist():
+            if q == p:
+                continue
+            for k, c in enumerate(self.picks[q]):
+                tc = self.tier[c]
+                if (self.unique and c in self.used[p]) or self.tier_count[p][tc] >= self.quota[tc]:
+                    continue
+                for r in spare:
+                    tr = self.tier[r]
+                    if r == c or (self.unique and r in self.used[q]):
+                        continue
+                    if self.tier_count[q][tr] - (tr == tc) >= self.quota[tr]:
+                        continue
+                    self.picks[q][k] = r
+                    self.used[q].discard(c)
+                    self.used[q].add(r)
+                    self.tier_count[q][tc] -= 1
+                    self.tier_count[q][tr] += 1
+                    self.total[q] += self.score[r] - self.score[c]
+                    self.left[r] -= 1
+                    self.left[c] += 1  # Handed straight on to p
+                    self.add(p, c)
+                    return True
+        return False
+
+    def rebalance(self, rounds: int):
+        """
+        Polish after the draft: while the strongest and weakest players can
+        trade one character each to narrow their gap, trade the pair that
+        lands closest to even. At most `rounds` trades.
+        """
+        total = np.asarray(self.total)
+        for _ in range(rounds):
+            hi, lo = int(total.argmax()), int(total.argmin())
+            gap = total[hi] - total[lo]
+            best, best_miss = None, gap / 2
+            for i, a in enumerate(self.picks[hi]):
+                for j, b in enumerate(self.picks[lo]):
+                    delta = self.score[a] - self.score[b]
+                    if 0 < delta < gap and abs(gap / 2 - delta) < best_miss and self._can_trade(hi, a, lo, b):
+                        best, best_miss = (i, j), abs(gap / 2 - delta)
+            if best is None:
+                break
+            i, j = best
+            a, b = self.picks[hi][i], self.picks[lo][j]
+            self.picks[hi][i], self.picks[lo][j] = b, a
+            for p, out, into in ((hi, a, b), (lo, b, a)):
+                self.used[p].discard(out)
+                self.used[p].add(into)
+                self.tier_count[p][self.tier[out]] -= 1
+                self.tier_count[p][self.tier[into]] += 1
+                self.total[p] += self.score[into] - self.score[out]
+                total[p] = self.total[p]
+
+    def _can_trade(self, p: int, a: int, q: int, b: int) -> bool:
+        """Whether `p` can give `a` for `q`'s `b` without breaking uniqueness or a tier quota."""
+        if self.unique and (b in self.used[p] or a in self.used[q]):
+            return False
+        ta, tb = self.tier[a], self.tier[b]
+        return ta == tb or (self.tier_count[p][tb] < self.quota[tb] and self.tier_count[q][ta] < self.quota[ta])
+
+@timed()
+def draft_characters(counts: Sequence[int], rules: DraftRules, gen: np.random.Generator) -> List[List[str]]:
+    """
+    Characters for each player (player i gets counts[i]) under `rules`, drafted
+    in rounds: each round every player still short of characters gets one.
+
+    A round draws one character per such player in a single multinomial
+    (or, with `max_uses`, multivariate hypergeometric) draw over the copies
+    left, so caps are respected by construction. Players then pick in order
+    from the draw, bucketed by tier: at random among the tiers they still
+    have quota for, or, when balancing, lowest total tier score first and
+    strongest tier that fits, which works like a snake draft (a few trades
+    between the extremes finish it). A player nothing drawn fits takes any
+    character that does, or swaps with another player; ValueError only if
+    even that fails. Cost is O(rounds x players x (log players + tiers)),
+    no rejection sampling.
+    """
+    draft = _Draft(counts, rules)
+    draft.check_feasible(counts)
+    n_chars = len(draft.names)
+    strongest_first = sorted(set(draft.tier), key=lambda t: -max(draft.score[c] for c in range(n_chars) if draft.tier[c] == t))
+    counts_arr = np.asarray(counts, dtype=np.int64)
+    for r in range(int(counts_arr.max(initial=0))):
+        need = np.flatnonzero(counts_arr > r)
+        order = gen.permutation(need)
+        if rules.balance_tiers:
+            order = order[np.argsort(np.asarray(draft.total)[order], kind="stable")]
+        m = len(order)
+        if rules.max_uses is None:
+            drawn_counts = gen.multinomial(m, np.full(n_chars, 1 / n_chars))
+        else:
+            drawn_counts = gen.multivariate_hypergeometric(np.asarray(draft.left), m)
+        # The round's draw, bucketed by tier so a player at a tier's quota skips it in one step
+        buckets: List[List[int]] = [[] for _ in TIER_ORDER]
+        for c in gen.permutation(np.repeat(np.arange(n_chars), drawn_counts)).tolist():
+            buckets[draft.tier[c]].append(c)
+        u = gen.random(m).tolist()
+        for p, x in zip(order.tolist(), u):
+            if rules.balance_tiers:
+                tiers = strongest_first
+            else:  # A uniform pick among the drawn characters of the tiers `p` still has room in
+                room = [t for t in range(len(TIER_ORDER)) if buckets[t] and draft.tier_count[p][t] < draft.quota[t]]
+                x *= sum(len(buckets[t]) for t in room)
+                for k, t in enumerate(room):
+                    x -= len(buckets[t])
+                    if x < 0:
+                        break
+                tiers = room[k:] + room[:k] if room else []
+            if not draft.take(p, tiers, buckets) and not draft.fallback(p, gen):
+                raise ValueError("couldn't fill every row under these rules; loosen the quotas or the use cap")
+    if rules.balance_tiers:
+        draft.rebalance(4 * len(counts))
+    return [[draft.names[c] for c in picks] for picks in draft.picks]
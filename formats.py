@@ -0,0 +1,245 @@
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from matching import greedy_matching, max_cardinality_matching
+from models import BYE, Entry, next_power_of_two
+from pairing import generate_bracket_balanced, make_rng
+
+
+# ---------------------------- Match graph ----------------------------
+@dataclass(frozen=True)
+class Feed:
+    """Where one side of a match comes from: a fixed entry, or the winner/loser of another match."""
+    kind: str  # "entry", "winner" or "loser"
+    ref: Union[Entry, int]
+
+    def describe(self) -> str:
+        if self.kind == "entry":
+            return f"{self.ref.player} — {self.ref.character}"
+        return f"{self.kind.capitalize()} of M{self.ref}"
+
+@dataclass(frozen=True)
+class GraphMatch:
+    mid: int
+    bracket: str  # "W" (winners), "L" (losers) or "GF" (grand final)
+    round: int    # 1-based within its bracket
+    a: Feed
+    b: Feed
+
+def _entry_feed(e: Entry) -> Feed:
+    return Feed("entry", e)
+
+def resolve_graph(matches: List[GraphMatch], results: Dict[int, Entry]) -> Dict[int, Tuple[Optional[Entry], Optional[Entry]]]:
+    """
+    Entrants of every match given the reported winners (mid -> winning Entry).
+    Matches must be in dependency order, which the generators guarantee.
+    BYE sides advance the other entrant automatically; None means TBD.
+    """
+    winner: Dict[int, Optional[Entry]] = {}
+    loser: Dict[int, Optional[Entry]] = {}
+    sides: Dict[int, Tuple[Optional[Entry], Optional[Entry]]] = {}
+
+    def feed_value(f: Feed) -> Optional[Entry]:
+        if f.kind == "entry":
+            return f.ref
+        return (winner if f.kind == "winner" else loser).get(f.ref)
+
+    for m in matches:
+        a, b = feed_value(m.a), feed_value(m.b)
+        sides[m.mid] = (a, b)
+        if a == BYE:
+            winner[m.mid], loser[m.mid] = b, BYE
+        elif b == BYE:
+            winner[m.mid], loser[m.mid] = a, BYE
+        elif a is None or b is None:
+            winner[m.mid] = loser[m.mid] = None
+        else:
+            w = results.get(m.mid)
+            if w == a:
+                winner[m.mid], loser[m.mid] = a, b
+            elif w == b:
+                winner[m.mid], loser[m.mid] = b, a
+            else:
+                winner[m.mid] = loser[m.mid] = None
+    return sides
+
+
+# ---------------------------- Double elimination ----------------------------
+def _drop_order(ids: List[int], j: int) -> List[int]:
+    """Orders winners-round-j losers as they drop in, so they avoid their last opponent's path."""
+    if j % 2 == 0:
+        return ids[::-1]
+    half = len(ids) // 2
+    return ids[half:] + ids[:half] if half else ids
+
+def generate_double_elimination(
+    entries: List[Entry],
+    *,
+    forbid_same_team: bool = False,
+    team_of: Optional[Dict[str, str]] = None,
+    rng: Optional[random.Random] = None
+) -> List[GraphMatch]:
+    """
+    Double-elimination bracket as a match graph.
+
+    Winners Round 1 comes from `generate_bracket_balanced`, so it keeps the
+    no-self-match, team-avoidance and BYE rules. Losers Round 1 pairs the
+    Round 1 losers; after that the losers bracket alternates drop-in rounds
+    (survivors vs. the next winners round's losers, in `_drop_order`) with
+    internal rounds. The grand final is the winners champion vs. the losers
+    champion (no bracket reset).
+    """
+    r1 = generate_bracket_balanced(entries, forbid_same_team=forbid_same_team, team_of=team_of, rng=rng)
+    size = next_power_of_two(2 * len(r1))
+    r1 = r1 + [(BYE, BYE)] * (size // 2 - len(r1))
+    k = size.bit_length() - 1
+
+    matches: List[GraphMatch] = []
+
+    def add(bracket: str, rnd: int, a: Feed, b: Feed) -> int:
+        mid = len(matches) + 1
+        matches.append(GraphMatch(mid, bracket, rnd, a, b))
+        return mid
+
+    # Winners bracket
+    wr: List[List[int]] = [[add("W", 1, _entry_feed(a), _entry_feed(b)) for a, b in r1]]
+    for j in range(2, k + 1):
+        prev = wr[-1]
+        wr.append([add("W", j, Feed("winner", prev[i]), Feed("winner", prev[i + 1])) for i in range(0, len(prev), 2)])
+
+    # Losers bracket
+    if k == 1:
+        champ_feed = Feed("loser", wr[0][0])
+    else:
+        lr = 1
+        cur = [add("L", lr, Feed("loser", wr[0][i]), Feed("loser", wr[0][i + 1])) for i in range(0, len(wr[0]), 2)]
+        for j in range(2, k + 1):
+            lr += 1
+            drops = _drop_order(wr[j - 1], j)
+            cur = [add("L", lr, Feed("winner", cur[i]), Feed("loser", drops[i])) for i in range(len(cur))]
+            if j < k:
+                lr += 1
+                cur = [add("L", lr, Feed("winner", cur[i]), Feed("winner", cur[i + 1])) for i in range(0, len(cur), 2)]
+        champ_feed = Feed("winner", cur[0])
+
+    add("GF", 1, Feed("winner", wr[-1][0]), champ_feed)
+    return matches
+
+
+# ---------------------------- Swiss ----------------------------
+@dataclass
+class SwissRound:
+    pairs: List[Tuple[int, int]]  # indexes into the entry list
+    bye: Optional[int] = None
+    rematches: int = 0  # pairs the constraints could not avoid
+    floats: int = 0     # entries paired outside their score group
+    unpaired: List[int] = field(default_factory=list)  # no legal opponent left at all
+
+@dataclass
+class SwissState:
+    """Running Swiss event over a fixed entry list."""
+    entries: List[Entry]
+    rounds: List[SwissRound] = field(default_factory=list)
+    results: Dict[Tuple[int, int], int] = field(default_factory=dict)  # (round, pair) -> winning entry index
+
+    def scores(self) -> List[float]:
+        pts = [0.0] * len(self.entries)
+        for r, rnd in enumerate(self.rounds):
+            if rnd.bye is not None:
+                pts[rnd.bye] += 1
+            for i in range(len(rnd.pairs)):
+                w = self.results.get((r, i))
+                if w is not None:
+                    pts[w] += 1
+        return pts
+
+    def played(self) -> Set[Tuple[int, int]]:
+        return {(min(a, b), max(a, b)) for rnd in self.rounds for a, b in rnd.pairs}
+
+    def byes(self) -> Set[int]:
+        return {rnd.bye for rnd in self.rounds if rnd.bye is not None}
+
+    def round_complete(self) -> bool:
+        if not self.rounds:
+            return True
+        r = len(self.rounds) - 1
+        return all((r, i) in self.results for i in range(len(self.rounds[r].pairs)))
+
+def swiss_pairings(
+    entries: List[Entry],
+    scores: List[float],
+    played: Set[Tuple[int, int]],
+    *,
+    had_bye: Optional[Set[int]] = None,
+    forbid_same_team: bool = False,
+    team_of: Optional[Dict[str, str]] = None,
+    rng: Optional[random.Random] = None
+) -> SwissRound:
+    """
+    Next Swiss round by score groups.
+
+    Groups are paired from the top down. Inside a group (plus anyone floated
+    down from above) the fold pairing (top half vs. bottom half) is the
+    starting point, and Edmonds' matching then extends it over the allowed
+    edges: no self-match, no rematch, and no teammates when
+    `forbid_same_team`. Whoever stays unpaired floats to the next group.
+    Only if the bottom still cannot be paired are rematches allowed.
+    """
+    rng = rng or make_rng()
+    team_of = team_of or {}
+    had_bye = had_bye or set()
+    n = len(entries)
+    order = list(range(n))
+    rng.shuffle(order)
+    order.sort(key=lambda i: -scores[i])
+
+    result = SwissRound(pairs=[])
+    if n % 2:
+        # Lowest-scored entry that has not had a bye yet (ties already shuffled)
+        cands = [i for i in reversed(order) if i not in had_bye] or order[::-1]
+        result.bye = cands[0]
+        order.remove(result.bye)
+
+    def allowed(i: int, j: int, rematch_ok: bool = False) -> bool:
+        a, b = entries[i], entries[j]
+        if a.player == b.player:
+            return False
+        if forbid_same_team:
+            ta = team_of.get(a.player, "")
+            if ta and ta == team_of.get(b.player, ""):
+                return False
+        return rematch_ok or (min(i, j), max(i, j)) not in played
+
+    def pair_pool(pool: List[int], rematch_ok: bool = False) -> List[int]:
+        """Pairs what it can inside `pool` and returns the unpaired entries, in pool order."""
+        m = len(pool)
+        adj = [[v for v in range(m) if v != u and allowed(pool[u], pool[v], rematch_ok)] for u in range(m)]
+        # Fold pairing first: u in the top half prefers its counterpart in the bottom half
+        half = m // 2
+        for u in range(half):
+            if half + u in adj[u]:
+                adj[u].remove(half + u)
+                adj[u].insert(0, half + u)
+        mate = max_cardinality_matching(m, adj, greedy_matching(m, range(m), adj))
+        for u in range(m):
+            v = mate[u]
+            if u < v:
+                result.pairs.append((pool[u], pool[v]))
+                if rematch_ok and (min(pool[u], pool[v]), max(pool[u], pool[v])) in played:
+                    result.rematches += 1
+        return [pool[u] for u in range(m) if mate[u] == -1]
+
+    floaters: List[int] = []
+    i = 0
+    while i < len(order):
+        j = i
+        while j < len(order) and scores[order[j]] == scores[order[i]]:
+            j += 1
+        result.floats += len(floaters)
+        floaters = pair_pool(floaters + order[i:j])
+        i = j
+    if floaters:
+        # Anything left after this shares a player or team with everyone else left: it sits out
+        result.unpaired = pair_pool(floaters, rematch_ok=True)
+    return result
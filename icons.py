@@ -0,0 +1,110 @@
+import base64
+import hashlib
+import io
+import math
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from caching import memoize
+from roster import SMASH_CHARACTERS, SMASH_DATA
+
+ICON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
+ICON_SIZE = 48  # Atlas cell size in px; lines and cards scale it with background-size
+TIER_COLORS = {"S": "#E91E63", "A": "#FF9800", "B": "#3F51B5", "C": "#009688", "D": "#795548", "W": "#607D8B"}
+
+
+# ---------------------------- Per-character images ----------------------------
+def icon_slug(char_name: str) -> str:
+    """File name stem for a character, e.g. "Mr. Game & Watch" -> "mr_game_watch"."""
+    return re.sub(r"[^a-z0-9]+", "_", char_name.lower()).strip("_")
+
+def get_character_icon_path(char_name: str) -> Optional[str]:
+    """Local images/<slug>.png (or .jpg/.webp) for a character, if one was provided."""
+    for ext in (".png", ".jpg", ".webp"):
+        path = os.path.join(ICON_DIR, icon_slug(char_name) + ext)
+        if os.path.exists(path):
+            return path
+    return None
+
+def _initials(char_name: str) -> str:
+    words = [w for w in re.split(r"[\s/&.-]+", char_name) if w]
+    return "".join(w[0] for w in words[:2]).upper() or "?"
+
+def generate_icon(char_name: str, size: int = ICON_SIZE) -> Image.Image:
+    """Offline placeholder: a tier-colored tile with the character's initials."""
+    tier = SMASH_DATA.get(char_name, {}).get("Tier Rank (S-F)", "")
+    color = TIER_COLORS.get(tier)
+    if color is None:
+        color = "#" + hashlib.md5(char_name.encode("utf-8")).hexdigest()[:6]
+    img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw.rounded_rectangle((0, 0, size - 1, size - 1), radius=size // 6, fill=color)
+    font = ImageFont.load_default(size=size // 2.4)
+    draw.text((size / 2, size / 2), _initials(char_name), fill="white", font=font, anchor="mm")
+    return img
+
+def load_icon(char_name: str, size: int = ICON_SIZE) -> Image.Image:
+    path = get_character_icon_path(char_name)
+    if path is None:
+        return generate_icon(char_name, size)
+    with Image.open(path) as img:
+        return img.convert("RGBA").resize((size, size), Image.LANCZOS)
+
+
+# ---------------------------- Sprite atlas ----------------------------
+@dataclass(frozen=True)
+class SpriteAtlas:
+    data_uri: str  # base64 PNG with every icon
+    cols: int
+    rows: int
+    cell: int
+    cells: Dict[str, Tuple[int, int]]  # character -> (col, row)
+
+@memoize(maxsize=None)
+def sprite_atlas() -> SpriteAtlas:
+    """All roster icons packed into one PNG grid, encoded once per process."""
+    names = list(SMASH_CHARACTERS)
+    cols = max(1, math.ceil(math.sqrt(len(names))))
+    rows = max(1, math.ceil(len(names) / cols))
+    sheet = Image.new("RGBA", (cols * ICON_SIZE, rows * ICON_SIZE), (0, 0, 0, 0))
+    cells: Dict[str, Tuple[int, int]] = {}
+    for i, name in enumerate(names):
+        c, r = i % cols, i // cols
+        sheet.paste(load_icon(name), (c * ICON_SIZE, r * ICON_SIZE))
+        cells[name] = (c, r)
+    buf = io.BytesIO()
+    sheet.save(buf, format="PNG", optimize=True)
+    uri = "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode("ascii")
+    return SpriteAtlas(uri, cols, rows, ICON_SIZE, cells)
+
+def atlas_css() -> str:
+    """The one CSS rule carrying the atlas; icons elsewhere only set a position."""
+    atlas = sprite_atlas()
+    return (f".char-icon {{ display: inline-block; flex: none; background-image: url('{atlas.data_uri}'); "
+            f"background-repeat: no-repeat; border-radius: 4px; vertical-align: middle; }}")
+
+@memoize(maxsize=2048)
+def icon_html(char_name: str, size: int = 24) -> Optional[str]:
+    """A sprite <span> for a roster character at `size` px, or None if it has no icon."""
+    atlas = sprite_atlas()
+    cell = atlas.cells.get(char_name)
+    if cell is None:
+        return None
+    scale = size / atlas.cell
+    x, y = cell[0] * size, cell[1] * size
+    return (f"<span class='char-icon' style='width:{size}px;height:{size}px;"
+            f"background-size:{atlas.cols * atlas.cell * scale:g}px {atlas.rows * atlas.cell * scale:g}px;"
+            f"background-position:-{x}px -{y}px'></span>")
+
+@memoize(maxsize=4096)
+def entry_line_html(character: str, player: str, color: str) -> str:
+    """One bracket entry line; identical lines (same entry and color) are built once per process."""
+    safe_player = player.replace("<", "&lt;").replace(">", "&gt;")
+    name_html = f"<span style='color:{color};font-weight:600'>{safe_player}</span>"
+    char_safe = character.replace("<", "&lt;").replace(">", "&gt;")
+    icon = icon_html(character) or "🎮"  # Off-roster names keep the generic icon
+    return f"<div class='name-line'>{icon} <b>{char_safe}</b> ({name_html})</div>"
@@ -0,0 +1,99 @@
+from collections import deque
+from typing import List, Optional, Sequence
+
+
+# ---------------------------- Maximum matching (Edmonds' blossom) ----------------------------
+def max_cardinality_matching(n: int, adj: Sequence[Sequence[int]], mate: Optional[List[int]] = None) -> List[int]:
+    """
+    Maximum-cardinality matching on a general graph with vertices 0..n-1.
+
+    `adj[v]` lists the neighbours of v (the graph must be undirected). `mate`
+    is an optional starting matching, e.g. a greedy one with preferred pairs,
+    which the search only extends; preferred pairs survive unless an
+    augmenting path has to reroute them. Returns mate, with mate[v] == -1 for
+    unmatched vertices. O(n^3) in the worst case; each free vertex is searched
+    once, because a vertex with no augmenting path never gains one later.
+    """
+    match = list(mate) if mate is not None else [-1] * n
+    parent = [-1] * n
+    base = list(range(n))
+    used = [False] * n
+    blossom = [False] * n
+
+    def lca(a: int, b: int) -> int:
+        seen = [False] * n
+        while True:
+            a = base[a]
+            seen[a] = True
+            if match[a] == -1:
+                break
+            a = parent[match[a]]
+        while True:
+            b = base[b]
+            if seen[b]:
+                return b
+            b = parent[match[b]]
+
+    def mark_path(v: int, b: int, child: int):
+        while base[v] != b:
+            blossom[base[v]] = blossom[base[match[v]]] = True
+            parent[v] = child
+            child = match[v]
+            v = parent[match[v]]
+
+    def find_path(root: int) -> int:
+        for i in range(n):
+            parent[i] = -1
+            base[i] = i
+            used[i] = False
+        used[root] = True
+        q = deque([root])
+        while q:
+            v = q.popleft()
+            for to in adj[v]:
+                if base[v] == base[to] or match[v] == to:
+                    continue
+                if to == root or (match[to] != -1 and parent[match[to]] != -1):
+                    cur = lca(v, to)
+                    for i in range(n):
+                        blossom[i] = False
+                    mark_path(v, cur, to)
+                    mark_path(to, cur, v)
+                    for i in range(n):
+                        if blossom[base[i]]:
+                            base[i] = cur
+                            if not used[i]:
+                                used[i] = True
+                                q.append(i)
+                elif parent[to] == -1:
+                    parent[to] = v
+                    if match[to] == -1:
+                        return to
+                    used[match[to]] = True
+                    q.append(match[to])
+        return -1
+
+    for root in range(n):
+        if match[root] != -1 or not adj[root]:
+            continue
+        v = find_path(root)
+        while v != -1:
+            pv = parent[v]
+            nxt = match[pv]
+            match[v] = pv
+            match[pv] = v
+            v = nxt
+    return match
+
+
+def greedy_matching(n: int, order: Sequence[int], adj: Sequence[Sequence[int]]) -> List[int]:
+    """Pairs each vertex in `order` with its first free neighbour (in adj order)."""
+    mate = [-1] * n
+    for v in order:
+        if mate[v] != -1:
+            continue
+        for u in adj[v]:
+            if mate[u] == -1 and u != v:
+                mate[v], mate[u] = u, v
+                break
+    return mate
@@ -0,0 +1,101 @@
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+
+# ---------------------------- Data types ----------------------------
+@dataclass(frozen=True, slots=True)
+class Entry:
+    player: str
+    character: str
+
+    def __post_init__(self):
+        # Player and character names repeat across many entries; share one copy each.
+        object.__setattr__(self, "player", sys.intern(self.player))
+        object.__setattr__(self, "character", sys.intern(self.character))
+
+# The one BYE placeholder; compare with `is BYE` or by value, both work.
+BYE = Entry("SYSTEM", "BYE")
+
+
+# ---------------------------- Power-of-two helpers ----------------------------
+def next_power_of_two(n: int) -> int:
+    if n <= 1:
+        return 1
+    return 1 << (n - 1).bit_length()
+
+def byes_needed(n: int) -> int:
+    return max(0, next_power_of_two(n) - n)
+
+
+# ---------------------------- Packed bracket storage ----------------------------
+BYE_ID = -1
+
+class PackedBracket:
+    """
+    Round 1 pairs stored as integer ids instead of tuples of Entry objects.
+
+    Players and characters are pooled once each; an entry is a (player id,
+    character id) row and `slots` holds two entry ids per match, with BYE_ID
+    for the BYE. Every slot gets its own entry row, so two identical entries
+    (same player and character) stay two entrants. Entry objects and labels
+    are only built when rendering.
+    """
+    __slots__ = ("players", "characters", "entry_player", "entry_character", "slots")
+
+    def __init__(self):
+        self.players: List[str] = []
+        self.characters: List[str] = []
+        self.entry_player = array("i")
+        self.entry_character = array("i")
+        self.slots = array("i")
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Tuple[Entry, Entry]]) -> "PackedBracket":
+        pb = cls()
+        player_ids: Dict[str, int] = {}
+        char_ids: Dict[str, int] = {}
+
+        def intern_id(pool: List[str], ids: Dict[str, int], s: str) -> int:
+            i = ids.get(s)
+            if i is None:
+                i = ids[s] = len(pool)
+                pool.append(s)
+            return i
+
+        def entry_id(e: Entry) -> int:
+            if e == BYE:
+                return BYE_ID
+            pb.entry_player.append(intern_id(pb.players, player_ids, e.player))
+            pb.entry_character.append(intern_id(pb.characters, char_ids, e.character))
+            return len(pb.entry_player) - 1
+
+        for a, b in pairs:
+            pb.slots.append(entry_id(a))
+            pb.slots.append(entry_id(b))
+        return pb
+
+    def __len__(self) -> int:
+        return len(self.slots) // 2
+
+    def entry(self, entry_id: int) -> Entry:
+        if entry_id == BYE_ID:
+            return BYE
+        return Entry(self.players[self.entry_player[entry_id]], self.characters[self.entry_character[entry_id]])
+
+    def label(self, entry_id: int) -> str:
+        """Same text as `entry_to_label`, without building the Entry."""
+        if entry_id == BYE_ID:
+            return f"{BYE.player} — {BYE.character}"
+        return f"{self.players[self.entry_player[entry_id]]} — {self.characters[self.entry_character[entry_id]]}"
+
+    def pair_ids(self, i: int) -> Tuple[int, int]:
+        return self.slots[2 * i], self.slots[2 * i + 1]
+
+    def pair(self, i: int) -> Tuple[Entry, Entry]:
+        a, b = self.pair_ids(i)
+        return self.entry(a), self.entry(b)
+
+    def pairs(self) -> List[Tuple[Entry, Entry]]:
+        return [self.pair(i) for i in range(len(self))]
@@ -0,0 +1,373 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from caching import memoize
+from models import BYE, Entry, byes_needed, next_power_of_two
+from profiling import timed
+
+# An entry's pairing group: ("team", name) in teams mode, else ("player", name).
+GroupKey = Tuple[str, str]
+
+
+# ---------------------------- Feasibility ----------------------------
+def _group_of(e: Entry, forbid_same_team: bool, team_of: Dict[str, str]) -> GroupKey:
+    team = team_of.get(e.player, "") if forbid_same_team else ""
+    return ("team", team) if team else ("player", e.player)
+
+def _max_pairs(n: int, sizes: List[int]) -> int:
+    """
+    Largest matching when any two entries from different groups may meet.
+
+    The compatibility graph is complete multipartite, so the only obstacle is
+    one group holding more than half the entries: it can then only be paired
+    against everyone else.
+    """
+    return min(n // 2, n - max(sizes, default=0))
+
+@dataclass(frozen=True)
+class PairingReport:
+    """What the Round 1 rules allow for a set of entries, independent of the draw."""
+    entries: int
+    byes: int                # BYEs the power-of-two fill needs
+    pairs: int               # real matches in every optimal bracket
+    forced_byes: int         # extra BYEs no legal bracket can avoid
+    same_team_to_avoid: int  # fewest same-team matches that would remove them (teams mode)
+    largest_group: str       # the team or player that forces them, "" when none
+
+def pairing_report(
+    entries: List[Entry],
+    *,
+    forbid_same_team: bool = False,
+    team_of: Optional[Dict[str, str]] = None
+) -> PairingReport:
+    """
+    Exact minimum of forced BYEs (and the same-team matches that would replace
+    them) for these entries and rules, in O(n).
+    """
+    team_of = team_of or {}
+    base = [e for e in entries if e.player != "SYSTEM"]
+    n = len(base)
+    byes = byes_needed(n)
+    target = max(0, (n - byes) // 2)
+
+    sizes: Dict[GroupKey, int] = {}
+    for e in base:
+        g = _group_of(e, forbid_same_team, team_of)
+        sizes[g] = sizes.get(g, 0) + 1
+    pairs = min(target, _max_pairs(n, list(sizes.values())))
+    forced = max(0, n - 2 * pairs - byes)
+    largest = max(sizes, key=sizes.get)[1] if forced else ""
+
+    same_team = 0
+    if forced and forbid_same_team:
+        # Teammates may meet but a player still can't face themselves
+        per_player: Dict[str, int] = {}
+        for e in base:
+            per_player[e.player] = per_player.get(e.player, 0) + 1
+        same_team = min(target, _max_pairs(n, list(per_player.values()))) - pairs
+    return PairingReport(n, byes, pairs, forced, same_team, largest)
+
+
+# ---------------------------- Pairing engine ----------------------------
+def make_rng(seed: Optional[int] = None) -> random.Random:
+    """Returns a private RNG; the same seed always replays the same bracket."""
+    return random.Random(seed)
+
+@timed()
+def generate_bracket_balanced(
+    entries: List[Entry],
+    *,
+    forbid_same_team: bool = False,
+    team_of: Optional[Dict[str, str]] = None,
+    rng: Optional[random.Random] = None
+) -> List[Tuple[Entry, Entry]]:
+    """
+    Balanced-random pairing:
+      - no self-match,
+      - optional: forbid same-team,
+      - fills BYEs to next power of two,
+      - uses per-player tallies for fairness.
+
+    Round 1 is a maximum matching on the graph whose edges join entries of
+    different groups (players, or teams when same-team is forbidden). Groups
+    over half the remaining pool hand their surplus to BYEs first, so the
+    BYEs beyond the power-of-two fill are exactly `pairing_report().forced_byes`;
+    the rest of the BYEs and the bracket order follow per-player tallies
+    (a player's second entry only after everyone's first). O(n log n).
+    Pass `rng` (see `make_rng`) to make the result reproducible.
+    """
+    team_of = team_of or {}
+    rng = rng or make_rng()
+    base = [e for e in entries if e.player != "SYSTEM"]
+    n = len(base)
+
+    # Tally order: shuffled, then each player's k-th entry after everyone's (k-1)-th
+    order = list(range(n))
+    rng.shuffle(order)
+    shuffled = order[:]
+    rank = [0] * n
+    seen: Dict[str, int] = {}
+    for i in order:
+        p = base[i].player
+        rank[i] = seen.get(p, 0)
+        seen[p] = rank[i] + 1
+    order.sort(key=rank.__getitem__)
+
+    groups: Dict[GroupKey, List[int]] = {}
+    for i in order:
+        groups.setdefault(_group_of(base[i], forbid_same_team, team_of), []).append(i)
+    pairs_target = min(max(0, (n - byes_needed(n)) // 2), _max_pairs(n, [len(g) for g in groups.values()]))
+
+    # BYEs: first the surplus of any group larger than pairs_target (it could
+    # not be matched), then the lowest-tally entries overall
+    bye = [False] * n
+    byes: List[int] = []
+    for members in groups.values():
+        for i in members[:max(0, len(members) - pairs_target)]:
+            bye[i] = True
+            byes.append(i)
+    for i in order:
+        if len(byes) >= n - 2 * pairs_target:
+            break
+        if not bye[i]:
+            bye[i] = True
+            byes.append(i)
+
+    # Every group now holds at most half the pool: pair it at random, then
+    # repair each same-group match by swapping partners with a random match
+    # that has no member of that group (one always exists while a group is
+    # under half; the expected draws total O(n log n) even at exactly half)
+    pool = [i for i in shuffled if not bye[i]]
+    half = len(pool) // 2
+    gid = [0] * n
+    for g, members in enumerate(groups.values()):
+        for i in members:
+            gid[i] = g
+    left, right = pool[:half], pool[half:]
+    for k in range(half):
+        g = gid[left[k]]
+        while gid[right[k]] == g:
+            j = rng.randrange(half)
+            if gid[left[j]] != g and gid[right[j]] != g:
+                right[k], right[j] = right[j], right[k]
+    matches = list(zip(left, right))
+    matches.sort(key=lambda m: max(rank[m[0]], rank[m[1]]))
+
+    byes.sort(key=rank.__getitem__)
+    return [(base[i], BYE) for i in byes] + [(base[a], base[b]) for a, b in matches]
+
+
+# ---------------------------- Batch candidates ----------------------------
+@dataclass(frozen=True, order=True)
+class BracketScore:
+    """Fairness of a Round 1 bracket; fields are compared in order and lower is better."""
+    forced_byes: int      # BYEs beyond what the power-of-two fill needs
+    same_team: int        # matches between teammates
+    repeat_matchups: int  # extra meetings of the same two players
+    bye_spread: int       # max - min BYEs handed to any one player
+
+def score_bracket(pairs: List[Tuple[Entry, Entry]], team_of: Optional[Dict[str, str]] = None) -> BracketScore:
+    team_of = team_of or {}
+    real = 0
+    byes: Dict[str, int] = {}
+    seen_matchups = set()
+    same_team = repeats = 0
+    for a, b in pairs:
+        for e in (a, b):
+            if e.player != "SYSTEM":
+                real += 1
+                byes.setdefault(e.player, 0)
+        if b.player == "SYSTEM":
+            byes[a.player] += 1
+            continue
+        ta = team_of.get(a.player, "")
+        if ta and ta == team_of.get(b.player, ""):
+            same_team += 1
+        key = (a.player, b.player) if a.player < b.player else (b.player, a.player)
+        if key in seen_matchups:
+            repeats += 1
+        seen_matchups.add(key)
+    total_byes = sum(byes.values())
+    spread = (max(byes.values()) - min(byes.values())) if byes else 0
+    return BracketScore(max(0, total_byes - byes_needed(real)), same_team, repeats, spread)
+
+def _best_of_seeds(entries: List[Entry], forbid_same_team: bool, team_of: Dict[str, str],
+                   seeds: List[int]) -> Tuple[BracketScore, int]:
+    """Worker: scores one chunk of candidate seeds and returns the best (score, seed)."""
+    best: Optional[Tuple[BracketScore, int]] = None
+    for s in seeds:
+        pairs = generate_bracket_balanced(entries, forbid_same_team=forbid_same_team, team_of=team_of, rng=make_rng(s))
+        cand = (score_bracket(pairs, team_of), s)
+        if best is None or cand < best:
+            best = cand
+    return best
+
+def generate_best_bracket(
+    entries: List[Entry],
+    candidates: int,
+    *,
+    forbid_same_team: bool = False,
+    team_of: Optional[Dict[str, str]] = None,
+    seed: Optional[int] = None,
+    workers: int = 1
+) -> Tuple[List[Tuple[Entry, Entry]], BracketScore, int]:
+    """
+    Builds `candidates` Round 1 brackets and returns (pairs, score, seed) for the fairest one.
+
+    Each candidate has its own seed derived from `seed`, so the winner is the same
+    whatever the worker count and can be replayed with `make_rng(winning_seed)`.
+    Runs in-process unless `workers` > 1 asks for a process pool (the CLI and
+    benchmarks, not the app server); workers only send back (score, seed) and
+    the winning bracket is rebuilt here.
+    """
+    team_of = team_of or {}
+    master = make_rng(seed)
+    seeds = [master.getrandbits(63) for _ in range(max(1, candidates))]
+    workers = min(max(1, workers), len(seeds))
+
+    if workers <= 1:
+        score, best_seed = _best_of_seeds(entries, forbid_same_team, team_of, seeds)
+    else:
+        chunks = [seeds[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_best_of_seeds, [entries] * workers, [forbid_same_team] * workers,
+                               [team_of] * workers, chunks)
+            score, best_seed = min(results)
+
+    pairs = generate_bracket_balanced(entries, forbid_same_team=forbid_same_team, team_of=team_of,
+                                      rng=make_rng(best_seed))
+    return pairs, score, best_seed
+
+
+# ---------------------------- Memoized seeded brackets ----------------------------
+def _team_key(entries: List[Entry], team_of: Optional[Dict[str, str]]) -> Tuple[Tuple[str, str], ...]:
+    """The part of `team_of` that can affect these entries' bracket, as a hashable key."""
+    if not team_of:
+        return ()
+    return tuple(sorted({(e.player, team_of.get(e.player, "")) for e in entries}))
+
+@memoize(maxsize=64)
+def _seeded_bracket(entries: Tuple[Entry, ...], candidates: int, forbid_same_team: bool,
+                    team_key: Tuple[Tuple[str, str], ...], seed: int, workers: int):
+    team_of = dict(team_key)
+    if candidates > 1:
+        pairs, score, best_seed = generate_best_bracket(list(entries), candidates, forbid_same_team=forbid_same_team,
+                                                        team_of=team_of, seed=seed, workers=workers)
+        return tuple(pairs), score, best_seed
+    pairs = generate_bracket_balanced(list(entries), forbid_same_team=forbid_same_team, team_of=team_of, rng=make_rng(seed))
+    return tuple(pairs), None, seed
+
+@timed()
+def generate_bracket_seeded(
+    entries: List[Entry],
+    *,
+    candidates: int = 1,
+    forbid_same_team: bool = False,
+    team_of: Optional[Dict[str, str]] = None,
+    seed: Optional[int] = None,
+    workers: int = 1
+) -> Tuple[List[Tuple[Entry, Entry]], Optional[BracketScore], Optional[int]]:
+    """
+    Round 1 bracket (the best of `candidates` when more than one) as (pairs, score, seed).
+
+    A seeded bracket depends only on the entries, rules and seed, so repeats
+    (reruns, other sessions asking for the same thing) come from a bounded
+    LRU. Without a seed nothing is cached and score/seed may be None.
+    `workers` is passed to `generate_best_bracket`.
+    """
+    candidates = max(1, candidates)
+    if seed is None:
+        if candidates > 1:
+            return generate_best_bracket(entries, candidates, forbid_same_team=forbid_same_team, team_of=team_of,
+                                         workers=workers)
+        return generate_bracket_balanced(entries, forbid_same_team=forbid_same_team, team_of=team_of), None, None
+    pairs, score, best_seed = _seeded_bracket(tuple(entries), candidates, forbid_same_team,
+                                              _team_key(entries, team_of), seed, workers)
+    return list(pairs), score, best_seed
+
+
+# ---------------------------- Rating seeds ----------------------------
+def seed_positions(size: int) -> List[int]:
+    """
+    Standard bracket order of seeds 1..size (size a power of two): 1 v size,
+    then the pairs that keep the top seeds apart, e.g. [1, 8, 4, 5, 2, 7, 3, 6].
+    Seeds 1 and 2 can only meet in the final, 1-4 in the semifinals, and so on.
+    """
+    order = [1]
+    while len(order) < size:
+        n = 2 * len(order) + 1
+        order = [x for s in order for x in (s, n - s)]
+    return order
+
+@timed()
+def generate_bracket_rated(
+    entries: List[Entry],
+    rating: Callable[[Entry], float],
+    *,
+    forbid_same_team: bool = False,
+    team_of: Optional[Dict[str, str]] = None,
+    rng: Optional[random.Random] = None
+) -> List[Tuple[Entry, Entry]]:
+    """
+    Round 1 in standard seed order, seeds by `rating` (highest first; ties
+    in random order). BYEs go to the top seeds. A match that breaks the rules
+    (same player, or same team when forbidden) swaps its lower seed with the
+    nearest-seeded lower seed that fixes both matches (found by walking out
+    from it in one seed-sorted order, not a re-sort per conflict); any left
+    over are counted by `score_bracket`.
+    """
+    team_of = team_of or {}
+    rng = rng or make_rng()
+    base = [e for e in entries if e.player != "SYSTEM"]
+    rng.shuffle(base)
+    base.sort(key=rating, reverse=True)
+    size = next_power_of_two(len(base))
+    order = seed_positions(size)
+    seeded: List[Entry] = base + [BYE] * (size - len(base))
+    pairs = [[seeded[s - 1], seeded[t - 1]] for s, t in zip(order[0::2], order[1::2])]
+    low_seed = order[1::2]
+
+    def ok(a: Entry, b: Entry) -> bool:
+        if b.player == "SYSTEM":
+            return True
+        if a.player == b.player:
+            return False
+        ta = team_of.get(a.player, "") if forbid_same_team else ""
+        return not (ta and ta == team_of.get(b.player, ""))
+
+    # Matches by lower seed, sorted once; a conflict walks outward from its own place in it
+    by_seed = sorted(range(len(pairs)), key=low_seed.__getitem__)
+    place = [0] * len(pairs)
+    for i, j in enumerate(by_seed):
+        place[j] = i
+
+    def nearest(k: int):
+        """Other matches, nearest lower seed to match k's first (ties: earlier match first)."""
+        lo, hi = place[k] - 1, place[k] + 1
+        while lo >= 0 or hi < len(by_seed):
+            if hi >= len(by_seed):
+                take_lo = True
+            elif lo < 0:
+                take_lo = False
+            else:
+                dl = low_seed[k] - low_seed[by_seed[lo]]
+                dh = low_seed[by_seed[hi]] - low_seed[k]
+                take_lo = dl < dh or (dl == dh and by_seed[lo] < by_seed[hi])
+            if take_lo:
+                yield by_seed[lo]
+                lo -= 1
+            else:
+                yield by_seed[hi]
+                hi += 1
+
+    for k, (a, b) in enumerate(pairs):
+        if ok(a, b):
+            continue
+        for j in nearest(k):
+            c, d = pairs[j]
+            if d.player != "SYSTEM" and ok(a, d) and ok(c, b):
+                pairs[k][1], pairs[j][1] = d, b
+                break
+    return [(a, b) for a, b in pairs]
@@ -0,0 +1,155 @@
+import functools
+import gc
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+
+class _Active(threading.local):
+    recorder: Optional["Recorder"] = None  # Off unless a rerun on this thread started one
+
+_active = _Active()
+# Recorders open on any thread; while 0, instrumented calls skip even the thread-local read
+_recording = 0
+_recording_lock = threading.Lock()
+
+
+# ---------------------------- Per-rerun recorder ----------------------------
+def _gc_collections() -> int:
+    return sum(s["collections"] for s in gc.get_stats())
+
+class Recorder:
+    """
+    Timings and counters for one script run on one thread.
+
+    Span times are inclusive (a span inside another counts in both).
+    Allocations are net blocks from sys.getallocatedblocks(): what the span
+    left allocated, not what it churned through.
+    """
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.started = time.time()
+        self.spans: Dict[str, List[float]] = {}  # name -> [calls, seconds, net blocks]
+        self.counters: Dict[str, int] = {}
+        self.seconds = 0.0
+        self.blocks = 0
+        self.collections = 0
+        self._t0 = time.perf_counter()
+        self._blocks0 = sys.getallocatedblocks()
+        self._gc0 = _gc_collections()
+
+    def add(self, name: str, seconds: float, blocks: int):
+        s = self.spans.get(name)
+        if s is None:
+            s = self.spans[name] = [0, 0.0, 0]
+        s[0] += 1
+        s[1] += seconds
+        s[2] += blocks
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def finish(self) -> "Recorder":
+        self.seconds = time.perf_counter() - self._t0
+        self.blocks = sys.getallocatedblocks() - self._blocks0
+        self.collections = _gc_collections() - self._gc0
+        return self
+
+    def rows(self) -> List[Dict[str, object]]:
+        """One row per span, slowest first."""
+        total = self.seconds or 1e-12
+        rows = [{"Span": name, "Calls": int(calls), "Total ms": seconds * 1000, "Mean ms": seconds * 1000 / calls,
+                 "Share": seconds / total, "Net blocks": int(blocks)}
+                for name, (calls, seconds, blocks) in self.spans.items()]
+        return sorted(rows, key=lambda r: -r["Total ms"])
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "label": self.label,
+            "started": round(self.started, 3),
+            "ms": round(self.seconds * 1000, 3),
+            "net_blocks": self.blocks,
+            "gc_collections": self.collections,
+            "spans": {name: {"calls": int(c), "ms": round(s * 1000, 3), "net_blocks": int(b)}
+                      for name, (c, s, b) in self.spans.items()},
+            "counters": dict(self.counters),
+        }
+
+def start_rerun(label: str = "") -> Recorder:
+    """Starts recording on this thread, replacing any unfinished recorder."""
+    global _recording
+    with _recording_lock:
+        if _active.recorder is None:
+            _recording += 1
+        _active.recorder = Recorder(label)
+    return _active.recorder
+
+def finish_rerun() -> Optional[Recorder]:
+    """Finishes and returns this thread's recorder (None if none was started)."""
+    global _recording
+    with _recording_lock:
+        rec, _active.recorder = _active.recorder, None
+        if rec is not None:
+            _recording -= 1
+    return rec.finish() if rec is not None else None
+
+
+# ---------------------------- Instrumentation ----------------------------
+def timed(name: Optional[str] = None):
+    """
+    Decorator: time each call into the active recorder under `name`
+    (default "module.qualname", or just the qualname in the app script).
+    While nothing records, the wrapper costs one global read.
+    """
+    def decorator(fn: Callable) -> Callable:
+        label = name or (fn.__qualname__ if fn.__module__ == "__main__" else f"{fn.__module__}.{fn.__qualname__}")
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _recording:
+                return fn(*args, **kwargs)
+            rec = _active.recorder
+            if rec is None:
+                return fn(*args, **kwargs)
+            b0 = sys.getallocatedblocks()
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                rec.add(label, time.perf_counter() - t0, sys.getallocatedblocks() - b0)
+        return wrapper
+    return decorator
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Context manager form of `timed`, for a block inside a function."""
+    rec = _active.recorder
+    if rec is None:
+        yield
+        return
+    b0 = sys.getallocatedblocks()
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        rec.add(name, time.perf_counter() - t0, sys.getallocatedblocks() - b0)
+
+def count_event(name: str, n: int = 1):
+    rec = _active.recorder
+    if rec is not None:
+        rec.count(name, n)
+
+
+# ---------------------------- Export ----------------------------
+def export_profile(path: str, records: Iterable[Dict[str, object]], **fields) -> int:
+    """Appends each record (plus `fields`, e.g. the event name) as a JSON line; returns how many."""
+    n = 0
+    with open(path, "a", encoding="utf-8") as f:
+        for rec in records:
+            f.write(json.dumps({**fields, **rec}, separators=(",", ":")) + "\n")
+            n += 1
+    return n
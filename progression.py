@@ -0,0 +1,148 @@
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+from models import BYE_ID, Entry, PackedBracket, next_power_of_two
+from profiling import timed
+
+# Slot value for a spot whose entrant is not decided yet.
+TBD_ID = -2
+
+
+# ---------------------------- Bracket state engine ----------------------------
+class BracketState:
+    """
+    Every round of a single-elimination bracket, kept up to date incrementally.
+
+    Matches live in one flat array, round by round (Round 1 first, the final
+    last), so match m of round r feeds slot m % 2 of match m // 2 in round r + 1.
+    Sides and winners are entry ids from the PackedBracket (BYE_ID / TBD_ID for
+    placeholders). Recording a result only walks the path from that match to
+    the final, so a click costs O(log n) instead of rebuilding every round.
+    """
+    __slots__ = ("packed", "offsets", "side_a", "side_b", "choice")
+
+    @timed()
+    def __init__(self, packed: PackedBracket):
+        self.packed = packed
+        width = next_power_of_two(len(packed))
+        self.offsets: List[int] = []
+        total = 0
+        while True:
+            self.offsets.append(total)
+            total += width
+            if width == 1:
+                break
+            width //= 2
+        self.side_a = array("i", [TBD_ID]) * total
+        self.side_b = array("i", [TBD_ID]) * total
+        self.choice = array("i", [TBD_ID]) * total
+
+        # Round 1 from the packed pairs; padding matches are BYE vs BYE.
+        for m in range(self.round_size(0)):
+            a, b = packed.pair_ids(m) if m < len(packed) else (BYE_ID, BYE_ID)
+            self.side_a[m], self.side_b[m] = a, b
+        # Later rounds once, bottom-up; after this only record() touches them.
+        self._propagate_all()
+
+    def _propagate_all(self):
+        for r in range(1, self.num_rounds):
+            for i in range(self.round_size(r)):
+                m = self.offsets[r] + i
+                child = self.offsets[r - 1] + 2 * i
+                self.side_a[m] = self._winner(child)
+                self.side_b[m] = self._winner(child + 1)
+
+    # ---- layout ----
+    @property
+    def num_rounds(self) -> int:
+        return len(self.offsets)
+
+    def round_size(self, r: int) -> int:
+        return 1 << (self.num_rounds - 1 - r)
+
+    def match_index(self, r: int, i: int) -> int:
+        return self.offsets[r] + i
+
+    # ---- results ----
+    def _winner(self, m: int) -> int:
+        a, b = self.side_a[m], self.side_b[m]
+        if a == BYE_ID:
+            return b
+        if b == BYE_ID:
+            return a
+        if a == TBD_ID or b == TBD_ID:
+            return TBD_ID
+        c = self.choice[m]
+        return c if c in (a, b) else TBD_ID
+
+    def sides(self, r: int, i: int) -> Tuple[int, int]:
+        m = self.match_index(r, i)
+        return self.side_a[m], self.side_b[m]
+
+    def winner_id(self, r: int, i: int) -> int:
+        return self._winner(self.match_index(r, i))
+
+    def is_playable(self, r: int, i: int) -> bool:
+        """Both sides are real entrants, so the match needs a reported result."""
+        a, b = self.sides(r, i)
+        return a >= 0 and b >= 0
+
+    @timed()
+    def record(self, r: int, i: int, winner: int) -> int:
+        """
+        Sets (or clears, with TBD_ID) the winner of match i in round r and pushes
+        the change towards the final. Downstream results that named an entrant
+        who is no longer in that match are cleared on the way up.
+        Returns how many matches were touched.
+        """
+        m = self.match_index(r, i)
+        self.choice[m] = winner
+        touched = 1
+        for rr in range(r + 1, self.num_rounds):
+            w = self._winner(m)
+            i //= 2
+            parent = self.offsets[rr] + i
+            sides = self.side_a if (m - self.offsets[rr - 1]) % 2 == 0 else self.side_b
+            if sides[parent] == w:
+                break
+            sides[parent] = w
+            if self.choice[parent] not in (self.side_a[parent], self.side_b[parent]):
+                self.choice[parent] = TBD_ID
+            m = parent
+            touched += 1
+        return touched
+
+    def load_choices(self, choices: Sequence[int]):
+        """Restores every result at once (e.g. from a snapshot of `choice`) and rebuilds later rounds in O(n)."""
+        if len(choices) != len(self.choice):
+            raise ValueError(f"expected {len(self.choice)} choices, got {len(choices)}")
+        self.choice = array("i", choices)
+        self._propagate_all()
+
+    # ---- rendering ----
+    def entry(self, entry_id: int) -> Optional[Entry]:
+        return None if entry_id == TBD_ID else self.packed.entry(entry_id)
+
+    def label(self, entry_id: int) -> str:
+        return "" if entry_id == TBD_ID else self.packed.label(entry_id)
+
+    def round_pairs(self, r: int) -> List[Tuple[Optional[Entry], Optional[Entry]]]:
+        return [(self.entry(a), self.entry(b)) for a, b in (self.sides(r, i) for i in range(self.round_size(r)))]
+
+    def rounds(self) -> List[List[Tuple[Optional[Entry], Optional[Entry]]]]:
+        return [self.round_pairs(r) for r in range(self.num_rounds)]
+
+    def champion(self) -> Optional[Entry]:
+        w = self._winner(len(self.side_a) - 1)
+        return None if w in (TBD_ID, BYE_ID) else self.packed.entry(w)
+
+
+def round_title(r: int, num_rounds: int) -> str:
+    left = num_rounds - r
+    if left == 1 and num_rounds > 1:
+        return "Final"
+    if left == 2:
+        return "Semifinals"
+    if left == 3:
+        return "Quarterfinals"
+    return f"Round {r + 1}"
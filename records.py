@@ -0,0 +1,153 @@
+import csv
+import io
+import json
+import os
+from typing import IO, Dict, Iterable, Iterator, List, Optional
+
+from progression import TBD_ID, BracketState, round_title
+from round_robin import iter_rounds
+from standings import Standings
+
+FORMATS = ["csv", "json", "parquet"]
+CHUNK_ROWS = 20_000
+MIME_TYPES = {"csv": "text/csv", "json": "application/x-ndjson", "parquet": "application/vnd.apache.parquet"}
+EXTENSIONS = {"csv": "csv", "json": "jsonl", "parquet": "parquet"}
+
+# Header spellings seen on signup sheets -> our column names (matched case-insensitively)
+COLUMN_ALIASES = {
+    "player": "Player", "name": "Player", "gamertag": "Player", "tag": "Player", "entrant": "Player",
+    "character": "Character", "char": "Character", "fighter": "Character", "main": "Character",
+    "team": "Team", "squad": "Team",
+}
+
+
+# ---------------------------- Plain-record reading ----------------------------
+def detect_format(name: str) -> str:
+    ext = os.path.splitext(name)[1].lower().lstrip(".")
+    fmt = {"jsonl": "json", "ndjson": "json", "pq": "parquet"}.get(ext, ext)
+    if fmt not in FORMATS:
+        raise ValueError(f"unsupported file type '.{ext}' (expected one of: {', '.join(FORMATS)})")
+    return fmt
+
+def canonical_column(name: object) -> object:
+    return COLUMN_ALIASES.get(str(name).strip().lower(), name)
+
+def read_records(path: str, fmt: Optional[str] = None) -> Iterator[Dict[str, str]]:
+    """
+    Rows of a CSV or JSON (array or lines) file as {Player, Character, Team}
+    dicts of stripped strings, streamed with the standard library only.
+    Use bulk_io.import_table for Parquet or vectorized loading into a table.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt == "csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            rows: Iterable[Dict] = csv.DictReader(f)
+            yield from (_clean_record(r) for r in rows)
+    elif fmt == "json":
+        with open(path, encoding="utf-8-sig") as f:
+            first = f.read(1)
+            while first.isspace():
+                first = f.read(1)
+            f.seek(0)
+            if first == "[":
+                yield from (_clean_record(r) for r in json.load(f))
+            else:
+                yield from (_clean_record(json.loads(line)) for line in f if line.strip())
+    else:
+        raise ValueError(f"read_records handles csv and json, not {fmt!r}")
+
+def _clean_record(raw: Dict) -> Dict[str, str]:
+    out = {"Player": "", "Character": "", "Team": ""}
+    for k, v in raw.items():
+        col = canonical_column(k)
+        if col in out and not out[col] and v is not None:
+            out[col] = str(v).strip()
+    return out
+
+
+# ---------------------------- Export rows ----------------------------
+def bracket_rows(state: BracketState) -> Iterator[Dict[str, object]]:
+    """One row per single-elimination match, Round 1 first; placeholders read "TBD"."""
+    for r in range(state.num_rounds):
+        name = round_title(r, state.num_rounds)
+        for i in range(state.round_size(r)):
+            a, b = state.sides(r, i)
+            w = state.winner_id(r, i)
+            yield {
+                "Round": r + 1, "Round Name": name, "Match": i + 1,
+                "Side A": state.label(a) or "TBD", "Side B": state.label(b) or "TBD",
+                "Winner": state.label(w) if w != TBD_ID else "",
+            }
+
+def schedule_rows(players: List[str], standings: Optional[Standings] = None) -> Iterator[Dict[str, object]]:
+    """Round-robin schedule streamed round by round (BYEs included), with winners if known."""
+    n = 0
+    for rnd in iter_rounds(players):
+        for p1, p2 in rnd.matches:
+            n += 1
+            winner = standings.winner((p1, p2)) if standings is not None else None
+            yield {"Round": rnd.round + 1, "Match": n, "Player 1": p1, "Player 2": p2, "Winner": winner or ""}
+        if rnd.bye is not None:
+            yield {"Round": rnd.round + 1, "Match": None, "Player 1": rnd.bye, "Player 2": "BYE", "Winner": ""}
+
+def standings_rows(standings: Standings) -> Iterator[Dict[str, object]]:
+    board = standings.leaderboard()
+    for rank, row in zip(board.index, board.to_dict("records")):
+        yield {"Rank": int(rank), "Player": row["Player"], "Wins": int(row["Wins"]), "Losses": int(row["Losses"]),
+               "Win Rate": round(float(row["Win Rate"]), 4)}
+
+
+# ---------------------------- Export writers ----------------------------
+def _batches(rows: Iterable[Dict[str, object]], size: int) -> Iterator[List[Dict[str, object]]]:
+    batch: List[Dict[str, object]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def write_rows(rows: Iterable[Dict[str, object]], fmt: str, out: IO[bytes], *, chunk_rows: int = CHUNK_ROWS) -> int:
+    """
+    Streams `rows` to `out` as CSV, JSON lines or Parquet, `chunk_rows` at a
+    time, so exports never hold more than one chunk. Returns the row count.
+    """
+    count = 0
+    if fmt == "csv":
+        text = io.TextIOWrapper(out, encoding="utf-8", newline="", write_through=True)
+        writer = None
+        for batch in _batches(rows, chunk_rows):
+            if writer is None:
+                writer = csv.DictWriter(text, fieldnames=list(batch[0]))
+                writer.writeheader()
+            writer.writerows(batch)
+            count += len(batch)
+        text.detach()
+    elif fmt == "json":
+        for batch in _batches(rows, chunk_rows):
+            out.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in batch).encode("utf-8"))
+            count += len(batch)
+    elif fmt == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet export needs pyarrow (pip install pyarrow)") from e
+        writer = None
+        for batch in _batches(rows, chunk_rows):
+            table = pa.Table.from_pylist(batch) if writer is None else pa.Table.from_pylist(batch, schema=writer.schema)
+            if writer is None:
+                writer = pq.ParquetWriter(out, table.schema)
+            writer.write_table(table)
+            count += len(batch)
+        if writer is not None:
+            writer.close()
+    else:
+        raise ValueError(f"unknown format {fmt!r}")
+    return count
+
+def export_bytes(rows: Iterable[Dict[str, object]], fmt: str) -> bytes:
+    buf = io.BytesIO()
+    write_rows(rows, fmt, buf)
+    return buf.getvalue()
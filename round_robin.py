@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+from typing import Iterator, Optional, Sequence, Tuple
+
+from caching import memoize
+
+# Matches as (player A, player B), and the round index of each match
+Schedule = Tuple[Tuple[Tuple[str, str], ...], Tuple[int, ...]]
+
+
+# ---------------------------- Circle method ----------------------------
+@dataclass(frozen=True)
+class RoundPairings:
+    round: int                          # 0-based
+    matches: Tuple[Tuple[str, str], ...]
+    bye: Optional[str] = None           # who sits out (odd player counts only)
+
+def num_rounds(n_players: int) -> int:
+    """Rounds in a single round robin: n - 1, with n rounded up to even."""
+    if n_players < 2:
+        return 0
+    return n_players - 1 if n_players % 2 == 0 else n_players
+
+def round_pairings(players: Sequence[str], k: int) -> RoundPairings:
+    """
+    Round k of the circle method, computed directly in O(n).
+
+    The first player stays fixed and the others rotate one step per round;
+    with an odd count a BYE slot joins the rotation and its opponent is the
+    round's bye. Round k is read straight off the rotation, so no earlier
+    round is built.
+    """
+    n = len(players) + len(players) % 2
+    rounds = num_rounds(len(players))
+    if not 0 <= k < rounds:
+        raise IndexError(f"round {k} out of range for {len(players)} players")
+    # After k rotations the rotating players (plus the BYE slot, None) are shifted right by k
+    rot = list(players[1:]) + [None] * (n - len(players))
+    shift = k % len(rot)
+    slots = [players[0]] + rot[len(rot) - shift:] + rot[:len(rot) - shift]
+    half = n // 2
+    matches = []
+    bye = None
+    for a, b in zip(slots[:half], reversed(slots[half:])):
+        if a is None or b is None:
+            bye = b if a is None else a
+        else:
+            matches.append((a, b))
+    return RoundPairings(k, tuple(matches), bye)
+
+def iter_rounds(players: Sequence[str], start: int = 0, stop: Optional[int] = None) -> Iterator[RoundPairings]:
+    """Rounds start..stop-1 (default: all), one at a time; memory stays O(n) however many are consumed."""
+    players = tuple(players)
+    total = num_rounds(len(players))
+    stop = total if stop is None else min(stop, total)
+    for k in range(max(0, start), stop):
+        yield round_pairings(players, k)
+
+@memoize(maxsize=32)
+def circle_schedule(players: Tuple[str, ...]) -> Schedule:
+    """
+    The whole schedule flattened to (matches, round of each match), BYEs
+    left out. Keyed on the player tuple, so reruns and sessions with the
+    same roster share one schedule.
+    """
+    matches, rounds = [], []
+    for rnd in iter_rounds(players):
+        matches.extend(rnd.matches)
+        rounds.extend([rnd.round] * len(rnd.matches))
+    return tuple(matches), tuple(rounds)
+
+@memoize(maxsize=32)
+def bye_schedule(players: Tuple[str, ...]) -> Tuple[Optional[str], ...]:
+    """Who sits out each round (all None for an even player count)."""
+    return tuple(rnd.bye for rnd in iter_rounds(players))
@@ -0,0 +1,238 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from character_stats import TIER_SCORES
+from models import BYE_ID
+from profiling import span
+from progression import TBD_ID, BracketState, round_title
+from roster import SMASH_DATA
+from standings import MatchKey
+
+# Logit gap per tier step: S vs. B wins ~67%, S vs. F ~89%.
+TIER_STEP = 0.35
+# Runs per array block: at most CHUNK_RUNS, and few enough that runs x matches
+# stays within CHUNK_CELLS (a few tens of MB whatever the bracket or field size).
+CHUNK_RUNS = 20_000
+CHUNK_CELLS = 2_000_000
+
+
+# ---------------------------- Win-probability models ----------------------------
+def tier_strengths(characters: Sequence[str]) -> np.ndarray:
+    """Logit strength per character from its tier; unranked or unknown characters sit mid-table."""
+    mid = float(np.mean(list(TIER_SCORES.values())))
+    scores = [TIER_SCORES.get(SMASH_DATA.get(c, {}).get("Tier Rank (S-F)"), mid) for c in characters]
+    return TIER_STEP * (np.asarray(scores, dtype=np.float64) - mid)
+
+def history_strengths(players: Sequence[str], results: Iterable[Tuple[str, str]],
+                      prior: float = 1.0, iterations: int = 200) -> np.ndarray:
+    """
+    Bradley-Terry logit strength per player from (winner, loser) results.
+
+    Each player also gets `prior` virtual wins and losses against an average
+    opponent, so unbeaten or unseen players stay finite (unseen ones at 0).
+    Fitted with the MM updates on a players x players game-count matrix.
+    """
+    index = {p: i for i, p in enumerate(players)}
+    n = len(players)
+    games = np.zeros((n, n))
+    wins = np.zeros(n)
+    for w, l in results:
+        if w in index and l in index and w != l:
+            games[index[w], index[l]] += 1
+            games[index[l], index[w]] += 1
+            wins[index[w]] += 1
+    gamma = np.ones(n)
+    for _ in range(iterations):
+        denom = (games / (gamma[:, None] + gamma[None, :])).sum(axis=1) + 2 * prior / (gamma + 1.0)
+        new = (wins + prior) / denom
+        if np.allclose(new, gamma, rtol=1e-9, atol=0):
+            break
+        gamma = new
+    return np.log(gamma)
+
+def win_matrix(strength: np.ndarray) -> np.ndarray:
+    """P[i, j] = chance that i beats j under the logistic model."""
+    return 1.0 / (1.0 + np.exp(strength[None, :] - strength[:, None]))
+
+
+# ---------------------------- Simulation core ----------------------------
+@dataclass
+class SimulationResult:
+    labels: List[str]
+    runs: int
+    counts: np.ndarray     # (entries, stages): runs in which each entry reached each stage
+    stages: List[str]      # column names, last one is the tournament win
+    expected: Optional[np.ndarray] = None  # mean wins per entry (round robin only)
+
+    def table(self):
+        """DataFrame of per-stage chances, most likely winner first."""
+        import pandas as pd  # Only the table needs it
+        df = pd.DataFrame(self.counts / max(self.runs, 1), columns=self.stages)
+        df.insert(0, "Entry", self.labels)
+        if self.expected is not None:
+            df.insert(1, "Exp. Wins", self.expected.round(2))
+        df.sort_values(self.stages[::-1], ascending=False, inplace=True, kind="stable")
+        df.index = np.arange(1, len(df) + 1)
+        return df
+
+def _chunks(runs: int, seed: Optional[int], width: int) -> List[Tuple[int, np.random.SeedSequence]]:
+    """
+    Splits `runs` into per-block (size, seed) jobs of at most CHUNK_CELLS
+    runs x `width` cells; the split never depends on the worker count.
+    """
+    if runs < 1:
+        raise ValueError("runs must be at least 1")
+    block = max(1, min(CHUNK_RUNS, CHUNK_CELLS // max(width, 1)))
+    sizes = [block] * (runs // block) + ([runs % block] if runs % block else [])
+    return list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+
+def _run_pool(fn, args: tuple, runs: int, workers: int, seed: Optional[int],
+              width: int) -> Tuple[np.ndarray, ...]:
+    """Sums fn(*args, size, seed_seq) over every block, in-process or (workers > 1) over a process pool."""
+    jobs = _chunks(runs, seed, width)
+    workers = min(max(1, workers), len(jobs))
+    name = f"simulate.{fn.__name__.lstrip('_')}"
+    if workers <= 1:
+        parts = []
+        for size, ss in jobs:
+            with span(name):  # One call per block: the profile shows the block count and mean block time
+                parts.append(fn(*args, size, ss))
+    else:
+        with span(f"{name} ({workers} workers)"), ProcessPoolExecutor(max_workers=workers) as pool:
+            n = len(jobs)
+            parts = list(pool.map(fn, *([a] * n for a in args), [s for s, _ in jobs], [ss for _, ss in jobs]))
+    return tuple(sum(p[k] for p in parts) for k in range(len(parts[0])))
+
+
+# ---------------------------- Single elimination ----------------------------
+def _bracket_block(slots: np.ndarray, fixed: np.ndarray, offsets: np.ndarray, strength: np.ndarray,
+                   size: int, ss: np.random.SeedSequence) -> Tuple[np.ndarray]:
+    rng = np.random.default_rng(ss)
+    n = strength.size
+    rounds = len(offsets)
+    counts = np.zeros((n, rounds + 1), dtype=np.int64)
+    counts[:, 0] = size * np.bincount(slots[slots >= 0], minlength=n)
+    # Slots x runs, so each match side is a contiguous row
+    alive = np.repeat(slots[:, None], size, axis=1)
+    for r in range(rounds):
+        has_bye = alive.min() < 0
+        if r:
+            counts[:, r] += np.bincount(alive[alive >= 0] if has_bye else alive.ravel(), minlength=n)
+        a, b = alive[0::2], alive[1::2]
+        # u < 1 / (1 + e^-(sa - sb)), from 1-D strength lookups instead of a 2-D probability gather
+        a_wins = rng.random(a.shape, dtype=np.float32) * (1.0 + np.exp(strength[b] - strength[a])) < 1.0
+        f = fixed[offsets[r]:offsets[r] + a.shape[0], None]
+        if (f >= 0).any():
+            a_wins = np.where(f == a, True, np.where(f == b, False, a_wins))
+        if has_bye:
+            a_wins |= b == BYE_ID
+            a_wins &= a != BYE_ID
+        alive = np.where(a_wins, a, b)
+    champ = alive[0]
+    counts[:, rounds] += np.bincount(champ[champ >= 0], minlength=n)
+    return (counts,)
+
+def simulate_bracket(state: BracketState, strength: np.ndarray, runs: int = 100_000, *,
+                     seed: Optional[int] = None, workers: int = 1) -> SimulationResult:
+    """
+    Monte Carlo over the rest of a single-elimination bracket.
+
+    `strength` holds one logit per packed entry id. All runs advance together:
+    each round is one matches x runs array of coin flips under the logistic
+    model of `win_matrix`. Results already recorded in `state` are kept.
+    Blocks of runs (see CHUNK_CELLS) are summed in-process, or across
+    `workers` processes when a caller such as a benchmark opts in; a given
+    seed gives the same counts whatever the worker count.
+    """
+    packed = state.packed
+    width = 2 * state.round_size(0)
+    slots = np.array([packed.pair_ids(i)[k] if i < len(packed) else BYE_ID
+                      for i in range(width // 2) for k in (0, 1)], dtype=np.int64)
+    fixed = np.array(state.choice, dtype=np.int64)
+    fixed[fixed < 0] = TBD_ID
+    offsets = np.array(state.offsets, dtype=np.int64)
+    (counts,) = _run_pool(_bracket_block, (slots, fixed, offsets, np.asarray(strength, dtype=np.float32)),
+                          runs, workers, seed, width)
+    stages = [round_title(r, state.num_rounds) for r in range(state.num_rounds)] + ["Champion"]
+    labels = [packed.label(i) for i in range(len(packed.entry_player))]
+    return SimulationResult(labels, runs, counts, stages)
+
+
+# ---------------------------- Round robin ----------------------------
+def _round_robin_block(p1: np.ndarray, p2: np.ndarray, fixed: np.ndarray, prob: np.ndarray,
+                       size: int, ss: np.random.SeedSequence) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(ss)
+    n = prob.shape[0]
+    m = p1.size
+    p1_wins = rng.random((size, m), dtype=np.float32) < prob[p1, p2]
+    p1_wins = np.where(fixed == 1, True, np.where(fixed == 0, False, p1_wins))
+    # wins[run, player] in one matrix product: +1 to p1 and -1 to p2 per p1 win, on top of p2 winning everything
+    swing = np.zeros((m, n), dtype=np.float32)
+    swing[np.arange(m), p1] += 1
+    swing[np.arange(m), p2] -= 1
+    wins = p1_wins.astype(np.float32) @ swing + np.bincount(p2, minlength=n).astype(np.float32)
+    # Ties for first are split at random
+    top = np.argmax(wins + rng.random(wins.shape, dtype=np.float32) * 0.5, axis=1)
+    return np.bincount(top, minlength=n)[:, None], wins.sum(axis=0)
+
+def simulate_round_robin(players: Sequence[str], schedule: Sequence[MatchKey], strength: np.ndarray,
+                         results: Optional[Dict[MatchKey, str]] = None, runs: int = 100_000, *,
+                         seed: Optional[int] = None, workers: int = 1) -> SimulationResult:
+    """
+    Monte Carlo over a round-robin schedule: each entry's chance of finishing
+    first (ties split at random) and expected wins. Matches in `results`
+    keep their recorded winner; BYE rows are ignored.
+    """
+    index = {p: i for i, p in enumerate(players)}
+    matches = [m for m in schedule if m[0] in index and m[1] in index]
+    p1 = np.array([index[a] for a, _ in matches], dtype=np.int64)
+    p2 = np.array([index[b] for _, b in matches], dtype=np.int64)
+    results = results or {}
+    fixed = np.array([{a: 1, b: 0}.get(results.get((a, b)), -1) for a, b in matches], dtype=np.int64)
+    counts, wins = _run_pool(_round_robin_block, (p1, p2, fixed, win_matrix(strength)), runs, workers, seed,
+                             max(len(matches), len(players)))
+    return SimulationResult(list(players), runs, counts, ["Win"], expected=wins / max(runs, 1))
+
+
+# ---------------------------- Inputs from the app ----------------------------
+def bracket_history(state: BracketState) -> List[Tuple[str, str]]:
+    """(winner, loser) players of every decided real match in a bracket."""
+    out = []
+    for r in range(state.num_rounds):
+        for i in range(state.round_size(r)):
+            a, b = state.sides(r, i)
+            w = state.winner_id(r, i)
+            if a >= 0 and b >= 0 and w >= 0:
+                loser = b if w == a else a
+                out.append((state.packed.entry(w).player, state.packed.entry(loser).player))
+    return out
+
+def round_robin_history(results: Dict[MatchKey, str]) -> List[Tuple[str, str]]:
+    return [(w, b if w == a else a) for (a, b), w in results.items()]
+
+def entry_strengths(players: Sequence[str], characters: Sequence[str], *, tiers: bool = True,
+                    results: Optional[Iterable[Tuple[str, str]]] = None) -> np.ndarray:
+    """
+    Logit strength per entry: its character's tier, plus its player's
+    Bradley-Terry strength when `results` are given.
+    """
+    s = tier_strengths(characters) if tiers else np.zeros(len(characters))
+    if results is not None:
+        names = list(dict.fromkeys(players))
+        hist = history_strengths(names, results)
+        pos = {p: i for i, p in enumerate(names)}
+        s = s + hist[[pos[p] for p in players]]
+    return s
+
+def player_strengths(players: Sequence[str], characters_of: Dict[str, List[str]], *, tiers: bool = True,
+                     results: Optional[Iterable[Tuple[str, str]]] = None) -> np.ndarray:
+    """Logit strength per player: mean tier of their characters (0 with none), plus Bradley-Terry from `results`."""
+    s = np.zeros(len(players))
+    if tiers:
+        s += [float(tier_strengths(characters_of[p]).mean()) if characters_of.get(p) else 0.0 for p in players]
+    if results is not None:
+        s += history_strengths(players, results)
+    return s
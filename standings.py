@@ -0,0 +1,75 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from profiling import timed
+
+# A round-robin match is identified by its two players, in schedule order.
+MatchKey = Tuple[str, str]
+
+
+# ---------------------------- Incremental standings ----------------------------
+class Standings:
+    """
+    Round-robin Wins/Losses kept up to date one result at a time.
+
+    Changing a result only adjusts the two players in that match. The
+    leaderboard DataFrame is built with column arithmetic and cached until
+    the next change (tracked by `version`).
+    """
+
+    def __init__(self, players: Iterable[str]):
+        self.players = [p for p in players if p != "BYE"]
+        self.index: Dict[str, int] = {p: i for i, p in enumerate(self.players)}
+        self.wins = np.zeros(len(self.players), dtype=np.int64)
+        self.losses = np.zeros(len(self.players), dtype=np.int64)
+        self.results: Dict[MatchKey, str] = {}
+        self.version = 0
+        self._board = None  # Cached leaderboard DataFrame
+        self._board_version = -1
+
+    def _apply(self, match: MatchKey, winner: str, delta: int):
+        p1, p2 = match
+        loser = p2 if winner == p1 else p1
+        if winner in self.index:
+            self.wins[self.index[winner]] += delta
+        if loser in self.index:
+            self.losses[self.index[loser]] += delta
+
+    @timed()
+    def set_result(self, match: MatchKey, winner: Optional[str]) -> bool:
+        """Records `winner` for `match` (None clears it). Returns False if nothing changed."""
+        if winner is not None and winner not in match:
+            winner = None
+        old = self.results.get(match)
+        if old == winner:
+            return False
+        if old is not None:
+            self._apply(match, old, -1)
+            del self.results[match]
+        if winner is not None:
+            self._apply(match, winner, +1)
+            self.results[match] = winner
+        self.version += 1
+        return True
+
+    def winner(self, match: MatchKey) -> Optional[str]:
+        return self.results.get(match)
+
+    def record(self, player: str) -> Tuple[int, int]:
+        i = self.index[player]
+        return int(self.wins[i]), int(self.losses[i])
+
+    @timed()
+    def leaderboard(self):
+        """DataFrame of Player / Wins / Losses / Win Rate, best first, indexed from 1."""
+        import pandas as pd  # Only the leaderboard needs it; keeps headless imports light
+        if self._board_version != self.version:
+            df = pd.DataFrame({"Player": self.players, "Wins": self.wins.copy(), "Losses": self.losses.copy()})
+            played = df["Wins"] + df["Losses"]
+            df["Win Rate"] = (df["Wins"] / played.where(played > 0)).fillna(0.0)
+            df.sort_values(by=["Wins", "Losses", "Player"], ascending=[False, True, True], inplace=True)
+            df.index = np.arange(1, len(df) + 1)
+            self._board = df
+            self._board_version = self.version
+        return self._board
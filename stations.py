@@ -0,0 +1,292 @@
+import heapq
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple, Union
+
+from formats import GraphMatch, resolve_graph
+from models import BYE, BYE_ID, Entry
+from progression import BracketState, round_title
+from standings import MatchKey
+
+INF = float("inf")
+
+
+# ---------------------------- Match graph ----------------------------
+@dataclass(frozen=True)
+class StationMatch:
+    """
+    One match to put on a setup. `key` stays the same across reruns and
+    results (e.g. ("bracket", round, match)), so plans and finish times can
+    be carried over. `players` lists only sides already known; a side that
+    is still TBD waits on `deps` (indices of the matches feeding it).
+    """
+    key: Hashable
+    label: str
+    players: Tuple[str, ...]
+    deps: Tuple[int, ...] = ()
+    done: bool = False
+
+def round_robin_matches(schedule: Sequence[MatchKey], results: Optional[Dict[MatchKey, str]] = None) -> List[StationMatch]:
+    """Round-robin matches, in schedule (round) order; BYE rows are skipped."""
+    results = results or {}
+    return [StationMatch(("rr", a, b), f"{a} vs {b}", (a, b), done=(a, b) in results)
+            for a, b in schedule if BYE.player not in (a, b)]
+
+def bracket_matches(state: BracketState) -> List[StationMatch]:
+    """
+    Every single-elimination match that will be played. A side is BYE_ID
+    only when the bracket structure forces it, so BYE matches are known up
+    front and skipped; a later match depends on the feeders that are played.
+    """
+    out: List[StationMatch] = []
+    index: Dict[Tuple[int, int], int] = {}
+    for r in range(state.num_rounds):
+        for i in range(state.round_size(r)):
+            a, b = state.sides(r, i)
+            if a == BYE_ID or b == BYE_ID:
+                continue
+            deps = tuple(index[(r - 1, j)] for j in (2 * i, 2 * i + 1) if r and (r - 1, j) in index)
+            players = tuple(dict.fromkeys(state.packed.entry(e).player for e in (a, b) if e >= 0))
+            label = f"{round_title(r, state.num_rounds)} M{i + 1}: {state.label(a) or 'TBD'} vs {state.label(b) or 'TBD'}"
+            index[(r, i)] = len(out)
+            out.append(StationMatch(("bracket", r, i), label, players, deps, done=state.winner_id(r, i) >= 0))
+    return out
+
+def _side_label(e: Optional[Entry], feed) -> str:
+    return f"{e.player} — {e.character}" if e is not None else feed.describe()
+
+def graph_matches(matches: Sequence[GraphMatch], results: Dict[int, Entry]) -> List[StationMatch]:
+    """Double-elimination matches; BYE matches (known from the structure) are skipped."""
+    sides = resolve_graph(list(matches), results)
+    out: List[StationMatch] = []
+    index: Dict[int, int] = {}
+    for m in matches:
+        a, b = sides[m.mid]
+        if a == BYE or b == BYE:
+            continue
+        deps = tuple(index[f.ref] for f in (m.a, m.b) if f.kind != "entry" and f.ref in index)
+        players = tuple(dict.fromkeys(e.player for e in (a, b) if e is not None))
+        label = f"M{m.mid} ({m.bracket}{m.round}): {_side_label(a, m.a)} vs {_side_label(b, m.b)}"
+        out.append(StationMatch(("graph", m.mid), label, players, deps, done=m.mid in results))
+        index[m.mid] = len(out) - 1
+    return out
+
+
+# ---------------------------- Plans ----------------------------
+@dataclass(frozen=True)
+class Slot:
+    key: Hashable
+    station: int  # 0-based
+    start: float  # minutes from the start of the event
+    end: float
+    status: str   # "done", "playing" or "planned"
+
+@dataclass
+class Plan:
+    stations: int
+    now: float
+    slots: List[Slot]   # by start, then station
+    lower_bound: float  # no plan of the unfinished matches can end earlier
+
+    @property
+    def makespan(self) -> float:
+        return max((s.end for s in self.slots), default=self.now)
+
+    def by_key(self) -> Dict[Hashable, Slot]:
+        return {s.key: s for s in self.slots}
+
+
+# ---------------------------- List scheduler ----------------------------
+class StationScheduler:
+    """
+    Puts matches on a fixed number of setups, earliest free setup first.
+
+    Whenever setups are free, the ready match with the longest chain of
+    dependent matches behind it goes next (critical path first), then the
+    one whose busiest player has the most matches left, then input order.
+    A match is ready once every feeder has finished and none of its players
+    is still playing elsewhere. Each match is pushed and popped on heaps a
+    bounded number of times, so a plan costs O(n log n) plus the times a
+    match is skipped for a busy player.
+
+    The graph, priorities and player loads are built once; `replan` then
+    keeps what is done or already playing and re-plans only the rest, which
+    is what a late result needs.
+    """
+
+    def __init__(self, matches: Sequence[StationMatch], duration: Union[float, Sequence[float]]):
+        n = len(matches)
+        self.matches = list(matches)
+        self.duration = [float(duration)] * n if isinstance(duration, (int, float)) else [float(d) for d in duration]
+        if len(self.duration) != n:
+            raise ValueError(f"expected {n} durations, got {len(self.duration)}")
+        self.index = {m.key: i for i, m in enumerate(self.matches)}
+        self.dependents: List[List[int]] = [[] for _ in range(n)]
+        for i, m in enumerate(self.matches):
+            for d in m.deps:
+                if not 0 <= d < n or d == i:
+                    raise ValueError(f"match {m.key!r} depends on unknown match {d}")
+                self.dependents[d].append(i)
+        # Longest duration chain from each match to the end (its own time included), in reverse topological order
+        self.chain = [0.0] * n
+        for i in reversed(self._topological_order()):
+            self.chain[i] = self.duration[i] + max((self.chain[j] for j in self.dependents[i]), default=0.0)
+        load: Dict[str, int] = {}
+        for m in self.matches:
+            if not m.done:
+                for p in m.players:
+                    load[p] = load.get(p, 0) + 1
+        self.priority = [(-self.chain[i], -max((load.get(p, 0) for p in m.players), default=0), i)
+                         for i, m in enumerate(self.matches)]
+
+    def _topological_order(self) -> List[int]:
+        indeg = [len(m.deps) for m in self.matches]
+        order = [i for i, d in enumerate(indeg) if d == 0]
+        for i in order:  # Grows while iterating
+            for j in self.dependents[i]:
+                indeg[j] -= 1
+                if indeg[j] == 0:
+                    order.append(j)
+        if len(order) != len(self.matches):
+            raise ValueError("match dependencies form a cycle")
+        return order
+
+    def plan(self, stations: int, *, now: float = 0.0, finished: Optional[Dict[Hashable, float]] = None,
+             running: Optional[Dict[Hashable, Tuple[int, float]]] = None,
+             available: Optional[Dict[str, float]] = None) -> Plan:
+        """
+        Plans every unfinished match from `now` on.
+
+        `finished` maps keys to finish times (matches marked done count as
+        finished too). `running` maps keys to (station, start) for matches
+        already on a setup; they keep it until start + duration, or until
+        `now` if they are overrunning. `available` holds the earliest time
+        each late player can play.
+        """
+        if stations < 1:
+            raise ValueError("need at least one station")
+        finished = finished or {}
+        running = running or {}
+        n = len(self.matches)
+        dur, players, prio = self.duration, [m.players for m in self.matches], self.priority
+        done = [m.done or m.key in finished for m in self.matches]
+        started = done[:]
+        indeg = [sum(not done[d] for d in m.deps) for m in self.matches]
+        player_free: Dict[str, float] = dict(available or {})
+        slots: List[Slot] = []
+        events: List[Tuple[float, int, int]] = []  # (end, match, station) of matches on a setup
+        busy = set()
+        for key, (s, start) in running.items():
+            i = self.index.get(key)
+            if i is None or done[i] or not 0 <= s < stations or s in busy:
+                continue
+            end = max(start + dur[i], now)
+            slots.append(Slot(key, s, start, end, "playing"))
+            events.append((end, i, s))
+            busy.add(s)
+            started[i] = True
+            for p in players[i]:
+                player_free[p] = max(player_free.get(p, now), end)
+        heapq.heapify(events)
+        free = [s for s in range(stations) if s not in busy]
+        ready = [prio[i] for i in range(n) if not started[i] and indeg[i] == 0]
+        heapq.heapify(ready)
+        remaining = started.count(False)
+
+        t = now
+        while remaining:
+            while events and events[0][0] <= t:
+                _, i, s = heapq.heappop(events)
+                heapq.heappush(free, s)
+                for j in self.dependents[i]:
+                    indeg[j] -= 1
+                    if indeg[j] == 0 and not started[j]:
+                        heapq.heappush(ready, prio[j])
+            skipped = []
+            wake = INF  # Earliest time a skipped match's players are all free
+            while free and ready:
+                item = heapq.heappop(ready)
+                i = item[2]
+                until = max([player_free.get(p, t) for p in players[i]], default=t)
+                if until > t:
+                    skipped.append(item)
+                    wake = min(wake, until)
+                    continue
+                s = heapq.heappop(free)
+                end = t + dur[i]
+                slots.append(Slot(self.matches[i].key, s, t, end, "planned"))
+                heapq.heappush(events, (end, i, s))
+                for p in players[i]:
+                    player_free[p] = end
+                started[i] = True
+                remaining -= 1
+            for item in skipped:
+                heapq.heappush(ready, item)
+            nxt = min(events[0][0] if events else INF, wake if free else INF)
+            if nxt == INF:
+                if remaining:
+                    raise ValueError("some matches can never start: check dependencies")
+                break
+            t = max(t, nxt)
+        slots.sort(key=lambda s: (s.start, s.station))
+        return Plan(stations, now, slots, self._lower_bound(stations, now, done, slots, available or {}))
+
+    def replan(self, previous: Plan, now: float, finished: Dict[Hashable, float], *, stations: Optional[int] = None,
+               available: Optional[Dict[str, float]] = None) -> Plan:
+        """
+        `previous` brought up to `now`. Its slots are replayed in order, each
+        starting once its setup, players and feeders are actually free, so a
+        late result pushes back what queued behind it. Replayed matches that
+        started by `now` keep their setup ("playing"); finished ones become
+        "done" (at their time in `finished`, or their planned end if they are
+        only marked done); everything else is planned again from `now`.
+        Cost is that of planning the unfinished part.
+        """
+        stations = stations or previous.stations
+        station_free: Dict[int, float] = {}
+        player_free: Dict[str, float] = {}
+        end_of: Dict[int, float] = {}  # match -> actual or expected finish, for its dependents
+        history: List[Slot] = []
+        running: Dict[Hashable, Tuple[int, float]] = {}
+        for slot in previous.slots:  # By planned start
+            i = self.index.get(slot.key)
+            if i is None or slot.station >= stations:
+                continue
+            m = self.matches[i]
+            start = max([slot.start, station_free.get(slot.station, 0.0)]
+                        + [player_free.get(p, 0.0) for p in m.players]
+                        + [end_of.get(d, INF) for d in m.deps if not self.matches[d].done])
+            if slot.key in finished or m.done:
+                end = min(finished.get(slot.key, slot.end), now)
+                start = min(start, end)
+                history.append(Slot(slot.key, slot.station, start, end, "done"))
+                end_of[i] = end
+            elif start <= now:
+                running[slot.key] = (slot.station, start)
+                end = INF  # Still on its setup
+            else:
+                continue  # Re-planned; its setup and players stay free
+            # A done slot behind one still playing (its result is late) must not free that setup or player
+            station_free[slot.station] = max(station_free.get(slot.station, 0.0), end)
+            for p in m.players:
+                player_free[p] = max(player_free.get(p, 0.0), end)
+        plan = self.plan(stations, now=now, finished=finished, running=running, available=available)
+        plan.slots = sorted(history + plan.slots, key=lambda s: (s.start, s.station))
+        return plan
+
+    def _lower_bound(self, stations: int, now: float, done: List[bool], slots: List[Slot],
+                     available: Dict[str, float]) -> float:
+        """Max of: the longest unfinished chain, the remaining work spread over every setup, and the busiest player."""
+        start = {s.key: s.start for s in slots if s.status == "playing"}
+        work = 0.0
+        chain = now
+        per_player: Dict[str, float] = {}
+        for i, m in enumerate(self.matches):
+            if done[i]:
+                continue
+            left = self.duration[i] - max(0.0, now - start[m.key]) if m.key in start else self.duration[i]
+            left = max(left, 0.0)
+            work += left
+            chain = max(chain, now + self.chain[i] - self.duration[i] + left)
+            for p in m.players:
+                per_player[p] = per_player.get(p, max(now, available.get(p, now))) + left
+        return max(chain, now + work / stations, max(per_player.values(), default=now))
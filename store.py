@@ -0,0 +1,350 @@
+import atexit
+import bisect
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from models import Entry, PackedBracket
+from progression import TBD_ID, BracketState
+from standings import Standings
+
+DATA_DIR = os.environ.get("SMASH_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+
+
+# A changed thing: ("entries",), ("bracket",) / ("rr",) for a whole new bracket or
+# round robin, or ("bracket", round, match) / ("rr", player_a, player_b) for one result.
+ChangeKey = Tuple
+
+
+class StaleResultError(Exception):
+    """A result was reported against an older version of that match than the store holds."""
+
+    def __init__(self, key: ChangeKey, expected: int, current: int):
+        super().__init__(f"{key} is at version {current}, not {expected}")
+        self.key, self.expected, self.current = key, expected, current
+
+
+def event_id(event: Dict) -> str:
+    """
+    Stable id of a new bracket or round robin: the "id" stored in its event,
+    or, for events logged before ids existed, a hash of the event.
+    """
+    if event.get("id"):
+        return str(event["id"])
+    return hashlib.sha1(json.dumps(event, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+# ---------------------------- Tournament model ----------------------------
+class Tournament:
+    """
+    The resumable part of an event: the entry table, the single-elimination
+    bracket with its results, and the round robin with its results.
+
+    State only changes through `apply(event)`, where an event is a small
+    JSON-able dict (see EVENT_TYPES), so replaying a log rebuilds it exactly.
+    The BracketState and Standings here are the live objects the app renders.
+
+    Every applied event bumps `version`, and each match result remembers the
+    version that last changed it, so clients can report against the version
+    they saw (optimistic concurrency) and fetch only what changed since.
+    """
+
+    EVENT_TYPES = ("entries", "bracket", "bracket_result", "clear_bracket", "rr_schedule", "rr_result", "rr_reset")
+    CREATE_TYPES = ("bracket", "rr_schedule")  # Events that start something new, and carry its id
+
+    def __init__(self):
+        self.entries: List[Tuple[str, str]] = []
+        self.bracket: Optional[BracketState] = None
+        self.bracket_meta: Dict[str, object] = {}  # rule, team_of, team_colors at generation time
+        self.standings: Optional[Standings] = None
+        # Survive restarts, unlike versions: tell one bracket / round robin's results from the next one's
+        self.bracket_id = ""
+        self.rr_id = ""
+        self.version = 0
+        self._versions: Dict[ChangeKey, int] = {}
+        self._change_versions: List[int] = []  # parallel, ascending: for changes_since()
+        self._change_keys: List[ChangeKey] = []
+
+    # ---- versions ----
+    def match_version(self, key: ChangeKey) -> int:
+        """Version of one result; a new bracket or round robin counts as a change to all of its matches."""
+        return max(self._versions.get(key, 0), self._versions.get(key[:1], 0))
+
+    def changes_since(self, version: int) -> Tuple[int, List[ChangeKey]]:
+        """(current version, keys changed after `version`), without scanning older changes."""
+        start = bisect.bisect_right(self._change_versions, version)
+        return self.version, list(dict.fromkeys(self._change_keys[start:]))
+
+    @staticmethod
+    def result_key(event: Dict) -> Optional[ChangeKey]:
+        if event["type"] == "bracket_result":
+            return ("bracket", event["round"], event["match"])
+        if event["type"] == "rr_result":
+            return ("rr",) + tuple(event["match"])
+        return None
+
+    # ---- events ----
+    def apply(self, event: Dict, expected_version: Optional[int] = None) -> bool:
+        """
+        Applies one event; returns False if it changed nothing (and need not be
+        logged). With `expected_version`, a result event is only applied if its
+        match is still at that version, else StaleResultError is raised.
+        """
+        if expected_version is not None:
+            key = self.result_key(event)
+            if key is not None and self.match_version(key) != expected_version:
+                raise StaleResultError(key, expected_version, self.match_version(key))
+        changed = self._apply(event)
+        if not changed:
+            return False
+        self.version += 1
+        for key in changed:
+            self._versions[key] = self.version
+            self._change_versions.append(self.version)
+            self._change_keys.append(key)
+        return True
+
+    def _apply(self, event: Dict) -> List[ChangeKey]:
+        kind = event["type"]
+        if kind == "entries":
+            rows = [(str(p), str(c)) for p, c in event["rows"]]
+            if rows == self.entries:
+                return []
+            self.entries = rows
+            return [("entries",)]
+        if kind == "bracket":
+            pairs = [(Entry(*a), Entry(*b)) for a, b in event["pairs"]]
+            self.bracket = BracketState(PackedBracket.from_pairs(pairs))
+            self.bracket_meta = {k: event.get(k) for k in ("rule", "team_of", "team_colors")}
+            self.bracket_id = event_id(event)
+            return [("bracket",)]
+        if kind == "bracket_result":
+            state = self.bracket
+            r, i = event["round"], event["match"]
+            if state is None or not 0 <= r < state.num_rounds or not 0 <= i < state.round_size(r):
+                return []
+            winner = event["winner"] if event["winner"] is not None else TBD_ID
+            if state.choice[state.match_index(r, i)] == winner:
+                return []
+            touched = state.record(r, i, winner)
+            # record() walks straight up: match i >> k of round r + k
+            return [("bracket", r + k, i >> k) for k in range(touched)]
+        if kind == "clear_bracket":
+            if self.bracket is None:
+                return []
+            self.bracket, self.bracket_meta = None, {}
+            return [("bracket",)]
+        if kind == "rr_schedule":
+            self.standings = Standings(event["players"])
+            self.rr_id = event_id(event)
+            return [("rr",)]
+        if kind == "rr_result":
+            match = tuple(event["match"])
+            if self.standings is None or not self.standings.set_result(match, event["winner"]):
+                return []
+            return [("rr",) + match]
+        if kind == "rr_reset":
+            if self.standings is None:
+                return []
+            self.standings = None
+            return [("rr",)]
+        raise ValueError(f"unknown event type {kind!r}")
+
+    # ---- snapshots ----
+    def to_json(self) -> Dict:
+        out: Dict[str, object] = {"entries": self.entries, "bracket": None, "rr": None}
+        if self.bracket is not None:
+            out["bracket"] = dict(self.bracket_meta, id=self.bracket_id,
+                                  pairs=[[[a.player, a.character], [b.player, b.character]] for a, b in self.bracket.packed.pairs()],
+                                  choices=list(self.bracket.choice))
+        if self.standings is not None:
+            out["rr"] = {"players": self.standings.players, "id": self.rr_id,
+                         "results": [[p1, p2, w] for (p1, p2), w in self.standings.results.items()]}
+        return out
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "Tournament":
+        t = cls()
+        t.entries = [(p, c) for p, c in data.get("entries", [])]
+        b = data.get("bracket")
+        if b:
+            t.apply(dict(b, type="bracket"))
+            t.bracket.load_choices(b["choices"])
+        rr = data.get("rr")
+        if rr:
+            t.standings = Standings(rr["players"])
+            t.rr_id = event_id(dict(rr, type="rr_schedule"))
+            for p1, p2, w in rr["results"]:
+                t.standings.set_result((p1, p2), w)
+        return t
+
+
+# ---------------------------- Append-only log ----------------------------
+class AppendLog:
+    """
+    A JSON-lines file that is only ever appended to, written in batches: the
+    buffer is flushed (one write + one fsync) when it reaches `batch_size`
+    records or `flush_interval` seconds after the first buffered record, and
+    at exit.
+    """
+
+    def __init__(self, path: str, *, batch_size: int = 64, flush_interval: float = 0.5,
+                 lock: Optional[threading.RLock] = None):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.lock = lock or threading.RLock()
+        self._pending: List[str] = []
+        self._timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
+
+    def read(self, offset: int = 0, chunk: int = 4096) -> Iterator[Tuple[Dict, int]]:
+        """
+        Yields (record, offset after it) from `offset` on; a torn final line is
+        cut off. Lines are parsed `chunk` at a time as one JSON array.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r+b") as f:
+            f.seek(offset)
+            lines: List[bytes] = []
+            ends: List[int] = []
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Torn final write: drop it so the next append starts on a clean line
+                    f.truncate(offset)
+                    break
+                offset += len(line)
+                lines.append(line)
+                ends.append(offset)
+                if len(lines) >= chunk:
+                    yield from zip(json.loads(b"[" + b",".join(lines) + b"]"), ends)
+                    lines, ends = [], []
+            if lines:
+                yield from zip(json.loads(b"[" + b",".join(lines) + b"]"), ends)
+
+    def size(self) -> int:
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def append(self, record: Dict):
+        with self.lock:
+            self._pending.append(json.dumps(record, separators=(",", ":")))
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def flush(self):
+        """Writes every buffered record with a single write and fsync."""
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            with open(self.path, "ab") as f:
+                f.write(("\n".join(self._pending) + "\n").encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+            self._pending.clear()
+
+
+# ---------------------------- Tournament store ----------------------------
+class TournamentStore:
+    """
+    One tournament on disk: `<name>.log.jsonl` (an AppendLog of events) plus
+    `<name>.snapshot.json` (full state and the log offset it covers).
+    Loading reads the snapshot and replays only the log after it.
+
+    Events are applied in memory at once and logged in batches (see
+    AppendLog). A new snapshot is written every `snapshot_every` logged events.
+    """
+
+    def __init__(self, name: str = "default", directory: str = DATA_DIR, *,
+                 batch_size: int = 64, flush_interval: float = 0.5, snapshot_every: int = 1000):
+        safe = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in name) or "default"
+        os.makedirs(directory, exist_ok=True)
+        self.name = name
+        self.log_path = os.path.join(directory, f"{safe}.log.jsonl")
+        self.snapshot_path = os.path.join(directory, f"{safe}.snapshot.json")
+        self.snapshot_every = snapshot_every
+        self.lock = threading.RLock()
+        self.log = AppendLog(self.log_path, batch_size=batch_size, flush_interval=flush_interval, lock=self.lock)
+        self._since_snapshot = 0
+        self.load_seconds = 0.0
+        self.replayed = 0
+        self.tournament = self._load()
+        # Called as listener(store, changed_keys) after each applied event (not on replay)
+        self.listeners: List[Callable[["TournamentStore", List[ChangeKey]], None]] = []
+
+    def _load(self) -> Tournament:
+        t0 = time.perf_counter()
+        offset = 0
+        tournament = Tournament()
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snap = json.load(f)
+            tournament = Tournament.from_json(snap["state"])
+            offset = snap["log_offset"]
+        for event, _ in self.log.read(offset):
+            tournament.apply(event)
+            self.replayed += 1
+        self._since_snapshot = self.replayed
+        self.load_seconds = time.perf_counter() - t0
+        return tournament
+
+    def apply(self, event: Dict, expected_version: Optional[int] = None) -> int:
+        """
+        Applies `event` to the tournament and queues it for the log. Returns
+        the version it created (always the previous version + 1), or 0 for
+        no-ops. The version check and the change happen under one lock, so
+        concurrent reporters of the same match cannot both win.
+        """
+        if event["type"] in Tournament.CREATE_TYPES and not event.get("id"):
+            event = dict(event, id=uuid.uuid4().hex)  # Logged with the event, so replays keep it
+        with self.lock:
+            before = self.tournament.version
+            if not self.tournament.apply(event, expected_version):
+                return 0
+            self.log.append(event)
+            if self.listeners:
+                _, changed = self.tournament.changes_since(before)
+                for listener in self.listeners:
+                    listener(self, changed)
+            self._since_snapshot += 1
+            if self._since_snapshot >= self.snapshot_every:
+                self.snapshot()
+            return self.tournament.version
+
+    @property
+    def pending(self) -> int:
+        return self.log.pending
+
+    def flush(self):
+        self.log.flush()
+
+    def snapshot(self):
+        """Writes the full state atomically; later loads skip the log up to this point."""
+        with self.lock:
+            self.flush()
+            offset = self.log.size()
+            tmp = self.snapshot_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"log_offset": offset, "state": self.tournament.to_json()}, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.snapshot_path)
+            self._since_snapshot = 0
+
+    def close(self):
+        self.flush()
@@ -1,124 +1,82 @@
 import streamlit as st
 import random
-from dataclasses import dataclass
-from typing import List, Optional, Tuple, Dict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 import pandas as pd
 import math
 import os
+import time
+import numpy as np
+
+from models import BYE, Entry, next_power_of_two
+from progression import TBD_ID, BracketState, round_title
+from roster import SMASH_CHARACTERS
+from character_stats import NUMERIC_STATS, get_char_data, most_similar, rank_by, roster_table, stat_range
+from pairing import generate_bracket_balanced, generate_bracket_rated, generate_bracket_seeded, make_rng, pairing_report
+from standings import MatchKey, Standings
+from formats import GraphMatch, SwissState, generate_double_elimination, resolve_graph, swiss_pairings
+from draft import DraftRules
+from tables import build_entries_df, auto_fill_characters, df_to_entries, unknown_characters, fill_blank_players
+from icons import atlas_css, entry_line_html, icon_html
+from caching import cache_stats
+from profiling import count_event, export_profile, finish_rerun, start_rerun, timed
+from round_robin import bye_schedule, circle_schedule
+from stations import StationMatch, StationScheduler, bracket_matches, graph_matches, round_robin_matches
+from store import DATA_DIR, StaleResultError, TournamentStore
+from ratings import ResultHistory
+from bulk_io import import_table
+from simulate import (SimulationResult, bracket_history, entry_strengths, player_strengths,
+                      round_robin_history, simulate_bracket, simulate_round_robin)
+from records import EXTENSIONS, FORMATS, MIME_TYPES, bracket_rows, detect_format, export_bytes, schedule_rows, standings_rows
 
 st.set_page_config(page_title="Smash Bracket", page_icon="🎮", layout="wide")
 
-# --- Smash Ultimate Character List (for use in data entry and info page) ---
-# NOTE: This list is slightly smaller than the full list to match the provided data's scope.
-SMASH_CHARACTERS = [
-    "Mario", "Donkey Kong", "Link", "Samus", "Dark Samus", "Yoshi", "Kirby", "Fox", 
-    "Pikachu", "Luigi", "Ness", "Captain Falcon", "Jigglypuff", "Peach", "Daisy", 
-    "Bowser", "Ice Climbers", "Sheik", "Zelda", "Dr. Mario", "Pichu", "Falco", 
-    "Marth", "Lucina", "Young Link", "Ganondorf", "Mewtwo", "Roy", "Chrom", 
-    "Mr. Game & Watch", "Meta Knight", "Pit", "Dark Pit", "Zero Suit Samus", 
-    "Wario", "Snake", "Ike", "Pokémon Trainer", "Diddy Kong", "Lucas", "Sonic", 
-    "King Dedede", "Olimar", "Lucario", "R.O.B.", "Toon Link", "Wolf", "Villager", 
-    "Mega Man", "Wii Fit Trainer", "Rosalina & Lumal", "Little Mac", "Greninja", 
-    "Palutena", "Pac-Man", "Robin", "Shulk", "Bowser Jr.", "Duck Hunt", "Ryu", 
-    "Ken", "Cloud", "Corrin", "Bayonetta", "Inkling", "Ridley", "Simon", "Richter", 
-    "King K. Rool", "Isabelle", "Incineroar", "Piranha Plant", "Joker", "Hero", 
-    "Banjo & Kazooie", "Terry Bogard", "Byleth", "Min Min", "Steve", "Sephiroth", 
-    "Pyra/Mythra", "Kazuya", "Sora", "Mii Brawler", "Mii Swordfighter", "Mii Gunner"
-]
+# ---------------------------- Profiling ----------------------------
+PROFILE_KEEP = 50  # Reruns kept per session for export
+PROFILE_FILE = os.path.join(DATA_DIR, "profile.jsonl")
 
-# --- ACTUAL CHARACTER DATA FROM UPLOADED PDF ---
-# This dictionary replaces the random mock data generator.
-SMASH_DATA = {
-    "Mario": {"Tier Rank (S-F)": "B", "Weight": 98, "Run Speed": 1.57, "Air Speed": 0.9, "Fall Speed": 1.62},
-    "Donkey Kong": {"Tier Rank (S-F)": "B", "Weight": 127, "Run Speed": 1.65, "Air Speed": 0.95, "Fall Speed": "Close Combat"},
-    "Link": {"Tier Rank (S-F)": "B", "Weight": 104, "Run Speed": 1.43, "Air Speed": 0.95, "Fall Speed": 1.62},
-    "Samus": {"Tier Rank (S-F)": "B", "Weight": 108, "Run Speed": 1.51, "Air Speed": 0.98, "Fall Speed": "Charge Shot, Missile, Screw"},
-    "Dark Samus": {"Tier Rank (S-F)": "B", "Weight": 108, "Run Speed": 1.51, "Air Speed": 0.98, "Fall Speed": "Attack, Bomb, Phazon Laser"},
-    "Yoshi": {"Tier Rank (S-F)": "B", "Weight": 104, "Run Speed": 1.48, "Air Speed": 1.3, "Fall Speed": 1.29},
-    "Kirby": {"Tier Rank (S-F)": "C", "Weight": 79, "Run Speed": 1.25, "Air Speed": 1.1, "Fall Speed": 1.2},
-    "Fox": {"Tier Rank (S-F)": "S", "Weight": 77, "Run Speed": 2.08, "Air Speed": 1.2, "Fall Speed": 1.8},
-    "Pikachu": {"Tier Rank (S-F)": "S", "Weight": 68, "Run Speed": 2.04, "Air Speed": 1.05, "Fall Speed": "Close Combat"},
-    "Luigi": {"Tier Rank (S-F)": "B", "Weight": 97, "Run Speed": 1.37, "Air Speed": 0.98, "Fall Speed": 1.5},
-    "Ness": {"Tier Rank (S-F)": "B", "Weight": 94, "Run Speed": 1.45, "Air Speed": 0.98, "Fall Speed": 1.5},
-    "Captain Falcon": {"Tier Rank (S-F)": "A", "Weight": 104, "Run Speed": 2.55, "Air Speed": 1.15, "Fall Speed": 1.7},
-    "Jigglypuff": {"Tier Rank (S-F)": "D", "Weight": 60, "Run Speed": 1.07, "Air Speed": 0.7, "Fall Speed": 1.1},
-    "Peach": {"Tier Rank (S-F)": "S", "Weight": 89, "Run Speed": 1.2, "Air Speed": 1.05, "Fall Speed": 1.2},
-    "Daisy": {"Tier Rank (S-F)": "S", "Weight": 89, "Run Speed": 1.2, "Air Speed": 1.05, "Fall Speed": 1.2},
-    "Bowser": {"Tier Rank (S-F)": "B", "Weight": 135, "Run Speed": 1.88, "Air Speed": 0.9, "Fall Speed": 1.4},
-    "Ice Climbers": {"Tier Rank (S-F)": "B", "Weight": 92, "Run Speed": 1.26, "Air Speed": 1.05, "Fall Speed": 1.3},
-    "Sheik": {"Tier Rank (S-F)": "B", "Weight": 78, "Run Speed": 2.05, "Air Speed": 1.07, "Fall Speed": 1.7},
-    "Zelda": {"Tier Rank (S-F)": "B", "Weight": 85, "Run Speed": 1.25, "Air Speed": 1.05, "Fall Speed": 1.4},
-    "Dr. Mario": {"Tier Rank (S-F)": "C", "Weight": 98, "Run Speed": 1.43, "Air Speed": 1.05, "Fall Speed": 1.2},
-    "Pichu": {"Tier Rank (S-F)": "C", "Weight": 62, "Run Speed": 1.83, "Air Speed": 1.05, "Fall Speed": 1.68},
-    "Falco": {"Tier Rank (S-F)": "B", "Weight": 82, "Run Speed": 1.61, "Air Speed": 1.05, "Fall Speed": 1.68},
-    "Marth": {"Tier Rank (S-F)": "A", "Weight": 90, "Run Speed": 1.6, "Air Speed": 0.95, "Fall Speed": 1.4},
-    "Lucina": {"Tier Rank (S-F)": "A", "Weight": 90, "Run Speed": 1.6, "Air Speed": 0.95, "Fall Speed": 1.4},
-    "Young Link": {"Tier Rank (S-F)": "A", "Weight": 84, "Run Speed": 1.51, "Air Speed": 1.28, "Fall Speed": 1.5},
-    "Ganondorf": {"Tier Rank (S-F)": "C", "Weight": 113, "Run Speed": 1.32, "Air Speed": 0.9, "Fall Speed": "Close Combat"},
-    "Mewtwo": {"Tier Rank (S-F)": "B", "Weight": 79, "Run Speed": 1.8, "Air Speed": 1.35, "Fall Speed": 1.5},
-    "Roy": {"Tier Rank (S-F)": "S", "Weight": 95, "Run Speed": 1.78, "Air Speed": 1.3, "Fall Speed": 1.4},
-    "Chrom": {"Tier Rank (S-F)": "W", "Weight": 95, "Run Speed": 1.78, "Air Speed": 1.08, "Fall Speed": 1.4},
-    "Mr. Game & Watch": {"Tier Rank (S-F)": "A", "Weight": 75, "Run Speed": 1.5, "Air Speed": 1.4, "Fall Speed": 1.8},
-    "Meta Knight": {"Tier Rank (S-F)": "B", "Weight": 80, "Run Speed": 1.8, "Air Speed": 1.2, "Fall Speed": "Close Combat"},
-    "Pit": {"Tier Rank (S-F)": "B", "Weight": 96, "Run Speed": 1.55, "Air Speed": 1.1, "Fall Speed": 1.4},
-    "Dark Pit": {"Tier Rank (S-F)": "B", "Weight": 96, "Run Speed": 1.55, "Air Speed": 1.1, "Fall Speed": 1.4},
-    "Zero Suit Samus": {"Tier Rank (S-F)": "S", "Weight": 80, "Run Speed": 2.0, "Air Speed": 1.05, "Fall Speed": 1.7},
-    "Wario": {"Tier Rank (S-F)": "A", "Weight": 107, "Run Speed": 1.5, "Air Speed": 0.95, "Fall Speed": 1.4},
-    "Snake": {"Tier Rank (S-F)": "S", "Weight": 107, "Run Speed": 1.1, "Air Speed": 0.9, "Fall Speed": 1.5},
-    "Ike": {"Tier Rank (S-F)": "B", "Weight": 107, "Run Speed": 1.36, "Air Speed": 0.9, "Fall Speed": 1.4},
-    "Pokémon Trainer": {"Tier Rank (S-F)": "S", "Weight": "N/A", "Run Speed": "Varies", "Air Speed": "Varies", "Fall Speed": "Varies"},
-    "Diddy Kong": {"Tier Rank (S-F)": "A", "Weight": 90, "Run Speed": 2.1, "Air Speed": 1.1, "Fall Speed": 1.6},
-    "Lucas": {"Tier Rank (S-F)": "B", "Weight": 94, "Run Speed": 1.58, "Air Speed": 1.1, "Fall Speed": 1.4},
-    "Sonic": {"Tier Rank (S-F)": "B", "Weight": 84, "Run Speed": 3.85, "Air Speed": 1.4, "Fall Speed": 1.4},
-    "King Dedede": {"Tier Rank (S-F)": "B", "Weight": 127, "Run Speed": 1.32, "Air Speed": 0.88, "Fall Speed": 1.4},
-    "Olimar": {"Tier Rank (S-F)": "B", "Weight": 79, "Run Speed": 1.45, "Air Speed": 1.1, "Fall Speed": 1.5},
-    "Lucario": {"Tier Rank (S-F)": "B", "Weight": 90, "Run Speed": 1.7, "Air Speed": 1.2, "Fall Speed": 1.4},
-    "R.O.B.": {"Tier Rank (S-F)": "S", "Weight": 106, "Run Speed": 1.5, "Air Speed": 1.05, "Fall Speed": 1.5},
-    "Toon Link": {"Tier Rank (S-F)": "A", "Weight": 84, "Run Speed": 1.51, "Air Speed": 1.28, "Fall Speed": 1.28},
-    "Wolf": {"Tier Rank (S-F)": "A", "Weight": 92, "Run Speed": 1.65, "Air Speed": 1.05, "Fall Speed": 1.6},
-    "Villager": {"Tier Rank (S-F)": "B", "Weight": 92, "Run Speed": 1.4, "Air Speed": 1.1, "Fall Speed": 1.3},
-    "Mega Man": {"Tier Rank (S-F)": "B", "Weight": 102, "Run Speed": 1.43, "Air Speed": 0.95, "Fall Speed": 1.4},
-    "Wii Fit Trainer": {"Tier Rank (S-F)": "B", "Weight": 96, "Run Speed": 1.6, "Air Speed": 1.1, "Fall Speed": 1.4},
-    "Rosalina & Lumal": {"Tier Rank (S-F)": "A", "Weight": 78, "Run Speed": 1.35, "Air Speed": 1.2, "Fall Speed": 1.3},
-    "Little Mac": {"Tier Rank (S-F)": "C", "Weight": 87, "Run Speed": 2.3, "Air Speed": 0.7, "Fall Speed": 1.5},
-    "Greninja": {"Tier Rank (S-F)": "A", "Weight": 82, "Run Speed": 2.05, "Air Speed": 1.75, "Fall Speed": 1.6},
-    "Palutena": {"Tier Rank (S-F)": "S", "Weight": 91, "Run Speed": 1.75, "Air Speed": 1.1, "Fall Speed": 1.5},
-    "Pac-Man": {"Tier Rank (S-F)": "A", "Weight": 95, "Run Speed": 1.65, "Air Speed": 1.1, "Fall Speed": 1.4},
-    "Robin": {"Tier Rank (S-F)": "B", "Weight": 94, "Run Speed": 1.3, "Air Speed": 0.95, "Fall Speed": 1.25},
-    "Shulk": {"Tier Rank (S-F)": "A", "Weight": 97, "Run Speed": 1.55, "Air Speed": 1.1, "Fall Speed": "Close Combat"},
-    "Bowser Jr.": {"Tier Rank (S-F)": "B", "Weight": 100, "Run Speed": 1.4, "Air Speed": 0.95, "Fall Speed": 1.3},
-    "Duck Hunt": {"Tier Rank (S-F)": "B", "Weight": 86, "Run Speed": 1.4, "Air Speed": 0.95, "Fall Speed": 1.4},
-    "Ryu": {"Tier Rank (S-F)": "B", "Weight": 103, "Run Speed": 1.3, "Air Speed": 0.9, "Fall Speed": 1.5},
-    "Ken": {"Tier Rank (S-F)": "B", "Weight": 103, "Run Speed": 1.3, "Air Speed": 0.9, "Fall Speed": 1.5},
-    "Cloud": {"Tier Rank (S-F)": "S", "Weight": 100, "Run Speed": 1.7, "Air Speed": 0.95, "Fall Speed": 1.6},
-    "Corrin": {"Tier Rank (S-F)": "B", "Weight": 97, "Run Speed": 1.45, "Air Speed": 0.95, "Fall Speed": 1.4},
-    "Bayonetta": {"Tier Rank (S-F)": "C", "Weight": 81, "Run Speed": 1.8, "Air Speed": 1.05, "Fall Speed": 1.6},
-    "Inkling": {"Tier Rank (S-F)": "A", "Weight": 94, "Run Speed": 1.85, "Air Speed": 1.1, "Fall Speed": 1.5},
-    "Ridley": {"Tier Rank (S-F)": "B", "Weight": 107, "Run Speed": 1.55, "Air Speed": 1.05, "Fall Speed": 1.6},
-    "Simon": {"Tier Rank (S-F)": "B", "Weight": 107, "Run Speed": 1.1, "Air Speed": 0.9, "Fall Speed": 1.5},
-    "Richter": {"Tier Rank (S-F)": "B", "Weight": 107, "Run Speed": 1.1, "Air Speed": 0.9, "Fall Speed": 1.5},
-    "King K. Rool": {"Tier Rank (S-F)": "B", "Weight": 133, "Run Speed": 1.25, "Air Speed": 0.85, "Fall Speed": 1.4},
-    "Isabelle": {"Tier Rank (S-F)": "B", "Weight": 84, "Run Speed": 1.18, "Air Speed": 0.95, "Fall Speed": 1.4},
-    "Incineroar": {"Tier Rank (S-F)": "B", "Weight": 116, "Run Speed": 1.2, "Air Speed": 0.85, "Fall Speed": 1.4},
-    "Piranha Plant": {"Tier Rank (S-F)": "C", "Weight": 112, "Run Speed": 1.2, "Air Speed": 0.9, "Fall Speed": 1.5},
-    "Joker": {"Tier Rank (S-F)": "S", "Weight": 93, "Run Speed": 1.95, "Air Speed": 0.95, "Fall Speed": 1.6},
-    "Hero": {"Tier Rank (S-F)": "B", "Weight": 101, "Run Speed": 1.55, "Air Speed": 1.1, "Fall Speed": 1.4},
-    "Banjo & Kazooie": {"Tier Rank (S-F)": "A", "Weight": 106, "Run Speed": 1.5, "Air Speed": 0.95, "Fall Speed": 1.4},
-    "Terry Bogard": {"Tier Rank (S-F)": "A", "Weight": 108, "Run Speed": 1.6, "Air Speed": 0.9, "Fall Speed": 1.4},
-    "Byleth": {"Tier Rank (S-F)": "B", "Weight": 97, "Run Speed": 1.45, "Air Speed": 0.9, "Fall Speed": 1.4},
-    "Min Min": {"Tier Rank (S-F)": "S", "Weight": 104, "Run Speed": 1.55, "Air Speed": 0.95, "Fall Speed": 1.4},
-    "Steve": {"Tier Rank (S-F)": "S", "Weight": 92, "Run Speed": 1.3, "Air Speed": 0.9, "Fall Speed": 1.4},
-    "Sephiroth": {"Tier Rank (S-F)": "S", "Weight": 104, "Run Speed": 1.7, "Air Speed": 0.95, "Fall Speed": 1.6},
-    "Pyra/Mythra": {"Tier Rank (S-F)": "S", "Weight": 98, "Run Speed": 1.6, "Air Speed": 1.1, "Fall Speed": 1.5},
-    "Kazuya": {"Tier Rank (S-F)": "S", "Weight": 109, "Run Speed": 1.5, "Air Speed": 0.9, "Fall Speed": 1.5},
-    "Sora": {"Tier Rank (S-F)": "S", "Weight": 79, "Run Speed": 1.95, "Air Speed": 1.05, "Fall Speed": 1.2},
-    "Mii Brawler": {"Tier Rank (S-F)": "B", "Weight": 94, "Run Speed": 1.6, "Air Speed": 1.1, "Fall Speed": 1.4},
-    "Mii Swordfighter": {"Tier Rank (S-F)": "B", "Weight": 97, "Run Speed": 1.5, "Air Speed": 0.95, "Fall Speed": 1.4},
-    "Mii Gunner": {"Tier Rank (S-F)": "B", "Weight": 97, "Run Speed": 1.35, "Air Speed": 0.95, "Fall Speed": 1.4}
-}
+def count_elements(kind: str, n: int = 1, *, widget: bool = False):
+    """
+    Counts `n` elements of one Streamlit type (e.g. "radio") drawn by the
+    render helpers below, plus "widgets" for inputs. Only the helpers that
+    draw per match or per card count, so the totals cover the heavy parts.
+    """
+    count_event(f"st.{kind}", n)
+    if widget:
+        count_event("widgets", n)
+
+def profiling_panel(event: str):
+    """Breakdown of the rerun that just ran (everything above this panel), and export of this session's reruns."""
+    rec = finish_rerun()
+    with st.expander("Profiling"):
+        st.checkbox("Profile reruns", key="profile_reruns",
+                    help="Times the hot paths and counts allocations, plus the elements and widgets the match and card views draw, on every rerun of this session.")
+        if rec is None:
+            return
+        rec.label = st.session_state.get("page", "")
+        log = st.session_state.setdefault("profile_log", [])
+        log.append(rec.to_dict())
+        del log[:-PROFILE_KEEP]
+        c = rec.counters
+        st.caption(f"Rerun: {rec.seconds * 1000:.1f} ms · {c.get('widgets', 0)} widgets · "
+                   f"{c.get('st.markdown', 0)} markdown · {rec.blocks:+,} blocks · {rec.collections} GC passes")
+        if rec.spans:
+            st.dataframe(pd.DataFrame(rec.rows()), hide_index=True, use_container_width=True, column_config={
+                "Total ms": st.column_config.NumberColumn(format="%.2f"),
+                "Mean ms": st.column_config.NumberColumn(format="%.3f"),
+                "Share": st.column_config.ProgressColumn(format="%.2f", min_value=0, max_value=1),
+            })
+        elements = {k[3:]: v for k, v in c.items() if k.startswith("st.")}
+        if elements:
+            st.dataframe(pd.DataFrame({"Element": list(elements), "Count": list(elements.values())})
+                         .sort_values("Count", ascending=False), hide_index=True, use_container_width=True)
+        if st.button(f"Append {len(log)} reruns to {os.path.basename(PROFILE_FILE)}", key="profile_export"):
+            os.makedirs(DATA_DIR, exist_ok=True)
+            n = export_profile(PROFILE_FILE, log, event=event)
+            log.clear()
+            st.success(f"Saved {n} reruns to `{PROFILE_FILE}`.")
 
 # --- Custom CSS (Slightly modified from last version for clarity) ---
-st.markdown("""
+APP_CSS = """
 <style>
 /* Base Styles for the Bracket Generator */
 .match-box { 
@@ -156,6 +114,20 @@ st.markdown("""
     font-size: 13px; 
 }
 
+/* Whole bracket in one payload: one flex column per round */
+.bracket {
+    display: flex;
+    gap: 16px;
+    overflow-x: auto;
+    padding-bottom: 6px;
+}
+.bracket-round {
+    display: flex;
+    flex-direction: column;
+    justify-content: space-around;
+    min-width: 220px;
+}
+
 /* Custom Styles for Character Comparison Cards */
 .comparison-card {
     background-color: #f7f9fb;
@@ -192,29 +164,16 @@ st.markdown("""
     margin-bottom: 10px;
 }
 </style>
-""", unsafe_allow_html=True)
+"""
 
-# ---------------------------- Data types ----------------------------
-@dataclass(frozen=True)
-class Entry:
-    player: str
-    character: str
+@st.cache_resource
+def page_css() -> str:
+    """App CSS plus the icon atlas rule (every character icon is a position in that one sheet), built once per process."""
+    return APP_CSS + f"<style>{atlas_css()}</style>"
 
-# ---------------------------- Power-of-two helpers ----------------------------
-def next_power_of_two(n: int) -> int:
-    if n <= 1:
-        return 1
-    return 1 << (n - 1).bit_length()
-
-def byes_needed(n: int) -> int:
-    return max(0, next_power_of_two(n) - n)
+st.markdown(page_css(), unsafe_allow_html=True)
 
 # ---------------------------- Icons & colors ----------------------------
-ICON_DIR = os.path.join(os.path.dirname(__file__), "images")
-
-def get_character_icon_path(char_name: str) -> Optional[str]:
-    # Placeholder for local path check (removed os.path.exists check)
-    return None 
 
 TEAM_COLOR_FALLBACKS = [
     "#E91E63", "#3F51B5", "#009688", "#FF9800", "#9C27B0",
@@ -247,274 +206,498 @@ def get_player_color(player: str, team_of: Dict[str, str], team_colors: Dict[str
     return st.session_state.player_colors[player]
 
 
-def render_name_html(player: str, team_of: Dict[str, str], team_colors: Dict[str, str]) -> str:
-    """Renders the player name with the determined color."""
-    color = get_player_color(player, team_of, team_colors)
-    safe_player = player.replace("<", "&lt;").replace(">", "&gt;")
-    return f"<span style='color:{color};font-weight:600'>{safe_player}</span>"
-
 def render_entry_line(e: Optional[Entry], team_of: Dict[str, str], team_colors: Dict[str, str]) -> str:
     if e is None or e.player is None or e.character is None:
         return "<div class='name-line tbd'>TBD</div>"
     if e.character.upper() == "BYE":
         return "<div class='name-line tbd'>BYE</div>"
-
-    icon = get_character_icon_path(e.character)
-    name_html = render_name_html(e.player, team_of, team_colors)
-    char_safe = e.character.replace("<", "&lt;").replace(">", "&gt;")
-    
-    icon_html = "🎮" # Placeholder for icon
-    
-    if icon:
-        return f"<div class='name-line'><img src='file://{icon}' width='24'/> <b>{char_safe}</b> ({name_html})</div>"
-    else:
-        return f"<div class='name-line'>{icon_html} <b>{char_safe}</b> ({name_html})</div>"
+    return entry_line_html(e.character, e.player, get_player_color(e.player, team_of, team_colors))
 
 def entry_to_label(e: Optional[Entry]) -> str:
     if e is None: return ""
     return f"{e.player} — {e.character}"
 
 # ---------------------------- Balanced generator (Regular core) ----------------------------
-def pick_from_lowest_tally(cands: List[Entry], tally: Dict[str, int], exclude_player: Optional[str] = None) -> Optional[Entry]:
-    pool = [e for e in cands if e.player != exclude_player]
-    if not pool:
-        return None
-    m = min(tally.get(e.player, 0) for e in pool)
-    lowest = [e for e in pool if tally.get(e.player, 0) == m]
-    return random.choice(lowest)
-
-def generate_bracket_balanced(
-    entries: List[Entry],
-    *,
-    forbid_same_team: bool = False,
-    team_of: Optional[Dict[str, str]] = None
-) -> List[Tuple[Entry, Entry]]:
+def generate_bracket_regular(entries: List[Entry], rng: Optional[random.Random] = None) -> List[Tuple[Entry, Entry]]:
+    return generate_bracket_balanced(entries, rng=rng)
+
+def generate_bracket_teams(entries: List[Entry], team_of: Dict[str, str], rng: Optional[random.Random] = None) -> List[Tuple[Entry, Entry]]:
+    return generate_bracket_balanced(entries, forbid_same_team=True, team_of=team_of, rng=rng)
+
+# ---------------------------- Result-entry paging ----------------------------
+FILTER_MODES = ["All", "Pending only", "By round", "By player"]
+PAGE_SIZES = [24, 48, 96, 500, 2000]
+
+@timed()
+def visible_matches(key: str, items: List, *, round_of: Callable, players_of: Callable, is_pending: Callable,
+                    round_name: Callable[[int], str] = lambda r: f"Round {r + 1}") -> List:
     """
-    Balanced-random pairing:
-      - no self-match,
-      - optional: forbid same-team,
-      - fills BYEs to next power of two,
-      - uses per-player tallies for fairness.
+    Filter + page controls for a long list of matches; returns only the slice to render.
+    Everything off-screen keeps its result in session state, untouched.
     """
-    team_of = team_of or {}
-    base = [e for e in entries if e.player != "SYSTEM"]
-    need = byes_needed(len(base))
-
-    bag = base.copy()
-    random.shuffle(bag)
-    tally: Dict[str, int] = {}
-    pairs: List[Tuple[Entry, Entry]] = []
-
-    # Use some BYEs first if needed
-    for _ in range(need):
-        if not bag: break
-        a = pick_from_lowest_tally(bag, tally)
-        if not a: break
-        bag.remove(a)
-        pairs.append((a, Entry("SYSTEM", "BYE")))
-        tally[a.player] = tally.get(a.player, 0) + 1
-
-    def pick_opponent(a: Entry, pool: List[Entry]) -> Optional[Entry]:
-        pool2 = [x for x in pool if x.player != a.player]
-        if forbid_same_team:
-            ta = team_of.get(a.player, "")
-            if ta:
-                pool2 = [x for x in pool2 if team_of.get(x.player, "") != ta]
-        if not pool2:
-            return None
-        m = min(tally.get(x.player, 0) for x in pool2)
-        lowest = [x for x in pool2 if tally.get(x.player, 0) == m]
-        return random.choice(lowest)
-
-    while len(bag) >= 2:
-        a = pick_from_lowest_tally(bag, tally)
-        if not a: break
-        bag.remove(a)
-        b = pick_opponent(a, bag)
-        
-        if b is None:
-            if byes_needed(len(bag)+1) > 0 and bag: 
-                pairs.append((a, Entry("SYSTEM", "BYE")))
-                tally[a.player] = tally.get(a.player, 0) + 1
-            else:
-                bag.append(a)
-                random.shuffle(bag)
-                if len(bag) == 1:
-                    break
-            continue
-            
-        bag.remove(b)
-        pairs.append((a, b))
-        tally[a.player] = tally.get(a.player, 0) + 1
-        tally[b.player] = tally.get(b.player, 0) + 1
+    c_mode, c_pick, c_size, c_page = st.columns([2, 2, 1, 1])
+    with c_mode:
+        mode = st.selectbox("Show", FILTER_MODES, key=f"{key}_mode")
+    with c_pick:
+        if mode == "By round":
+            rounds = sorted({round_of(m) for m in items})
+            if rounds:
+                r = st.selectbox("Round", rounds, format_func=round_name, key=f"{key}_round")
+                items = [m for m in items if round_of(m) == r]
+        elif mode == "By player":
+            names = sorted({p for m in items for p in players_of(m)})
+            if names:
+                p = st.selectbox("Player", names, key=f"{key}_player")
+                items = [m for m in items if p in players_of(m)]
+        elif mode == "Pending only":
+            items = [m for m in items if is_pending(m)]
+    with c_size:
+        size = st.selectbox("Per page", PAGE_SIZES, key=f"{key}_size")
+    pages = max(1, math.ceil(len(items) / size))
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = 1
+    with c_page:
+        page = st.number_input("Page", min_value=1, max_value=pages, step=1, key=f"{key}_page")
+
+    start = (int(page) - 1) * size
+    shown = items[start:start + size]
+    count_elements("selectbox", 3 if mode in ("By round", "By player") else 2, widget=True)
+    count_elements("number_input", widget=True)
+    count_elements("caption")
+    if items:
+        st.caption(f"Showing {start + 1}–{start + len(shown)} of {len(items)} matches")
+    else:
+        st.caption("No matches for this filter.")
+    return shown
+
+# ---------------------------- Persistence ----------------------------
+@st.cache_resource
+def results_history() -> ResultHistory:
+    """Results from every event, and the ratings built on them, for the whole server process."""
+    return ResultHistory()
+
+@st.cache_resource
+def tournament_store(name: str) -> TournamentStore:
+    """One store per event name for the whole server process; its results also go to the shared history."""
+    store = TournamentStore(name)
+    results_history().watch(store)
+    return store
+
+def current_store() -> TournamentStore:
+    return tournament_store(str(st.session_state.get("event_name", "default")).strip() or "default")
+
+def apply_event(event: Dict, expected_version: Optional[int] = None) -> int:
+    """
+    store.apply for this session's own writes. When nothing else was written
+    since this run synced, `synced_version` moves past the write, so
+    live_updates does not rerun (and wipe this run's messages) for it.
+    """
+    version = current_store().apply(event, expected_version)
+    if version and st.session_state.get("synced_version") == version - 1:
+        st.session_state["synced_version"] = version
+    return version
 
-    if bag: # odd leftover
-        pairs.append((bag[0], Entry("SYSTEM", "BYE")))
-        
-    return pairs
-
-def generate_bracket_regular(entries: List[Entry]) -> List[Tuple[Entry, Entry]]:
-    return generate_bracket_balanced(entries)
-
-def generate_bracket_teams(entries: List[Entry], team_of: Dict[str, str]) -> List[Tuple[Entry, Entry]]:
-    return generate_bracket_balanced(entries, forbid_same_team=True, team_of=team_of)
-
-# ---------------------------- Rounds building & rendering (Modified for R1 only) ----------------------------
-def compute_rounds_pairs(r1_pairs: List[Tuple[Entry, Entry]], winners_map: Dict[int, str]) -> List[List[Tuple[Optional[Entry], Optional[Entry]]]]:
-    # This function is retained, but the rendering will only use rounds[0]
-    rounds: List[List[Tuple[Optional[Entry], Optional[Entry]]]] = []
-    rounds.append([(a, b) for (a, b) in r1_pairs])
-
-    total_real = sum(1 for (a, b) in r1_pairs for e in (a, b) if e and e.player != "SYSTEM")
-    target = next_power_of_two(total_real)
-    num_rounds = int(math.log2(target)) if target >= 2 else 1
-
-    prev = rounds[0]
-
-    def winner_of_pair(pair_index: int, pairs_list: List[Tuple[Optional[Entry], Optional[Entry]]]) -> Optional[Entry]:
-        if pair_index >= len(pairs_list): return None
-        a, b = pairs_list[pair_index]
-        if a is None and b is None: return None
-        if a is None: return b if (b and b.character.upper() != "BYE") else None
-        if b is None: return a if (a and a.character.upper() != "BYE") else None
-        if a.character.upper() == "BYE" and b.character.upper() != "BYE": return b
-        if b.character.upper() == "BYE" and a.character.upper() != "BYE": return a
-
-        # Only R1 has explicit selections
-        label_a, label_b = entry_to_label(a), entry_to_label(b)
-        sel = winners_map.get(pair_index + 1, "")
-        if sel == label_a: return a
-        if sel == label_b: return b
-        return None
+def result_version(container, key: Tuple) -> int:
+    """Shared version of one match result (0 when `container` is not the saved bracket/round robin)."""
+    t = current_store().tournament
+    return t.match_version(key) if container is not None and container in (t.bracket, t.standings) else 0
 
-    # This loop calculates all future rounds, but only R1 winners are used/displayed
-    for _ in range(1, num_rounds):
-        nxt: List[Tuple[Optional[Entry], Optional[Entry]]] = []
-        for i in range(0, len(prev), 2):
-            w1 = winner_of_pair(i, prev)
-            w2 = winner_of_pair(i + 1, prev)
-            nxt.append((w1, w2))
-        rounds.append(nxt)
-        prev = nxt
-    return rounds
-
-def render_bracket_grid(all_rounds: List[List[Tuple[Optional[Entry], Optional[Entry]]]], team_of: Dict[str, str], team_colors: Dict[str, str]):
-    # RENDER ONLY ROUND 1 (as requested)
-    if not all_rounds: return
-
-    # Ensure we only process the first round list
-    round_pairs = all_rounds[0]
-    
-    # Team Legend
+def _stale_notice(err: StaleResultError):
+    st.session_state["sync_notice"] = "Another reporter changed that result first; showing theirs. Pick again to override."
+
+def set_bracket_result(state: BracketState, r: int, i: int, winner: int, seen: Optional[int] = None):
+    """
+    Records a bracket result, through the store (so it is saved and shared) when
+    `state` is the saved bracket. `seen` is the match version the reporter was
+    looking at; if someone else changed it since, nothing is written.
+    """
+    store = current_store()
+    if store.tournament.bracket is state:
+        try:
+            apply_event({"type": "bracket_result", "round": r, "match": i, "winner": winner}, expected_version=seen)
+        except StaleResultError as err:
+            _stale_notice(err)
+    else:
+        state.record(r, i, winner)
+
+def set_rr_result(standings: Standings, match: MatchKey, winner: Optional[str], seen: Optional[int] = None) -> bool:
+    """Like set_bracket_result; returns False if another reporter changed the match since `seen`."""
+    store = current_store()
+    if store.tournament.standings is standings:
+        try:
+            apply_event({"type": "rr_result", "match": list(match), "winner": winner}, expected_version=seen)
+        except StaleResultError as err:
+            _stale_notice(err)
+            return False
+    else:
+        standings.set_result(match, winner)
+    return True
+
+def _bind_round_robin(standings: Standings, sync_sidebar: bool = True):
+    players = tuple(standings.players)
+    matchups, match_rounds = circle_schedule(players)
+    st.session_state["rr_schedule"] = {
+        "players": tuple(sorted(players)),
+        "matches": list(matchups),
+        "rounds": list(match_rounds),
+        "byes": list(bye_schedule(players)),
+    }
+    st.session_state["rr_standings"] = standings
+    if sync_sidebar:  # Only before the players text area is drawn
+        st.session_state["players_multiline"] = "\n".join(players)
+
+@timed()
+def sync_session(store: TournamentStore):
+    """
+    Every run, before the players text area is drawn: points this session at the
+    store's current bracket and round robin, which another session may have
+    replaced or cleared. The first run for an event also restores the entry table.
+    """
+    t = store.tournament
+    st.session_state["synced_version"] = t.version  # This run renders everything up to here
+    if st.session_state.get("restored_event") != store.name:
+        st.session_state["restored_event"] = store.name
+        for k in ("last_bracket", "bracket_state", "de_graph", "de_results", "swiss_state", "rr_schedule", "rr_standings"):
+            st.session_state.pop(k, None)
+        reset_station_clock("bracket", "de", "rr")
+        st.session_state.pop("saved_entries", None)  # The restored (or current) table is the new baseline
+        if t.entries:
+            st.session_state.table_df = pd.DataFrame(t.entries, columns=["Player", "Character"])
+            if t.standings is None:
+                st.session_state["players_multiline"] = "\n".join(dict.fromkeys(p for p, _ in t.entries))
+
+    if t.bracket is not None and st.session_state.get("bracket_state") is not t.bracket:
+        st.session_state["bracket_state"] = t.bracket
+        st.session_state["last_bracket"] = t.bracket.packed
+        st.session_state["last_format"] = "single"
+        st.session_state["last_rule"] = t.bracket_meta.get("rule") or "regular"
+        st.session_state["last_team_of"] = t.bracket_meta.get("team_of") or {}
+        st.session_state["last_team_colors"] = t.bracket_meta.get("team_colors") or {}
+    elif t.bracket is None and "bracket_state" in st.session_state:
+        st.session_state.pop("bracket_state")
+        st.session_state.pop("last_bracket", None)
+
+    if t.standings is not None and st.session_state.get("rr_standings") is not t.standings:
+        _bind_round_robin(t.standings)
+    elif t.standings is None and "rr_standings" in st.session_state:
+        st.session_state.pop("rr_standings")
+        st.session_state.pop("rr_schedule", None)
+
+@st.fragment(run_every=3)
+def live_updates(store: TournamentStore):
+    """Polls the shared version; reruns the page only when other sessions changed results or brackets."""
+    version, changed = store.tournament.changes_since(st.session_state.get("synced_version", 0))
+    if any(k[0] != "entries" for k in changed):
+        st.rerun()
+    st.caption(f"Live · version {version}")
+
+# ---------------------------- Import / export ----------------------------
+def _import_file():
+    """on_change callback for the uploader: runs before any widget it sets is drawn."""
+    upload = st.session_state.get("import_file")
+    if upload is None:
+        return
+    try:
+        result = import_table(upload, detect_format(upload.name))
+    except (ValueError, ImportError) as e:
+        st.session_state["import_notice"] = ("error", f"Couldn't import {upload.name}: {e}")
+        return
+    st.session_state.table_df = result.entries
+    if result.players:
+        st.session_state["players_multiline"] = "\n".join(result.players)
+    if result.team_of:
+        st.session_state["rule_select"] = "teams"
+        st.session_state["team_names_input_key"] = ", ".join(dict.fromkeys(result.team_of.values()))
+        for p, t in result.team_of.items():
+            st.session_state[f"team_{p}"] = t
+    for k in ("last_bracket", "bracket_state", "de_graph", "de_results", "swiss_state"):
+        st.session_state.pop(k, None)
+    st.session_state["import_notice"] = ("success", f"Imported {len(result.entries)} entries, {len(result.players)} players "
+                                                    f"and {len(result.team_of)} team assignments from {result.rows_read} rows.")
+
+def export_controls(key: str, title: str, make_rows: Callable[[], Iterable[Dict]]):
+    """Format picker + download button; the file is only built when the button is clicked."""
+    c_fmt, c_btn = st.columns([1, 3])
+    with c_fmt:
+        fmt = st.selectbox(f"{title.capitalize()} format", FORMATS, key=f"{key}_fmt", label_visibility="collapsed")
+    with c_btn:
+        st.download_button(
+            f"⬇️ Export {title}",
+            data=lambda: export_bytes(make_rows(), fmt),
+            file_name=f"{key}.{EXTENSIONS[fmt]}",
+            mime=MIME_TYPES[fmt],
+            key=f"{key}_download",
+            on_click="ignore",
+        )
+
+# ---------------------------- Simulation ----------------------------
+SIM_RUNS = [1_000, 10_000, 100_000, 250_000]
+
+def simulation_panel(key: str, models: List[str], run: Callable[[str, int], SimulationResult]):
+    """Model + run-count picker; the last result stays on screen until the next run."""
+    with st.expander("🎲 Simulate outcomes"):
+        c_model, c_runs = st.columns(2)
+        model = c_model.radio("Win probabilities", models, key=f"{key}_sim_model", horizontal=True)
+        runs = c_runs.select_slider("Simulated tournaments", SIM_RUNS, value=100_000, key=f"{key}_sim_runs")
+        if st.button("Run simulation", key=f"{key}_sim_go"):
+            t0 = time.perf_counter()
+            result = run(model, runs)
+            st.session_state[f"{key}_sim"] = (result.table(), model, runs, time.perf_counter() - t0)
+        if f"{key}_sim" in st.session_state:
+            df, model, runs, secs = st.session_state[f"{key}_sim"]
+            st.caption(f"{runs:,} simulated tournaments · {model} · {secs:.2f}s (results entered since then are not included)")
+            stages = [c for c in df.columns if c not in ("Entry", "Exp. Wins")]
+            st.dataframe(df, use_container_width=True, column_config={
+                c: st.column_config.ProgressColumn(c, format="%.3f", min_value=0, max_value=1) for c in stages
+            })
+
+def _simulate_bracket(state: BracketState, model: str, runs: int) -> SimulationResult:
+    pk = state.packed
+    players = [pk.players[p] for p in pk.entry_player]
+    characters = [pk.characters[c] for c in pk.entry_character]
+    results = bracket_history(state) if model != "Tiers" else None
+    strength = entry_strengths(players, characters, tiers=model != "Results so far", results=results)
+    return simulate_bracket(state, strength, runs, seed=get_seed())
+
+def _simulate_round_robin(standings: Standings, schedule: List[Tuple[str, str]], model: str, runs: int) -> SimulationResult:
+    characters_of: Dict[str, List[str]] = {}
+    table = st.session_state.get("table_df")
+    if table is not None:
+        for e in df_to_entries(table):
+            characters_of.setdefault(e.player, []).append(e.character)
+    results = round_robin_history(standings.results) if model != "Tiers" else None
+    strength = player_strengths(standings.players, characters_of, tiers=model != "Results so far", results=results)
+    return simulate_round_robin(standings.players, schedule, strength, standings.results, runs, seed=get_seed())
+
+
+# ---------------------------- Stations ----------------------------
+def _clock(origin: Optional[float], minutes: float) -> str:
+    """"+MM min" before the clock starts, else the wall-clock time."""
+    if origin is None:
+        return f"+{minutes:.0f} min"
+    return time.strftime("%H:%M", time.localtime(origin + minutes * 60))
+
+def reset_station_clock(*keys: str):
+    """Drops the clock, finish times and previous plan of each panel (e.g. for a new bracket)."""
+    for key in keys:
+        for k in (f"{key}_clock", f"{key}_finished", f"{key}_plan"):
+            st.session_state.pop(k, None)
+
+@timed()
+def station_panel(key: str, matches: List[StationMatch]):
+    """
+    Setups x time plan for the unfinished matches. Once the clock runs, each
+    result is stamped when this session first sees it, and every rerun
+    replans from the previous plan, so late results push back what follows.
+    """
+    with st.expander("🕹️ Setups & timing"):
+        c_setups, c_minutes, c_clock = st.columns(3)
+        setups = c_setups.number_input("Setups", min_value=1, max_value=500, value=4, step=1, key=f"{key}_setups")
+        minutes = c_minutes.number_input("Minutes per match", min_value=1, max_value=240, value=8, step=1, key=f"{key}_minutes")
+        origin = st.session_state.get(f"{key}_clock")
+        if origin is None:
+            if c_clock.button("▶️ Start clock", key=f"{key}_clock_start", help="Stamps results as they come in and replans around late ones."):
+                st.session_state[f"{key}_clock"] = origin = time.time()
+        elif c_clock.button("⏹️ Reset clock", key=f"{key}_clock_reset"):
+            reset_station_clock(key)
+            origin = None
+        if not matches:
+            st.caption("No matches to place.")
+            return
+        now = (time.time() - origin) / 60 if origin is not None else 0.0
+        finished: Dict = st.session_state.setdefault(f"{key}_finished", {})
+        if origin is not None:
+            for m in matches:
+                if m.done:
+                    finished.setdefault(m.key, now)
+        done = {m.key for m in matches if m.done}
+        finished = {k: t for k, t in finished.items() if k in done}  # A cleared result is unfinished again
+        st.session_state[f"{key}_finished"] = finished
+        try:
+            scheduler = StationScheduler(matches, float(minutes))
+            previous = st.session_state.get(f"{key}_plan")
+            if origin is not None and previous is not None:
+                plan = scheduler.replan(previous, now, finished, stations=int(setups))
+            else:
+                plan = scheduler.plan(int(setups), now=now, finished=finished)
+        except ValueError as err:
+            st.error(f"Could not schedule: {err}")
+            return
+        if origin is not None:
+            st.session_state[f"{key}_plan"] = plan
+        labels = {m.key: m.label for m in matches}
+        left = [s for s in plan.slots if s.status != "done"]
+        st.caption(f"{len(left)} matches left on {setups} setups · last one ends {_clock(origin, plan.makespan)} "
+                   f"(no plan can end before {_clock(origin, plan.lower_bound)})")
+        st.dataframe(pd.DataFrame([{
+            "Start": _clock(origin, s.start), "End": _clock(origin, s.end), "Setup": s.station + 1,
+            "Match": labels.get(s.key, ""), "Status": s.status,
+        } for s in left]), hide_index=True, use_container_width=True)
+
+
+# ---------------------------- Rounds rendering ----------------------------
+@timed()
+def render_bracket_html(state: BracketState, team_of: Dict[str, str], team_colors: Dict[str, str]) -> str:
+    """The whole multi-round bracket as one HTML string."""
+    lines: Dict[Optional[Entry], str] = {}
+
+    def line(e: Optional[Entry]) -> str:
+        if e not in lines:
+            lines[e] = render_entry_line(e, team_of, team_colors)
+        return lines[e]
+
+    parts = ["<div class='bracket'>"]
+    for r in range(state.num_rounds):
+        parts.append(f"<div class='bracket-round'><div class='round-title'>{round_title(r, state.num_rounds)}</div>")
+        for a, b in state.round_pairs(r):
+            parts.append(f"<div class='match-box'>{line(a)}{line(b)}</div>")
+        parts.append("</div>")
+    parts.append("</div>")
+    return "".join(parts)
+
+@timed()
+def render_bracket_grid(state: BracketState, team_of: Dict[str, str], team_colors: Dict[str, str]):
+    """Renders every round side by side in a single markdown call; later rounds fill in as results are recorded."""
+    legend_html = ""
     if team_colors and any(team_of.values()) and st.session_state.get("rule_select") == "teams":
-        legend = "  ".join([f"<span class='legend-badge' style='background:{c}'></span>{t}" for t, c in team_colors.items()])
-        st.markdown(f"<div class='small'><b>Legend (Teams):</b> {legend}</div>", unsafe_allow_html=True)
-    
-    # Use st.columns(1) to make a single column display for R1
-    col = st.columns(1)[0]
-    
-    with col:
-        st.markdown("<div class='round-title'>Round 1 Pairings</div>", unsafe_allow_html=True)
-        
-        for pair in round_pairs:
-            a, b = pair
-            
-            st.markdown("<div class='match-box'>", unsafe_allow_html=True)
-            st.markdown(render_entry_line(a, team_of, team_colors), unsafe_allow_html=True)
-            st.markdown(render_entry_line(b, team_of, team_colors), unsafe_allow_html=True)
-            st.markdown("</div>", unsafe_allow_html=True)
-
-def r1_winner_controls(r1_pairs: List[Tuple[Entry, Entry]]):
-    if "r1_winners" not in st.session_state:
-        st.session_state.r1_winners = {}
-    st.write("### ➡️ Select Round 1 Winners")
-    
-    cols = st.columns(min(3, len(r1_pairs)))
-    col_idx = 0
-    
-    for i, (a, b) in enumerate(r1_pairs, start=1):
-        # Skip BYE matches in manual selection
-        if a.character.upper() == "BYE" or b.character.upper() == "BYE":
-            continue
-            
-        with cols[col_idx % len(cols)]:
-            label_a = entry_to_label(a)
-            label_b = entry_to_label(b)
-            prev = st.session_state.r1_winners.get(i, "")
-            
-            if prev == label_a: idx = 0
-            elif prev == label_b: idx = 1
-            else: idx = 2
-            
-            st.radio(
-                f"Match {i}",
-                options=[label_a, label_b, "(undecided)"],
-                index=idx,
-                key=f"winner_{i}",
-                horizontal=False,
-            )
-            choice = st.session_state[f"winner_{i}"]
-            st.session_state.r1_winners[i] = choice if choice != "(undecided)" else ""
-            
-        col_idx += 1
-
-# ---------------------------- Table helpers ----------------------------
-def build_entries_df(players: List[str], k: int) -> pd.DataFrame:
-    rows = []
-    for _ in range(k):
-        for p in players:
-            rows.append({"Player": p, "Character": ""})
-    return pd.DataFrame(rows)
-
-def auto_fill_characters(df: pd.DataFrame, players: List[str], k: int, shuffle_each: bool) -> pd.DataFrame:
-    out = df.copy()
-    for p in players:
-        idxs = list(out.index[out["Player"] == p])
-        labels = [random.choice(SMASH_CHARACTERS) for _ in range(len(idxs))] # Auto-fill with actual characters
-        if shuffle_each:
-            random.shuffle(labels)
-        for row_i, label in zip(idxs, labels):
-            out.at[row_i, "Character"] = label
-    return out
-
-def df_to_entries(df: pd.DataFrame, clean_rows_flag: bool) -> List[Entry]:
-    entries: List[Entry] = []
-    for _, row in df.iterrows():
-        pl = str(row.get("Player", "")).strip()
-        ch = str(row.get("Character", "")).strip()
-        if clean_rows_flag and (not pl or not ch):
+        legend = "  ".join([f"<span class='legend-badge' style='background:{c}'></span>{t}" for t, c in team_colors.items()])
+        legend_html = f"<div class='small'><b>Legend (Teams):</b> {legend}</div>"
+
+    st.markdown(legend_html + render_bracket_html(state, team_of, team_colors), unsafe_allow_html=True)
+    count_elements("markdown")
+
+    champ = state.champion()
+    if champ is not None:
+        st.success(f"🏆 Champion: {entry_to_label(champ)}")
+
+def _record_winner(state: BracketState, r: int, i: int, key: str, seen: int):
+    """on_change callback: only the clicked match and its path to the final are updated."""
+    set_bracket_result(state, r, i, st.session_state[key], seen)
+
+@timed()
+def bracket_winner_controls(state: BracketState):
+    st.write("### ➡️ Select Winners")
+
+    playable = [(r, i) for r in range(state.num_rounds) for i in range(state.round_size(r)) if state.is_playable(r, i)]
+    visible = visible_matches(
+        "bracket_view", playable,
+        round_of=lambda m: m[0],
+        players_of=lambda m: tuple(state.entry(x).player for x in state.sides(*m)),
+        is_pending=lambda m: state.winner_id(*m) == TBD_ID,
+        round_name=lambda r: round_title(r, state.num_rounds),
+    )
+
+    rounds = sorted({m[0] for m in visible})
+    count_elements("markdown", 1 + len(rounds))
+    count_elements("radio", len(visible), widget=True)
+    for r in rounds:
+        in_round = [i for rr, i in visible if rr == r]
+        st.markdown(f"**{round_title(r, state.num_rounds)}**")
+        cols = st.columns(min(3, len(in_round)))
+
+        for col_idx, i in enumerate(in_round):
+            a, b = state.sides(r, i)
+            w = state.winner_id(r, i)
+            idx = 0 if w == a else 1 if w == b else 2
+            # The key names the entrants and the result's version, so a changed
+            # upstream result or another reporter's update gives a fresh widget
+            seen = result_version(state, ("bracket", r, i))
+            key = f"winner_{r}_{i}_{a}_{b}_v{seen}"
+            with cols[col_idx % len(cols)]:
+                # Entry ids, not labels: two identical entries can meet and still be told apart
+                st.radio(
+                    f"Match {i + 1}",
+                    options=[a, b, TBD_ID],
+                    format_func=lambda x: state.label(x) or "(undecided)",
+                    index=idx,
+                    key=key,
+                    horizontal=False,
+                    on_change=_record_winner,
+                    args=(state, r, i, key, seen),
+                )
+
+# ---------------------------- Double elimination & Swiss rendering ----------------------------
+BRACKET_NAMES = {"W": "Winners", "L": "Losers", "GF": "Grand Final"}
+
+def _store_result(results: dict, result_key, widget_key: str, values: dict):
+    """on_change callback: writes (or clears) one result before the rerun renders anything."""
+    value = values.get(st.session_state[widget_key])
+    if value is None:
+        results.pop(result_key, None)
+    else:
+        results[result_key] = value
+
+def _result_radio(label: str, a: Entry, b: Entry, values: tuple, results: dict, result_key, key: str):
+    """Radio for one match; `values` are what gets stored in `results` for a win by a or by b."""
+    options = [entry_to_label(a), entry_to_label(b), "(undecided)"]
+    current = results.get(result_key)
+    idx = 0 if current == values[0] else 1 if current == values[1] else 2
+    st.radio(label, options=options, index=idx, key=key, on_change=_store_result,
+             args=(results, result_key, key, {options[0]: values[0], options[1]: values[1]}))
+    count_elements("radio", widget=True)
+
+@timed()
+def render_graph_bracket(matches: List[GraphMatch], results: Dict[int, Entry], team_of: Dict[str, str], team_colors: Dict[str, str]):
+    sides = resolve_graph(matches, results)
+    for bracket in ("W", "L", "GF"):
+        in_bracket = [m for m in matches if m.bracket == bracket]
+        if not in_bracket:
             continue
-        if pl and ch and ch in SMASH_CHARACTERS: # Validate character is in our list
-            entries.append(Entry(player=pl, character=ch))
-        elif pl and ch:
-             entries.append(Entry(player=pl, character=ch)) # Allow non-Smash characters for flexibility
-    return entries
+        st.markdown(f"#### {BRACKET_NAMES[bracket]}")
+        num_rounds = max(m.round for m in in_bracket)
+        count_elements("markdown", 1 + (num_rounds if bracket != "GF" else 0))
+        count_elements("caption", len(in_bracket))
+        for r, col in enumerate(st.columns(num_rounds), start=1):
+            with col:
+                if bracket != "GF":
+                    st.markdown(f"<div class='round-title'>Round {r}</div>", unsafe_allow_html=True)
+                for m in in_bracket:
+                    if m.round != r:
+                        continue
+                    a, b = sides[m.mid]
+                    st.caption(f"M{m.mid}: {m.a.describe()} vs {m.b.describe()}")
+                    if a is not None and b is not None and BYE not in (a, b):
+                        _result_radio(f"M{m.mid}", a, b, (a, b), results, m.mid,
+                                      key=f"de_{m.mid}_{entry_to_label(a)}_{entry_to_label(b)}")
+                    else:
+                        st.markdown(render_entry_line(a, team_of, team_colors), unsafe_allow_html=True)
+                        st.markdown(render_entry_line(b, team_of, team_colors), unsafe_allow_html=True)
+                        count_elements("markdown", 2)
+
+    champ = results.get(matches[-1].mid)
+    if champ is not None and champ in sides[matches[-1].mid]:
+        st.success(f"🏆 Champion: {entry_to_label(champ)}")
+
+@timed()
+def show_swiss_section(swiss: SwissState, team_of: Dict[str, str], team_colors: Dict[str, str]):
+    r = len(swiss.rounds) - 1
+    rnd = swiss.rounds[r]
+    st.markdown(f"#### Round {r + 1}")
+    if rnd.bye is not None:
+        st.caption(f"BYE: {entry_to_label(swiss.entries[rnd.bye])}")
+    if rnd.rematches or rnd.unpaired:
+        st.warning(f"{rnd.rematches} unavoidable rematch(es); {len(rnd.unpaired)} entr(ies) with no legal opponent sit out.")
+
+    cols = st.columns(3)
+    for i, (a, b) in enumerate(rnd.pairs):
+        ea, eb = swiss.entries[a], swiss.entries[b]
+        with cols[i % len(cols)]:
+            _result_radio(f"Match {i + 1}", ea, eb, (a, b), swiss.results, (r, i), key=f"swiss_{r}_{i}_{a}_{b}")
+
+    if st.button("➡️ Pair next Swiss round", disabled=not swiss.round_complete()):
+        rule_forbid = st.session_state.get("last_rule") == "teams"
+        swiss.rounds.append(swiss_pairings(swiss.entries, swiss.scores(), swiss.played(), had_bye=swiss.byes(),
+                                           forbid_same_team=rule_forbid, team_of=team_of, rng=make_rng(get_seed())))
+        st.rerun()
+
+    scores = swiss.scores()
+    standings = pd.DataFrame({"Entry": [entry_to_label(e) for e in swiss.entries], "Points": scores})
+    standings.sort_values(by=["Points", "Entry"], ascending=[False, True], inplace=True)
+    standings.index = range(1, len(standings) + 1)
+    st.dataframe(standings, use_container_width=True)
 
 # ---------------------------- Character Data Retrieval ----------------------------
 
-def get_char_data(char_name: str) -> Dict[str, str | float]:
-    """Retrieves actual character stats from the SMASH_DATA dictionary."""
-    data = SMASH_DATA.get(char_name, None)
-    
-    if data:
-        # Reformat keys for display purposes
-        return {
-            "Tier Rank": data.get("Tier Rank (S-F)", "N/A"),
-            "Weight": data.get("Weight", "N/A"),
-            "Run Speed": data.get("Run Speed", "N/A"),
-            "Air Speed": data.get("Air Speed", "N/A"),
-            "Fall Speed": data.get("Fall Speed", "N/A"),
-        }
-    else:
-        # Fallback for characters not found in the data source
-        return {
-            "Tier Rank": "Unknown",
-            "Weight": "Unknown",
-            "Run Speed": "Unknown",
-            "Air Speed": "Unknown",
-            "Fall Speed": "Unknown",
-        }
-        
 def render_stat_meter(label: str, value, max_val: float, color: str):
     """Renders a labeled progress bar for a quantitative stat."""
     if isinstance(value, (int, float)):
@@ -534,95 +717,49 @@ def render_stat_meter(label: str, value, max_val: float, color: str):
 
 # ---------------------------- Round Robin Logic ----------------------------
 
-def generate_round_robin_schedule(players: List[str]) -> List[Tuple[str, str]]:
-    """Generates a list of all unique match-ups (Player A vs Player B)."""
-    matches = []
-    # If odd number of players, add a 'BYE' placeholder
-    current_players = players.copy()
-    if len(current_players) % 2 != 0:
-        current_players = current_players + ['BYE']
-    
-    n = len(current_players)
-    rounds = n - 1 # Total rounds to be played
-    
-    # Check if schedule exists in state and is valid for current players
-    schedule_key = tuple(sorted(players))
-    if "rr_schedule" not in st.session_state or st.session_state["rr_schedule"].get("players") != schedule_key:
-        
-        # Implementation of the circle method for scheduling
-        matchups = []
-        p = current_players.copy()
-        
-        for _ in range(rounds):
-            half = n // 2
-            for i in range(half):
-                p1 = p[i]
-                p2 = p[n - 1 - i]
-                # Only add matches between actual players (skip BYE vs Player)
-                if p1 != 'BYE' and p2 != 'BYE':
-                    matchups.append((p1, p2))
-                elif p1 != 'BYE':
-                    # p1 gets the bye
-                    pass
-                elif p2 != 'BYE':
-                    # p2 gets the bye
-                    pass
-
-            # Rotate all players except the first (or last, depending on implementation)
-            p.insert(1, p.pop())
-            
-        # Store and initialize results/records
-        st.session_state["rr_schedule"] = {
-            "players": schedule_key,
-            "matches": matchups,
-        }
-        st.session_state["rr_results"] = {}
-        st.session_state["rr_records"] = {player: {"Wins": 0, "Losses": 0} for player in players if player != 'BYE'}
-        
-    return st.session_state["rr_schedule"]["matches"]
+def start_round_robin(players: List[str]):
+    """Replaces the shared round robin (and every reported result) with a fresh one for `players`."""
+    apply_event({"type": "rr_schedule", "players": list(players)})
+    _bind_round_robin(current_store().tournament.standings, sync_sidebar=False)
 
-def update_round_robin_records():
-    """Recalculates records based on rr_results."""
-    records = {player: {"Wins": 0, "Losses": 0} for player in st.session_state["rr_records"].keys()}
-    
-    for match_id, winner in st.session_state.rr_results.items():
-        if winner == "(Undecided)":
-            continue
-            
-        # Match ID format: Player A|Player B
-        p1, p2 = match_id.split('|')
-        loser = p2 if winner == p1 else p1
-        
-        if winner in records:
-            records[winner]["Wins"] += 1
-        if loser in records:
-            records[loser]["Losses"] += 1
-            
-    # Update session state with new records
-    st.session_state.rr_records = records
-
-def show_round_robin_page(players: List[str]):
-    st.title("🗂️ Round Robin Scheduler & Leaderboard")
-    st.markdown("---")
-    
-    if len(players) < 2:
-        st.error("Please enter at least two players in the sidebar to generate a Round Robin tournament.")
-        return
+def generate_round_robin_schedule(players: List[str]) -> Optional[List[Tuple[str, str]]]:
+    """
+    Match-ups of the saved round robin, or None before one is started. The
+    sidebar list never replaces it on its own: a new round robin (which
+    resets the standings for every session) needs the button here, and a
+    confirmation once results are in.
+    """
+    standings = current_store().tournament.standings
+    if standings is None:
+        st.info(f"No round robin yet for this event. Start one for the {len(players)} players in the sidebar.")
+        if not st.button("▶️ Start round robin", key="rr_start", type="primary"):
+            return None
+        start_round_robin(players)
+    elif st.session_state["rr_schedule"]["players"] != tuple(sorted(players)):
+        st.warning(f"The saved round robin is for {', '.join(standings.players)}. It stays in use until you "
+                   f"start a new one for the players in the sidebar.")
+        reported = len(standings.results)
+        confirmed = reported == 0 or st.checkbox(f"Discard the {reported} reported result(s) for everyone", key="rr_restart_confirm")
+        if st.button("🔁 Start a new round robin", key="rr_restart", disabled=not confirmed):
+            start_round_robin(players)
+    return st.session_state["rr_schedule"]["matches"]
 
-    # 1. Generate/Get Schedule
-    schedule = generate_round_robin_schedule(players)
+def _record_rr_result(standings: Standings, match: MatchKey, key: str, seen: int):
+    """on_change callback: only the two players in `match` are touched."""
+    choice = st.session_state[key]
+    set_rr_result(standings, match, None if choice == "(Undecided)" else choice, seen)
 
-    # 2. Results & Match Input
-    st.subheader("Match Results Input")
-    st.info(f"Total Matches to Play: **{len(schedule)}**")
-    
-    # Recalculate records first
-    update_round_robin_records()
-    
+@timed()
+def rr_result_radios(schedule: List[Tuple[str, str]], visible: List[int], standings: Standings):
     cols = st.columns(3)
+    count_elements("markdown", len(visible))
+    count_elements("radio", len(visible), widget=True)
     
-    for i, (p1, p2) in enumerate(schedule, start=1):
-        match_id = f"{p1}|{p2}"
+    for m in visible:
+        p1, p2 = schedule[m]
+        i = m + 1
+        seen = result_version(standings, ("rr", p1, p2))
+        match_id = f"{p1}|{p2}_v{seen}"  # A new version (e.g. from another reporter) gives a fresh widget
         
         # --- FIX: RENDER MATCH TITLE WITH HTML USING MARKDOWN ---
         p1_color = get_player_color(p1, {}, {})
@@ -632,7 +769,7 @@ def show_round_robin_page(players: List[str]):
         p2_html = f'<span style="color:{p2_color}; font-weight: bold;">{p2}</span>'
         
         # Use existing winner or default to (Undecided)
-        default_winner = st.session_state.rr_results.get(match_id, "(Undecided)")
+        default_winner = standings.winner((p1, p2)) or "(Undecided)"
         options = [p1, p2, "(Undecided)"]
         
         # Determine the default index based on the actual winner name
@@ -646,33 +783,109 @@ def show_round_robin_page(players: List[str]):
             st.markdown(f"**Match {i}:** {p1_html} vs {p2_html}", unsafe_allow_html=True)
             
             # Use plain names for the radio options, which Streamlit handles correctly
-            winner = st.radio(
+            st.radio(
                 f"Winner (Match {i})",
                 options=options,
                 index=default_index,
                 key=f"rr_winner_{match_id}",
                 horizontal=True,
-                label_visibility="collapsed"
+                label_visibility="collapsed",
+                on_change=_record_rr_result,
+                args=(standings, (p1, p2), f"rr_winner_{match_id}", seen),
             )
-            
-            # Update results if a choice was made
-            st.session_state.rr_results[match_id] = winner
-            
+
+@timed()
+def rr_results_table(schedule: List[Tuple[str, str]], match_rounds: List[int], visible: List[int], standings: Standings):
+    """Bulk entry: the visible matches as one data_editor; only edited rows are applied."""
+    before = pd.DataFrame({
+        "Match": [m + 1 for m in visible],
+        "Round": [match_rounds[m] + 1 for m in visible],
+        "Player 1": [schedule[m][0] for m in visible],
+        "Player 2": [schedule[m][1] for m in visible],
+        "Winner": [standings.winner(schedule[m]) or "(Undecided)" for m in visible],
+    })
+    if "rr_table_notice" in st.session_state:
+        st.warning(st.session_state.pop("rr_table_notice"))
+    # Keyed on this session's applies (not the shared version), so other reporters' results don't drop pending edits
+    key = f"rr_table_{st.session_state.get('rr_table_gen', 0)}_{visible[0] if visible else 0}_{len(visible)}"
+    # Match versions as this editor first showed them, for the optimistic-concurrency check
+    if st.session_state.get("rr_table_seen", (None,))[0] != key:
+        st.session_state["rr_table_seen"] = (key, [result_version(standings, ("rr",) + schedule[m]) for m in visible])
+    seen = st.session_state["rr_table_seen"][1]
+    edited = st.data_editor(
+        before,
+        hide_index=True,
+        use_container_width=True,
+        disabled=["Match", "Round", "Player 1", "Player 2"],
+        column_config={
+            "Winner": st.column_config.SelectboxColumn("Winner", options=standings.players + ["(Undecided)"], required=True),
+        },
+        key=key,
+    )
+    changed = np.flatnonzero(edited["Winner"].to_numpy() != before["Winner"].to_numpy())
+    invalid, stale = [], []
+    for j in changed.tolist():
+        m, winner = visible[j], edited["Winner"].iat[j]
+        match = schedule[m]
+        if winner != "(Undecided)" and winner not in match:
+            invalid.append(f"Match {m + 1}")
+        elif not set_rr_result(standings, match, None if winner == "(Undecided)" else winner, seen[j]):
+            stale.append(f"Match {m + 1}")
+    if invalid:
+        st.warning(f"Ignored winners who are not in the match: {', '.join(invalid)}")
+    if len(invalid) < len(changed):  # Something was applied or refused: restart the editor from the store
+        if stale:
+            st.session_state.pop("sync_notice", None)  # Shown above the table instead
+            st.session_state["rr_table_notice"] = (f"Another reporter changed {', '.join(stale)} first; "
+                                                   f"showing theirs. Edit again to override.")
+        st.session_state["rr_table_gen"] = st.session_state.get("rr_table_gen", 0) + 1
+        st.rerun()
+
+@timed()
+def show_round_robin_page(players: List[str]):
+    st.title("🗂️ Round Robin Scheduler & Leaderboard")
+    st.markdown("---")
+    
+    if len(players) < 2:
+        st.error("Please enter at least two players in the sidebar to generate a Round Robin tournament.")
+        return
+
+    # 1. Generate/Get Schedule
+    schedule = generate_round_robin_schedule(players)
+    if schedule is None:
+        return
+
+    # 2. Results & Match Input
+    st.subheader("Match Results Input")
+    st.info(f"Total Matches to Play: **{len(schedule)}**")
+    byes = st.session_state["rr_schedule"].get("byes", [])
+    if any(byes):
+        with st.expander("Byes by round"):
+            st.markdown("  \n".join(f"Round {r + 1}: {p}" for r, p in enumerate(byes) if p))
+    
+    standings: Standings = st.session_state["rr_standings"]
+    match_rounds = st.session_state["rr_schedule"]["rounds"]
+
+    visible = visible_matches(
+        "rr_view", list(range(len(schedule))),
+        round_of=lambda m: match_rounds[m],
+        players_of=lambda m: schedule[m],
+        is_pending=lambda m: standings.winner(schedule[m]) is None,
+    )
+
+    if st.checkbox("Edit results as a table", key="rr_table_mode", help="One editable table instead of one widget per match; handy for bulk entry."):
+        rr_results_table(schedule, match_rounds, visible, standings)
+    else:
+        rr_result_radios(schedule, visible, standings)
+
     # 3. Leaderboard Display
     st.markdown("---")
     st.subheader("🏆 Tournament Leaderboard")
     
-    # Sort the records: by Wins (descending), then Losses (ascending)
-    records_df = pd.DataFrame.from_dict(st.session_state.rr_records, orient='index')
+    # Sorted by Wins (descending), then Losses (ascending); cached until a result changes
+    records_df = standings.leaderboard()
     
     if not records_df.empty:
-        # Add color column for display
-        records_df.reset_index(names=['Player'], inplace=True)
-        
-        records_df["Win Rate"] = records_df.apply(lambda row: row['Wins'] / (row['Wins'] + row['Losses']) if (row['Wins'] + row['Losses']) > 0 else 0, axis=1)
-        records_df.sort_values(by=['Wins', 'Losses', 'Player'], ascending=[False, True, True], inplace=True)
-        records_df.index = records_df.index + 1 # Start index at 1
-        
         st.dataframe(
             records_df, 
             use_container_width=True,
@@ -686,16 +899,46 @@ def show_round_robin_page(players: List[str]):
     else:
         st.info("No records to display. Please enter match results.")
         
+    export_controls("rr_schedule", "schedule", lambda: schedule_rows(standings.players, standings))
+    export_controls("rr_standings", "standings", lambda: standings_rows(standings))
+    simulation_panel("rr", ["Tiers", "Results so far", "Tiers + results"],
+                     lambda model, runs: _simulate_round_robin(standings, schedule, model, runs))
+    station_panel("rr", round_robin_matches(schedule, standings.results))
+
     st.markdown("---")
     if st.button("🔄 Reset All Round Robin Records"):
-        st.session_state["rr_results"] = {}
-        st.session_state["rr_records"] = {player: {"Wins": 0, "Losses": 0} for player in players if player != 'BYE'}
+        apply_event({"type": "rr_reset"})
+        st.session_state.pop("rr_standings", None)
         st.session_state.pop("rr_schedule", None)
+        reset_station_clock("rr")
         st.rerun()
 
 # ---------------------------- App Pages ----------------------------
-def show_bracket_generator_page(players, team_of, team_colors, clean_rows):
-    st.title("🎮 Smash Bracket — Round 1 Generator")
+def get_seed() -> Optional[int]:
+    """Reads the optional sidebar seed; blank means fresh randomness on every click."""
+    raw = str(st.session_state.get("seed_input", "")).strip()
+    try:
+        return int(raw) if raw else None
+    except ValueError:
+        st.warning(f"Ignoring seed '{raw}': it must be a whole number.")
+        return None
+
+QUOTA_TIERS = ["S", "A", "B", "C"]  # Tiers with more than one character on the roster
+
+def draft_rules() -> DraftRules:
+    """Auto-fill rules from the sidebar; blank quota boxes and a 0 use cap mean no limit."""
+    quota = {t: int(st.session_state[f"draft_quota_{t}"]) for t in QUOTA_TIERS
+             if st.session_state.get(f"draft_quota_{t}") is not None}
+    return DraftRules(
+        unique_per_player=bool(st.session_state.get("draft_unique")),
+        max_uses=int(st.session_state.get("draft_max_uses") or 0) or None,
+        tier_quota=quota,
+        balance_tiers=bool(st.session_state.get("draft_balance")),
+    )
+
+@timed()
+def show_bracket_generator_page(players, team_of, team_colors):
+    st.title("🎮 Smash Bracket Generator")
 
     # ---------------------------- State & editor ----------------------------
     if "table_df" not in st.session_state:
@@ -713,7 +956,8 @@ def show_bracket_generator_page(players, team_of, team_colors, clean_rows):
         else:
             st.session_state.table_df = build_entries_df(players, int(st.session_state.chars_per_person))
             st.session_state.pop("last_bracket", None)
-            st.session_state.pop("r1_winners", None)
+            st.session_state.pop("bracket_state", None)
+            apply_event({"type": "clear_bracket"})
             st.session_state.pop("build_clicked") # Clear click state
             st.rerun()
 
@@ -721,16 +965,19 @@ def show_bracket_generator_page(players, team_of, team_colors, clean_rows):
         if not players:
             st.warning("Add players first.")
         else:
-            st.session_state.table_df = auto_fill_characters(
-                st.session_state.table_df, players, int(st.session_state.chars_per_person), st.session_state.shuffle_within_player
-            )
             st.session_state.pop("auto_fill_clicked")
-            st.rerun()
+            try:
+                st.session_state.table_df = auto_fill_characters(
+                    st.session_state.table_df, players, int(st.session_state.chars_per_person), st.session_state.shuffle_within_player,
+                    rng=make_rng(get_seed()), rules=draft_rules()
+                )
+            except ValueError as err:
+                st.error(f"Auto-fill failed: {err}")
+            else:
+                st.rerun()
 
     if players:
-        st.session_state.table_df["Player"] = st.session_state.table_df["Player"].apply(
-            lambda p: p if p in players else (players[0] if players and p == "" else p)
-        )
+        st.session_state.table_df["Player"] = fill_blank_players(st.session_state.table_df["Player"], players)
 
     st.subheader("Entries")
     table_df = st.data_editor(
@@ -743,270 +990,369 @@ def show_bracket_generator_page(players, team_of, team_colors, clean_rows):
         },
         key="table_editor",
     )
-    entries = df_to_entries(table_df, clean_rows_flag=clean_rows)
+    entries = df_to_entries(table_df)
+    rows = [[e.player, e.character] for e in entries]
+    # Saved only when this session's table changes, so sessions viewing the same event don't overwrite each other
+    if st.session_state.setdefault("saved_entries", rows) != rows:
+        st.session_state["saved_entries"] = rows
+        apply_event({"type": "entries", "rows": rows})
+    unknown = unknown_characters(table_df)
+    if unknown:
+        st.caption(f"Not on the roster (kept as-is): {', '.join(unknown)}")
 
     # ---------------------------- Generate & show ----------------------------
     st.divider()
     col_gen, col_clear = st.columns([2, 1])
 
     with col_gen:
-        if st.button("🎲 Generate Round 1 Bracket", type="primary"):
+        if st.button("🎲 Generate Bracket", type="primary"):
             if len(entries) < 2:
                 st.error("Add at least 2 entries (characters).")
             else:
                 rule = st.session_state.rule # Use rule from sidebar
-                if rule == "regular":
-                    bracket = generate_bracket_regular(entries)
+                fmt = st.session_state.get("format_select", "single")
+                seed = get_seed()
+                candidates = int(st.session_state.get("bracket_candidates", 1))
+                forbid = rule == "teams"
+                for k in ("last_bracket", "bracket_state", "de_graph", "de_results", "swiss_state"):
+                    st.session_state.pop(k, None)
+                reset_station_clock("bracket", "de")
+                apply_event({"type": "clear_bracket"})  # Only single elimination is saved
+                st.session_state["last_format"] = fmt
+                st.session_state["last_rule"] = rule
+                st.session_state["last_team_of"] = team_of if forbid else {}
+                st.session_state["last_team_colors"] = team_colors if forbid else {}
+
+                if fmt == "double":
+                    st.session_state["de_graph"] = generate_double_elimination(
+                        entries, forbid_same_team=forbid, team_of=team_of, rng=make_rng(seed)
+                    )
+                    st.session_state["de_results"] = {}
+                    bracket = [(m.a.ref, m.b.ref) for m in st.session_state["de_graph"] if m.bracket == "W" and m.round == 1]
+                elif fmt == "swiss":
+                    swiss = SwissState(entries)
+                    swiss.rounds.append(swiss_pairings(entries, swiss.scores(), swiss.played(),
+                                                       forbid_same_team=forbid, team_of=team_of, rng=make_rng(seed)))
+                    st.session_state["swiss_state"] = swiss
+                    bracket = [(entries[a], entries[b]) for a, b in swiss.rounds[0].pairs]
+                elif st.session_state.get("seed_by_rating"):
+                    ratings = results_history().ratings
+                    bracket = generate_bracket_rated(entries, lambda e: ratings.entry_rating(e.player, e.character),
+                                                     forbid_same_team=forbid, team_of=team_of, rng=make_rng(seed))
+                elif candidates > 1 or seed is not None:
+                    if seed is None:  # A master seed, so the whole best-of-K search can be replayed
+                        seed = random.getrandbits(32)
+                    bracket, _, _ = generate_bracket_seeded(
+                        entries, candidates=candidates, forbid_same_team=(rule == "teams"), team_of=team_of, seed=seed
+                    )
+                elif rule == "regular":
+                    bracket = generate_bracket_regular(entries, rng=make_rng(seed))
                 else:  # teams
-                    bracket = generate_bracket_teams(entries, team_of)
+                    bracket = generate_bracket_teams(entries, team_of, rng=make_rng(seed))
+
+                if fmt != "swiss":
+                    report = pairing_report(entries, forbid_same_team=forbid, team_of=team_of)
+                    if report.forced_byes:
+                        note = (f"{report.forced_byes} extra BYE(s) can't be avoided: "
+                                f"{report.largest_group} holds more than half of the entries.")
+                        if report.same_team_to_avoid:
+                            note += f" Allowing {report.same_team_to_avoid} same-team match(es) would remove them."
+                        st.warning(note)
 
                 if not bracket:
                     st.error("Couldn't build a valid round-1 bracket with those constraints.")
+                elif fmt == "swiss":
+                    st.success(f"Entries: {len(entries)} → Swiss Round 1: {len(bracket)} matches — Mode: {rule.upper()}")
+                elif fmt == "double":
+                    st.success(f"Entries: {len(entries)} → Double elimination: {len(st.session_state['de_graph'])} matches — Mode: {rule.upper()}")
                 else:
                     total_real = len([e for e in entries if e.player != "SYSTEM"])
                     target = next_power_of_two(total_real)
                     need = target - total_real
                     st.success(f"Entries: {total_real} → Target: {target} (BYEs: {need}) — Mode: {rule.upper()}")
-
-                    st.session_state["last_bracket"] = [(a, b) for (a, b) in bracket]
-                    st.session_state["last_rule"] = rule
-                    st.session_state["last_team_of"] = team_of if rule == "teams" else {}
-                    st.session_state["last_team_colors"] = team_colors if rule == "teams" else {}
-                    st.session_state.pop("r1_winners", None) # Clear winners on new generation
+                    if seed is not None and candidates > 1 and not st.session_state.get("seed_by_rating"):
+                        st.caption(f"Seed: {seed}, best of {candidates} candidates "
+                                   "(enter both in the sidebar to replay this bracket)")
+                    elif seed is not None:
+                        st.caption(f"Seed: {seed} (enter it in the sidebar to replay this bracket)")
+
+                    store = current_store()
+                    apply_event({
+                        "type": "bracket",
+                        "pairs": [[[a.player, a.character], [b.player, b.character]] for a, b in bracket],
+                        "rule": rule,
+                        "team_of": st.session_state["last_team_of"],
+                        "team_colors": st.session_state["last_team_colors"],
+                    })
+                    st.session_state["bracket_state"] = store.tournament.bracket # Fresh results on new generation
+                    st.session_state["last_bracket"] = store.tournament.bracket.packed
+
+    last_team_of = st.session_state.get("last_team_of", {})
+    last_team_colors = st.session_state.get("last_team_colors", {})
+    if st.session_state.get("de_graph"):
+        st.subheader("Double Elimination")
+        render_graph_bracket(st.session_state["de_graph"], st.session_state["de_results"], last_team_of, last_team_colors)
+        station_panel("de", graph_matches(st.session_state["de_graph"], st.session_state["de_results"]))
+    if st.session_state.get("swiss_state"):
+        st.subheader("Swiss")
+        show_swiss_section(st.session_state["swiss_state"], last_team_of, last_team_colors)
 
     # Persist & render compact full bracket
     if "last_bracket" in st.session_state and st.session_state["last_bracket"]:
-        r1_pairs = st.session_state["last_bracket"]
+        if "bracket_state" not in st.session_state:
+            st.session_state["bracket_state"] = BracketState(st.session_state["last_bracket"])
+        state = st.session_state["bracket_state"]
         if st.session_state.get("last_rule") == "teams":
             st.info("Bracket view — Teams mode")
         else:
             st.info("Bracket view — Regular mode")
 
-        st.subheader("Round 1 Pairings")
-        r1_winner_controls(r1_pairs) # Display winner controls for R1
-        
-        rounds = compute_rounds_pairs(r1_pairs, st.session_state.get("r1_winners", {}))
-        # Only render the first round
-        render_bracket_grid(rounds[:1], st.session_state.get("last_team_of", {}), st.session_state.get("last_team_colors", {}))
+        st.subheader("Bracket")
+        bracket_winner_controls(state)
+        render_bracket_grid(state, last_team_of, last_team_colors)
+        export_controls("bracket", "bracket", lambda: bracket_rows(state))
+        simulation_panel("bracket", ["Tiers", "Results so far", "Tiers + results"],
+                         lambda model, runs: _simulate_bracket(state, model, runs))
+        station_panel("bracket", bracket_matches(state))
 
     with col_clear:
         if st.button("🧹 Clear Table"):
             st.session_state.table_df = pd.DataFrame(columns=["Player", "Character"])
-            st.session_state.pop("last_bracket", None)
-            st.session_state.pop("r1_winners", None)
+            for k in ("last_bracket", "bracket_state", "de_graph", "de_results", "swiss_state"):
+                st.session_state.pop(k, None)
+            reset_station_clock("bracket", "de")
+            apply_event({"type": "clear_bracket"})
             st.rerun()
 
-    st.caption("Round 1 generation uses balanced randomization; Teams forbids same-team R1. Character icons are placeholders.")
+    st.caption("Round 1 generation uses balanced randomization; Teams forbids same-team R1. Winners advance round by round.")
+
+
+CARD_COLORS = ["#3F51B5", "#E91E63", "#009688", "#FF9800", "#9C27B0", "#4CAF50", "#2196F3", "#FF5722"]
+STAT_COLORS = {"Weight": "#4CAF50", "Run Speed": "#FF9800", "Air Speed": "#009688", "Fall Speed": "#E91E63"}
+CARDS_PER_ROW = 4
 
+def render_character_card(char_name: str, color: str):
+    """One comparison card; bars compare against the roster maximum of each stat."""
+    data = get_char_data(char_name)
+    st.markdown(f'<div class="comparison-card" style="border-top-color: {color};">', unsafe_allow_html=True)
+    st.markdown(f'<p class="char-title">{char_name}</p>', unsafe_allow_html=True)
+    st.markdown(icon_html(char_name, size=96) or "", unsafe_allow_html=True)
 
+    st.markdown("---")
+
+    # Tier Rank (Fixed value)
+    st.markdown(f'<p class="char-stat-label">Tier Rank: <b>{data["Tier Rank"]}</b></p>', unsafe_allow_html=True)
+
+    # Numeric stats get a meter; text values ("Close Combat", "Varies") are shown as-is
+    for stat, bar_color in STAT_COLORS.items():
+        render_stat_meter(stat, data[stat], stat_range(stat)[1], bar_color)
+
+    st.markdown('</div>', unsafe_allow_html=True)
+    count_elements("markdown", 6 + sum(2 if isinstance(data[s], (int, float)) else 1 for s in STAT_COLORS))
+
+@timed()
 def show_character_info_page():
     st.title("📚 Smash Bros. Character Info & Comparison")
     st.markdown("---")
-    
-    # Use two separate selectboxes for comparison
-    col_select1, col_select2 = st.columns(2)
-
-    with col_select1:
-        char_selection1 = st.selectbox(
-            "Character 1", 
-            options=SMASH_CHARACTERS, 
-            key="char_select_1",
-            index=SMASH_CHARACTERS.index("Mario") if "Mario" in SMASH_CHARACTERS else 0
-        )
-    
-    with col_select2:
-        # Filter options to prevent selecting the same character in both slots
-        filtered_options = [c for c in SMASH_CHARACTERS if c != char_selection1]
-        
-        # Determine the default index for Character 2
-        default_index = 0
-        if "Link" in filtered_options:
-            default_index = filtered_options.index("Link")
-        elif len(filtered_options) > 0:
-            default_index = 0
-            
-        char_selection2 = st.selectbox(
-            "Character 2", 
-            options=filtered_options, 
-            key="char_select_2",
-            index=default_index
-        )
-    
+
+    selections = st.multiselect(
+        "Characters to compare",
+        options=SMASH_CHARACTERS,
+        default=[c for c in ("Mario", "Link") if c in SMASH_CHARACTERS],
+        key="char_compare",
+        max_selections=12,
+    )
+
     st.divider()
 
-    # Create the list of selected characters (guaranteed to be 2)
-    char_selections = [char_selection1, char_selection2]
-    
-    # --- Maximum values for visual comparison bars (based on provided data) ---
-    MAX_WEIGHT = 135 # Bowser
-    MAX_RUN_SPEED = 3.85 # Sonic
-    MAX_AIR_SPEED = 1.75 # Greninja
-    MAX_FALL_SPEED = 1.8 # Fox
-
-    # Create two columns for the character cards
-    col1, col2 = st.columns(2)
-    
-    # --- RENDER CHARACTER 1 ---
-    char1_data = get_char_data(char_selection1)
-    with col1:
-        st.markdown(f'<div class="comparison-card" style="border-top-color: #3F51B5;">', unsafe_allow_html=True)
-        st.markdown(f'<p class="char-title">{char_selection1}</p>', unsafe_allow_html=True)
-        # Placeholder for image
-        st.image(f"https://placehold.co/100x100/3F51B5/ffffff?text={char_selection1[0]}", width=100, caption="Character Image")
-
-        st.markdown("---")
-        
-        # Tier Rank (Fixed value)
-        st.markdown(f'<p class="char-stat-label">Tier Rank: <b>{char1_data["Tier Rank"]}</b></p>', unsafe_allow_html=True)
-        
-        # Weight comparison
-        render_stat_meter("Weight", char1_data["Weight"], MAX_WEIGHT, "#4CAF50")
-        
-        # Run Speed comparison
-        render_stat_meter("Run Speed", char1_data["Run Speed"], MAX_RUN_SPEED, "#FF9800")
-        
-        # Air Speed comparison
-        render_stat_meter("Air Speed", char1_data["Air Speed"], MAX_AIR_SPEED, "#009688")
-        
-        # Fall Speed (Meter only for numeric, text for non-numeric)
-        if isinstance(char1_data["Fall Speed"], (int, float)):
-             render_stat_meter("Fall Speed", char1_data["Fall Speed"], MAX_FALL_SPEED, "#E91E63")
-        else:
-             st.markdown(f'<p class="char-stat-label">Fall Speed: <b>{char1_data["Fall Speed"]}</b></p>', unsafe_allow_html=True)
-             
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    # --- RENDER CHARACTER 2 ---
-    char2_data = get_char_data(char_selection2)
-    with col2:
-        st.markdown(f'<div class="comparison-card" style="border-top-color: #E91E63;">', unsafe_allow_html=True)
-        st.markdown(f'<p class="char-title">{char_selection2}</p>', unsafe_allow_html=True)
-        # Placeholder for image
-        st.image(f"https://placehold.co/100x100/E91E63/ffffff?text={char_selection2[0]}", width=100, caption="Character Image")
-
-        st.markdown("---")
-        
-        # Tier Rank (Fixed value)
-        st.markdown(f'<p class="char-stat-label">Tier Rank: <b>{char2_data["Tier Rank"]}</b></p>', unsafe_allow_html=True)
-        
-        # Weight comparison
-        render_stat_meter("Weight", char2_data["Weight"], MAX_WEIGHT, "#4CAF50")
-        
-        # Run Speed comparison
-        render_stat_meter("Run Speed", char2_data["Run Speed"], MAX_RUN_SPEED, "#FF9800")
-        
-        # Air Speed comparison
-        render_stat_meter("Air Speed", char2_data["Air Speed"], MAX_AIR_SPEED, "#009688")
-        
-        # Fall Speed (Meter only for numeric, text for non-numeric)
-        if isinstance(char2_data["Fall Speed"], (int, float)):
-             render_stat_meter("Fall Speed", char2_data["Fall Speed"], MAX_FALL_SPEED, "#E91E63")
-        else:
-             st.markdown(f'<p class="char-stat-label">Fall Speed: <b>{char2_data["Fall Speed"]}</b></p>', unsafe_allow_html=True)
-             
-        st.markdown('</div>', unsafe_allow_html=True)
-        
+    for row_start in range(0, len(selections), CARDS_PER_ROW):
+        row = selections[row_start:row_start + CARDS_PER_ROW]
+        for offset, (col, char_name) in enumerate(zip(st.columns(CARDS_PER_ROW), row)):
+            with col:
+                render_character_card(char_name, CARD_COLORS[(row_start + offset) % len(CARD_COLORS)])
+
+    if len(selections) >= 2:
+        st.subheader("Side by side")
+        st.dataframe(roster_table().loc[selections, ["Tier"] + NUMERIC_STATS + ["Notes"]], use_container_width=True)
+
     st.divider()
-    st.info("The comparison uses actual data from your provided file. The colored bars compare the stat value against the highest value found in the entire roster (e.g., Bowser for Weight).")
+    col_sim, col_rank = st.columns(2)
+
+    with col_sim:
+        st.subheader("🔎 Most similar")
+        target = st.selectbox("Character", SMASH_CHARACTERS, index=0, key="similar_to")
+        k = st.slider("How many", min_value=1, max_value=15, value=5, key="similar_k")
+        similar = most_similar(target, k)
+        if similar.empty:
+            st.info(f"Not enough numeric stats for {target} to compare.")
+        else:
+            st.dataframe(similar, use_container_width=True)
+
+    with col_rank:
+        st.subheader("📊 Rank by stat")
+        stat = st.selectbox("Stat", ["Tier"] + NUMERIC_STATS, key="rank_stat")
+        lowest_first = st.checkbox("Lowest first", value=False, key="rank_lowest")
+        top = st.slider("Show top", min_value=5, max_value=len(SMASH_CHARACTERS), value=10, key="rank_top")
+        st.dataframe(rank_by(stat, ascending=lowest_first, top=top), use_container_width=True)
 
-# ---------------------------- Sidebar & Main App Flow ----------------------------
-# Initialize a placeholder for the page selected in the sidebar
-if "page" not in st.session_state:
-    st.session_state.page = "Bracket Generator"
-
-with st.sidebar:
-    st.header("App Navigation")
-    # This radio button controls which main function runs
-    st.session_state.page = st.radio("Switch View", options=["Bracket Generator", "Round Robin", "Character Info"], index=0)
-    
     st.divider()
+    st.info("The comparison uses actual data from your provided file. The colored bars compare the stat value against the highest value found in the entire roster (e.g., Bowser for Weight). Similarity is the distance between min-max normalized tier and stats.")
 
-    # The rest of the sidebar is only for the Bracket Generator and Round Robin pages
-    if st.session_state.page == "Bracket Generator" or st.session_state.page == "Round Robin":
-        st.header("Players")
-        default_players = "You\nFriend1\nFriend2"
-        st.text_area(
-            "Enter player names (one per line)",
-            value=st.session_state.get("players_multiline", default_players),
-            height=140,
-            key="players_multiline",
-            help="These names define the participants for both Bracket and Round Robin."
-        )
-        players = [p.strip() for p in st.session_state.players_multiline.splitlines() if p.strip()]
-
-        if st.session_state.page == "Bracket Generator":
-            st.header("Rule Set")
-            st.session_state.rule = st.selectbox(
-                "Choose mode",
-                options=["regular", "teams"],
-                index=0,
-                key="rule_select",
-                help="Regular: balanced random (no self-matches). Teams: regular + forbids same-team matches in Round 1."
+# ---------------------------- Sidebar & Main App Flow ----------------------------
+# Recorded only while "Profile reruns" is ticked. profiling_panel finishes the recording to show it;
+# the finally covers a run cut short by st.rerun(), st.stop() or an exception
+if st.session_state.get("profile_reruns"):
+    start_rerun()
+try:
+    # Initialize a placeholder for the page selected in the sidebar
+    if "page" not in st.session_state:
+        st.session_state.page = "Bracket Generator"
+
+    with st.sidebar:
+        st.header("App Navigation")
+        # This radio button controls which main function runs
+        st.session_state.page = st.radio("Switch View", options=["Bracket Generator", "Round Robin", "Character Info"], index=0)
+
+        st.text_input("Event", value="default", key="event_name",
+                      help="Entries, the bracket and round-robin results are saved under this name and restored after a refresh or restart.")
+        store = current_store()
+        sync_session(store)
+        if "sync_notice" in st.session_state:
+            st.warning(st.session_state.pop("sync_notice"))
+        st.caption(f"Saved to `{os.path.basename(store.log_path)}` · loaded in {store.load_seconds * 1000:.1f} ms")
+
+        st.divider()
+
+        # The rest of the sidebar is only for the Bracket Generator and Round Robin pages
+        if st.session_state.page == "Bracket Generator" or st.session_state.page == "Round Robin":
+            st.header("Players")
+            default_players = "You\nFriend1\nFriend2"
+            # Seeded through session state only, since sync_session may also set it
+            st.session_state.setdefault("players_multiline", default_players)
+            st.text_area(
+                "Enter player names (one per line)",
+                height=140,
+                key="players_multiline",
+                help="These names define the participants for both Bracket and Round Robin."
             )
-            # Bracket specific UI
-            team_of: Dict[str, str] = {}
-            team_colors: Dict[str, str] = {}
-            if st.session_state.rule == "teams":
-                st.divider()
-                st.header("Teams & Colors")
-                team_names_input = st.text_input(
-                    "Team labels (comma separated)",
-                    value="Red, Blue",
-                    key="team_names_input_key",
-                    help="Example: Red, Blue, Green"
+            players = [p.strip() for p in st.session_state.players_multiline.splitlines() if p.strip()]
+
+            if st.session_state.page == "Bracket Generator":
+                st.header("Rule Set")
+                st.session_state.rule = st.selectbox(
+                    "Choose mode",
+                    options=["regular", "teams"],
+                    key="rule_select",
+                    help="Regular: balanced random (no self-matches). Teams: regular + forbids same-team matches in Round 1."
                 )
-                team_labels = [t.strip() for t in team_names_input.split(",") if t.strip()]
-                if not team_labels:
-                    team_labels = ["Team A", "Team B"]
-
-                st.caption("Pick a color for each team:")
-                for i, t in enumerate(team_labels):
-                    default = TEAM_COLOR_FALLBACKS[i % len(TEAM_COLOR_FALLBACKS)]
-                    team_colors[t] = st.color_picker(f"{t} color", value=default, key=f"team_color_{t}")
-
-                st.caption("Assign each player to a team:")
-                for p in players:
-                    team_of[p] = st.selectbox(f"{p}", options=["(none)"] + team_labels, key=f"team_{p}")
-                team_of = {p: (t if t != "(none)" else "") for p, t in team_of.items()}
-
-            st.divider()
-            st.header("Characters per player")
-            st.number_input("How many per player?", min_value=1, max_value=50, value=2, step=1, key="chars_per_person")
-
-            st.divider()
-            st.subheader("Build / Fill")
-            st.button("⚙️ Auto-Create/Reset Entries", use_container_width=True, key="build_clicked")
-            st.checkbox("Shuffle names when auto-filling", value=True, key="shuffle_within_player")
-            st.button("🎲 Auto-fill Characters", use_container_width=True, key="auto_fill_clicked")
-
-            st.divider()
-            st.header("General")
-            clean_rows = st.checkbox("Remove empty rows", value=True)
-            
-        else: # Round Robin page needs these defined
-             team_of, team_colors, clean_rows = {}, {}, True # Not used in RR, but defined
+                st.session_state.format = st.selectbox(
+                    "Format",
+                    options=["single", "double", "swiss"],
+                    format_func={"single": "Single elimination", "double": "Double elimination", "swiss": "Swiss"}.get,
+                    index=0,
+                    key="format_select",
+                    help="Double elimination and Swiss reuse the same pairing rules (and Teams avoidance) for their first round."
+                )
+                # Bracket specific UI
+                team_of: Dict[str, str] = {}
+                team_colors: Dict[str, str] = {}
+                if st.session_state.rule == "teams":
+                    st.divider()
+                    st.header("Teams & Colors")
+                    st.session_state.setdefault("team_names_input_key", "Red, Blue")  # An import may set it
+                    team_names_input = st.text_input(
+                        "Team labels (comma separated)",
+                        key="team_names_input_key",
+                        help="Example: Red, Blue, Green"
+                    )
+                    team_labels = [t.strip() for t in team_names_input.split(",") if t.strip()]
+                    if not team_labels:
+                        team_labels = ["Team A", "Team B"]
+
+                    st.caption("Pick a color for each team:")
+                    for i, t in enumerate(team_labels):
+                        default = TEAM_COLOR_FALLBACKS[i % len(TEAM_COLOR_FALLBACKS)]
+                        team_colors[t] = st.color_picker(f"{t} color", value=default, key=f"team_color_{t}")
+
+                    st.caption("Assign each player to a team:")
+                    for p in players:
+                        team_of[p] = st.selectbox(f"{p}", options=["(none)"] + team_labels, key=f"team_{p}")
+                    team_of = {p: (t if t != "(none)" else "") for p, t in team_of.items()}
 
-    else: # Character Info page needs these defined
-        players, team_of, team_colors, clean_rows = [], {}, {}, True
+                st.divider()
+                st.header("Characters per player")
+                st.number_input("How many per player?", min_value=1, max_value=50, value=2, step=1, key="chars_per_person")
 
+                st.divider()
+                st.subheader("Build / Fill")
+                st.button("⚙️ Auto-Create/Reset Entries", use_container_width=True, key="build_clicked")
+                st.checkbox("Shuffle names when auto-filling", value=True, key="shuffle_within_player")
+                st.button("🎲 Auto-fill Characters", use_container_width=True, key="auto_fill_clicked")
+                with st.expander("Auto-fill rules"):
+                    st.checkbox("No repeats per player", key="draft_unique")
+                    st.number_input("Max uses per character (0 = no limit)", min_value=0, max_value=1000, value=0, step=1,
+                                    key="draft_max_uses")
+                    st.caption("At most per player, by tier (blank = any):")
+                    for col, t in zip(st.columns(len(QUOTA_TIERS)), QUOTA_TIERS):
+                        col.number_input(t, min_value=0, max_value=50, value=None, step=1, key=f"draft_quota_{t}")
+                    st.checkbox("Balance tier strength across players", key="draft_balance",
+                                help="Lowest tier total picks first each round, then a few trades even out the totals.")
+                st.file_uploader("Import players / teams / entries", type=["csv", "json", "jsonl", "parquet"], key="import_file",
+                                 on_change=_import_file,
+                                 help="Columns: Player (or Name/Tag), Character (or Main), Team — any order, extra columns ignored.")
+                if "import_notice" in st.session_state:
+                    kind, msg = st.session_state.pop("import_notice")
+                    (st.success if kind == "success" else st.error)(msg)
 
-# --- Main Content Render ---
-if st.session_state.page == "Bracket Generator":
-    # Ensure all required variables are set before calling the function
-    try:
-        rule = st.session_state.rule
-    except AttributeError:
-        # Default settings if coming from another page
-        rule = "regular"
+                st.divider()
+                st.header("Randomness")
+                st.text_input("Seed (optional)", value="", key="seed_input",
+                              help="Same seed + same entries = same bracket and auto-fill. Leave blank for random.")
+                st.number_input("Candidates to try", min_value=1, max_value=5000, value=1, step=1, key="bracket_candidates",
+                                help="Builds this many Round 1 brackets and keeps the fairest (fewest forced BYEs, same-team and repeat matchups).")
+                st.checkbox("Seed by rating", key="seed_by_rating",
+                            help="Single elimination: place entries by Elo (player-character, else player) in standard seed order, so top seeds meet last.")
+
+            else: # Round Robin page needs these defined
+                 team_of, team_colors = {}, {} # Not used in RR, but defined
+
+        else: # Character Info page needs these defined
+            players, team_of, team_colors = [], {}, {}
+
+
+    # --- Main Content Render ---
+    if st.session_state.page == "Bracket Generator":
+        # Ensure all required variables are set before calling the function
+        try:
+            rule = st.session_state.rule
+        except AttributeError:
+            # Default settings if coming from another page
+            rule = "regular"
+            players = [p.strip() for p in st.session_state.get("players_multiline", "You\nFriend1\nFriend2").splitlines() if p.strip()]
+            team_of = {}
+            team_colors = {}
+
+        show_bracket_generator_page(players, team_of, team_colors)
+    elif st.session_state.page == "Round Robin":
+        # Get player list from sidebar state
         players = [p.strip() for p in st.session_state.get("players_multiline", "You\nFriend1\nFriend2").splitlines() if p.strip()]
-        team_of = {}
-        team_colors = {}
-        clean_rows = True
-        
-    show_bracket_generator_page(players, team_of, team_colors, clean_rows)
-elif st.session_state.page == "Round Robin":
-    # Get player list from sidebar state
-    players = [p.strip() for p in st.session_state.get("players_multiline", "You\nFriend1\nFriend2").splitlines() if p.strip()]
-    show_round_robin_page(players)
-else:
-    show_character_info_page()
+        show_round_robin_page(players)
+    else:
+        show_character_info_page()
+
+    with st.sidebar:
+        # Rendered last so the counters include this rerun
+        with st.expander("Ratings"):
+            history = results_history()
+            ratings = history.ratings
+            st.caption(f"Elo from {len(history):,} results across events (loaded in {history.load_seconds * 1000:.0f} ms)")
+            by = st.radio("Rate", ["Players", "Player + character"], horizontal=True, key="ratings_view", label_visibility="collapsed")
+            rows = ratings.player_rows() if by == "Players" else ratings.pair_rows()
+            if rows:
+                st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+        with st.expander("Cache stats"):
+            st.dataframe(pd.DataFrame(cache_stats()), hide_index=True, use_container_width=True)
+        profiling_panel(store.name)
+        live_updates(store)
+finally:
+    finish_rerun()
@@ -0,0 +1,84 @@
+import random
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from draft import DraftRules, draft_characters
+from models import Entry
+from pairing import make_rng
+from profiling import timed
+from roster import CHARACTER_SET, SMASH_CHARACTERS
+
+
+# ---------------------------- Column helpers ----------------------------
+def clean_column(df: pd.DataFrame, col: str) -> pd.Series:
+    """Column as stripped strings, with missing cells (new editor rows) read as ""."""
+    if col not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    return df[col].fillna("").astype(str).str.strip()
+
+def numpy_rng(rng: random.Random) -> np.random.Generator:
+    """NumPy generator seeded from a stdlib RNG, so a seeded `rng` still replays."""
+    return np.random.default_rng(rng.getrandbits(64))
+
+
+# ---------------------------- Table helpers ----------------------------
+def build_entries_df(players: List[str], k: int) -> pd.DataFrame:
+    return pd.DataFrame({"Player": players * k, "Character": [""] * (len(players) * k)})
+
+@timed()
+def auto_fill_characters(df: pd.DataFrame, players: List[str], k: int, shuffle_each: bool, rng: Optional[random.Random] = None,
+                         rules: Optional[DraftRules] = None) -> pd.DataFrame:
+    """
+    Fills every row owned by one of `players` with a roster character.
+    Without `rules`, one vectorized draw covers all rows; with them, the
+    characters come from `draft_characters` (ValueError if the rules can't
+    be met). `shuffle_each` then permutes the labels within each player's
+    group of rows.
+    """
+    gen = numpy_rng(rng or make_rng())
+    out = df.copy()
+    mask = out["Player"].isin(players).to_numpy()
+    n = int(mask.sum())
+    if n == 0:
+        return out
+
+    codes, _ = pd.factorize(out["Player"].to_numpy()[mask])
+    by_player = np.argsort(codes, kind="stable")
+    if rules is not None and rules.active:
+        picks = draft_characters(np.bincount(codes).tolist(), rules, gen)
+        labels = np.empty(n, dtype=object)
+        labels[by_player] = [c for group in picks for c in group]
+    else:
+        labels = np.asarray(SMASH_CHARACTERS, dtype=object)[gen.integers(0, len(SMASH_CHARACTERS), n)]
+    if shuffle_each:
+        shuffled = np.lexsort((gen.random(n), codes))
+        labels[by_player] = labels[shuffled]
+    out["Character"] = out["Character"].astype(object)
+    out.loc[mask, "Character"] = labels
+    return out
+
+@timed()
+def df_to_entries(df: pd.DataFrame) -> List[Entry]:
+    """
+    Rows with both a player and a character become entries; rows missing
+    either are dropped. Characters outside the roster are kept for
+    flexibility; see `unknown_characters`.
+    """
+    pl = clean_column(df, "Player")
+    ch = clean_column(df, "Character")
+    keep = (pl != "") & (ch != "")
+    return [Entry(player=p, character=c) for p, c in zip(pl[keep].tolist(), ch[keep].tolist())]
+
+def unknown_characters(df: pd.DataFrame) -> List[str]:
+    """Distinct non-empty characters in the table that are not on the roster."""
+    ch = clean_column(df, "Character")
+    ch = ch[ch != ""]
+    return sorted(ch[~ch.isin(CHARACTER_SET)].unique().tolist())
+
+def fill_blank_players(players_col: pd.Series, players: List[str]) -> pd.Series:
+    """Assigns rows with no player to the first listed player."""
+    if not players:
+        return players_col
+    return players_col.mask(players_col.fillna("") == "", players[0])